@@ -1,17 +1,20 @@
 import sys
 import os
 import asyncio
+import time
 import uuid
-from typing import Dict, Optional, Any
+from collections import deque
+from typing import Deque, Dict, Optional, Any
 from enum import Enum
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
 from fastapi import FastAPI, BackgroundTasks, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 import json
 from service import run_deep_research
+from deep_research.metrics import JOB_BUCKETS, registry
 
 import logging
 
@@ -35,6 +38,67 @@ class JobState(BaseModel):
 JOBS: Dict[str, JobState] = {}
 
 
+# ===== METRICS =====
+
+job_queue_wait_seconds = registry.histogram(
+    "deep_research_job_queue_wait_seconds",
+    "Time from job submission until its task starts running.",
+    ("api",),
+)
+job_duration_seconds = registry.histogram(
+    "deep_research_job_duration_seconds",
+    "Wall time of research runs, by API and final status.",
+    ("api", "status"),
+    buckets=JOB_BUCKETS,
+)
+sse_subscribers = registry.gauge(
+    "deep_research_sse_subscribers",
+    "Clients connected to a job event stream.",
+)
+
+
+def _collect_service_metrics() -> dict:
+    """Report job counts, event-queue depths and MCP sessions at scrape time."""
+    statuses: Dict[tuple, int] = {}
+    for state in list(JOBS.values()):
+        key = ("rest", state.status.value)
+        statuses[key] = statuses.get(key, 0) + 1
+    queue_depths = []
+    for job_id, job in list(RESEARCH_JOBS.items()):
+        key = ("mcp", job.get("status") or "unknown")
+        statuses[key] = statuses.get(key, 0) + 1
+        queue = job.get("queue")
+        if queue is not None and queue.qsize():
+            queue_depths.append(queue.qsize())
+
+    return {
+        "deep_research_jobs": (
+            "gauge",
+            "Known jobs by API and status.",
+            [
+                ("deep_research_jobs", {"api": api, "status": status}, count)
+                for (api, status), count in sorted(statuses.items())
+            ],
+        ),
+        "deep_research_event_queue_depth": (
+            "gauge",
+            "Undelivered events across job event queues (total and largest queue).",
+            [
+                ("deep_research_event_queue_depth", {"stat": "total"}, sum(queue_depths)),
+                ("deep_research_event_queue_depth", {"stat": "max"}, max(queue_depths, default=0)),
+            ],
+        ),
+        "deep_research_mcp_sessions": (
+            "gauge",
+            "Open MCP SSE sessions.",
+            [("deep_research_mcp_sessions", {}, len(web_server_sessions))],
+        ),
+    }
+
+
+registry.register_collector(_collect_service_metrics)
+
+
 class ResearchRequest(BaseModel):
     prompt: Optional[str] = None
     query: Optional[str] = None  # ICA sends 'query'
@@ -73,8 +137,11 @@ def get_agent_card(request: Request):
     return data
 
 
-async def background_deep_research(job_id: str, prompt: str):
+async def background_deep_research(job_id: str, prompt: str, queued_at: Optional[float] = None):
     print(f"🚀 Job {job_id} started. Prompt: {prompt[:50]}...")
+    started = time.monotonic()
+    if queued_at is not None:
+        job_queue_wait_seconds.observe(started - queued_at, api="rest")
 
     if job_id in JOBS:
         JOBS[job_id].status = JobStatus.RUNNING
@@ -86,8 +153,10 @@ async def background_deep_research(job_id: str, prompt: str):
             JOBS[job_id].status = JobStatus.DONE
             JOBS[job_id].result = report
             print(f"✅ Job {job_id} finished successfully.")
+        job_duration_seconds.observe(time.monotonic() - started, api="rest", status="done")
 
     except Exception as e:
+        job_duration_seconds.observe(time.monotonic() - started, api="rest", status="failed")
         import traceback
         print(f"❌ Job {job_id} failed:")
         traceback.print_exc()
@@ -142,6 +211,13 @@ def health_check():
     return {"ok": True}
 
 
+@app.get("/metrics")
+def metrics():
+    """Expose service metrics in the Prometheus text format."""
+    # A sync route runs in the threadpool, so rendering never blocks the event loop
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/deep-research")
 async def deep_research_endpoint(request: Request):
     body = await request.json()
@@ -162,7 +238,7 @@ async def deep_research_endpoint(request: Request):
 
         JOBS[new_job_id] = JobState(status=JobStatus.QUEUED, result=None)
 
-        asyncio.create_task(background_deep_research(new_job_id, prompt))
+        asyncio.create_task(background_deep_research(new_job_id, prompt, time.monotonic()))
 
         return return_simple_message(
             f"Research started. Job ID: {new_job_id}. "
@@ -214,12 +290,18 @@ async def deep_research_sync(request: Request):
         
         # ICA Timeout Protection: Wrap execution in 50s timeout
         # If research takes > 50s, return a partial/status message instead of crashing
+        started = time.monotonic()
         try:
             result = await asyncio.wait_for(run_deep_research(prompt), timeout=50.0)
-        except asyncio.TimeoutError:
+        except TimeoutError:
+            job_duration_seconds.observe(time.monotonic() - started, api="sync", status="timeout")
             logger.warning("Deep research timed out after 50s")
             return return_simple_message("Research is taking longer than expected. It is still running in the background, but we are returning this message to prevent a timeout. Please refine your query or try a more specific topic.")
+        except Exception:
+            job_duration_seconds.observe(time.monotonic() - started, api="sync", status="failed")
+            raise
         
+        job_duration_seconds.observe(time.monotonic() - started, api="sync", status="done")
         logger.info("Deep research completed")
         return return_simple_message(result)
     except Exception as e:
@@ -263,8 +345,22 @@ def get_research_status(job_id: str):
         "latest": latest_log,           # last progress message
         "result": job.get("result"),    # final report (when done)
         "error": job.get("error"),      # error if failed
+        "spans": len(job.get("spans", [])),  # timing spans recorded so far
     }
 
+@app.get("/research/spans/{job_id}")
+def get_research_spans(job_id: str, kind: Optional[str] = None):
+    """Return the node and LLM call spans recorded for a job (optionally one kind)."""
+    job = RESEARCH_JOBS.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Unknown job_id")
+
+    spans = list(job.get("spans", []))
+    if kind:
+        spans = [span for span in spans if span.get("kind") == kind]
+    return {"job_id": job_id, "spans": spans}
+
 @app.get("/research/stream/{job_id}")
 async def research_stream(job_id: str, request: Request):
     job = RESEARCH_JOBS.get(job_id)
@@ -285,19 +381,25 @@ async def research_stream(job_id: str, request: Request):
 
         q: asyncio.Queue = job["queue"]
 
-        while True:
-            # If client disconnects, stop
-            if await request.is_disconnected():
-                break
+        sse_subscribers.inc()
+        job["subscribers"] = job.get("subscribers", 0) + 1
+        try:
+            while True:
+                # If client disconnects, stop
+                if await request.is_disconnected():
+                    break
 
-            item = await q.get()  # {"event": "...", "payload": {...}}
-            event = item.get("event", "message")
-            payload = item.get("payload", {})
+                item = await q.get()  # {"event": "...", "payload": {...}}
+                event = item.get("event", "message")
+                payload = item.get("payload", {})
 
-            yield {"event": event, "data": json.dumps(payload)}
+                yield {"event": event, "data": json.dumps(payload)}
 
-            if event == "close":
-                break
+                if event == "close":
+                    break
+        finally:
+            sse_subscribers.dec()
+            job["subscribers"] -= 1
 
     return EventSourceResponse(
         gen(),
@@ -313,12 +415,19 @@ async def research_stream(job_id: str, request: Request):
 JOBS_FILE = "jobs_storage.json"
 import os
 
+# Job fields that are not persisted: the asyncio.Queue, live subscriber counts,
+# and timing spans (thousands per job; they are only useful while it runs)
+TRANSIENT_JOB_FIELDS = ("queue", "subscribers", "spans")
+# Spans kept per job (the oldest are dropped first), and how many finished jobs
+# keep theirs for /research/spans; older finished jobs release their spans
+MAX_JOB_SPANS = int(os.getenv("MAX_JOB_SPANS", "5000"))
+MAX_FINISHED_JOBS_WITH_SPANS = int(os.getenv("MAX_FINISHED_JOBS_WITH_SPANS", "20"))
+
 def save_jobs():
     """Persist jobs to disk."""
     serializable_jobs = {}
     for jid, job in RESEARCH_JOBS.items():
-        # Exclude asyncio.Queue and other non-serializable objects
-        serializable_jobs[jid] = {k: v for k, v in job.items() if k != "queue"}
+        serializable_jobs[jid] = {k: v for k, v in job.items() if k not in TRANSIENT_JOB_FIELDS}
     
     try:
         with open(JOBS_FILE, "w") as f:
@@ -350,50 +459,77 @@ def load_jobs():
 RESEARCH_JOBS: Dict[str, Dict[str, Any]] = {}
 # Load jobs on startup
 load_jobs()
+# Finished jobs still holding spans, oldest first
+_finished_span_jobs: Deque[str] = deque()
+
+
+def _release_old_spans(job_id: str):
+    """Record a finished job and drop the spans of jobs past MAX_FINISHED_JOBS_WITH_SPANS."""
+    _finished_span_jobs.append(job_id)
+    while len(_finished_span_jobs) > MAX_FINISHED_JOBS_WITH_SPANS:
+        old_job = RESEARCH_JOBS.get(_finished_span_jobs.popleft())
+        if old_job is not None and old_job.get("status") != "running":
+            old_job["spans"] = []
 
 
 def _ensure_job(job_id: str) -> Dict[str, Any]:
     job = RESEARCH_JOBS.get(job_id)
     if job is None:
-        job = {"status": "running", "result": None, "logs": [], "error": None, "queue": asyncio.Queue()}
+        job = {"status": "running", "result": None, "logs": [], "spans": deque(maxlen=MAX_JOB_SPANS), "error": None, "queue": asyncio.Queue()}
         RESEARCH_JOBS[job_id] = job
     if "queue" not in job or job["queue"] is None:
         job["queue"] = asyncio.Queue()
+    job.setdefault("spans", deque(maxlen=MAX_JOB_SPANS))
     return job
 
 
 async def _emit(job_id: str, event: str, payload: Dict[str, Any]):
     job = _ensure_job(job_id)
     msg = {"event": event, "payload": payload}
-    # keep a small log too (optional)
-    job["logs"].append(payload.get("message", ""))
+    # keep a small log too (optional); span events are kept in job["spans"]
+    if "message" in payload:
+        job["logs"].append(payload["message"])
     await job["queue"].put(msg)
 
 
-async def run_research_task(job_id: str, prompt: str):
+async def run_research_task(job_id: str, prompt: str, queued_at: Optional[float] = None):
     """
     Background task wrapper to update job status.
     """
+    started = time.monotonic()
+    if queued_at is not None:
+        job_queue_wait_seconds.observe(started - queued_at, api="mcp")
     job = _ensure_job(job_id)
     job["status"] = "running"
     job["result"] = None
     save_jobs()  # Save start state
     job["error"] = None
     job["logs"] = []
+    job["spans"] = deque(maxlen=MAX_JOB_SPANS)
 
     await _emit(job_id, "status", {"message": "Job started", "status": "running"})
     
     async def log_callback(msg: str):
         # Push incremental updates to the SSE stream
         await _emit(job_id, "progress", {"message": msg})
+
+    async def span_callback(span: Dict[str, Any]):
+        # Store timing spans on the job; stream them only to connected clients,
+        # since queued events are never dropped and spans are numerous
+        job["spans"].append(span)
+        if job.get("subscribers"):
+            await _emit(job_id, f"{span['kind']}_span", span)
     
     try:
         print(f"DEBUG: Job {job_id} started via background task")
-        # Pass callback to service
-        result = await run_deep_research(prompt, status_callback=log_callback)
+        # Pass callbacks to service
+        result = await run_deep_research(
+            prompt, status_callback=log_callback, span_callback=span_callback
+        )
         
         RESEARCH_JOBS[job_id]["status"] = "completed"
         RESEARCH_JOBS[job_id]["result"] = result
+        job_duration_seconds.observe(time.monotonic() - started, api="mcp", status="completed")
         
         await _emit(job_id, "final", {"report": result})
         await _emit(job_id, "status", {"message": "Job completed", "status": "completed"})
@@ -409,10 +545,12 @@ async def run_research_task(job_id: str, prompt: str):
         error_msg = str(e) if str(e).strip() else repr(e)
         RESEARCH_JOBS[job_id]["status"] = "failed"
         RESEARCH_JOBS[job_id]["error"] = error_msg
+        job_duration_seconds.observe(time.monotonic() - started, api="mcp", status="failed")
         await _emit(job_id, "error", {"message": error_msg})
         save_jobs()  # Save error state
 
     finally:
+        _release_old_spans(job_id)
         # Signal the stream to end (client can close)
         await _emit(job_id, "close", {"message": "stream_end"})
 
@@ -495,7 +633,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent | ImageConten
         
         # Start background task
         # We use asyncio.create_task to run it independently of this request
-        asyncio.create_task(run_research_task(job_id, prompt))
+        asyncio.create_task(run_research_task(job_id, prompt, time.monotonic()))
         
         print(f"DEBUG: Job {job_id} dispatched (Zero-Wait)")
 
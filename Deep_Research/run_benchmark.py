@@ -0,0 +1,265 @@
+"""Benchmark the deep research pipeline end to end.
+
+Runs a corpus of prompts through ``deep_researcher_builder`` against fake or
+replayed backends and writes per-node wall-time percentiles, LLM call counts,
+token usage and peak RSS to a JSON file for comparison across commits.
+
+Usage:
+    python run_benchmark.py --backend fake --output benchmark.json
+    python run_benchmark.py --backend replay --cassette cassettes/run.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def parse_args():
+    """Parse the command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--prompts",
+        default=os.path.join(os.path.dirname(__file__), "benchmarks", "prompts.json"),
+        help="JSON file containing a list of prompts",
+    )
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write results")
+    parser.add_argument(
+        "--backend",
+        choices=["fake", "replay", "live"],
+        default="fake",
+        help="fake: synthetic LLM and search; replay: serve a recorded cassette; live: real endpoints",
+    )
+    parser.add_argument("--cassette", help="Cassette file to replay (with --backend replay)")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Times to run the corpus; each pass replays the cassette from the start",
+    )
+    parser.add_argument("--concurrency", type=int, default=1, help="Prompts run at the same time")
+    parser.add_argument("--limit", type=int, help="Only run the first N prompts")
+    return parser.parse_args()
+
+
+def configure_backend(args) -> None:
+    """Select backends through the environment before deep_research is imported."""
+    if args.backend == "fake":
+        os.environ.setdefault("LLM_BACKEND", "fake")
+        os.environ.setdefault("SEARCH_BACKEND", "fake")
+    elif args.backend == "replay":
+        if not args.cassette:
+            sys.exit("--backend replay requires --cassette")
+        os.environ["CASSETTE_MODE"] = "replay"
+        os.environ["CASSETTE_PATH"] = args.cassette
+    # Benchmarks measure the pipeline, not a warm cache from a previous run or pass
+    os.environ.setdefault("SEARCH_CACHE_BYPASS", "1")
+    os.environ.setdefault("SUMMARY_CACHE_BYPASS", "1")
+    os.environ.setdefault("LLM_CACHE", "0")
+
+
+# ===== STATISTICS =====
+
+
+def percentile(values, q: float) -> float:
+    """Return the q-th percentile (0-100) of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def describe(values) -> dict:
+    """Return the count, p50, p95, max and total of a list of durations."""
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "max": round(max(values), 4) if values else 0.0,
+        "total": round(sum(values), 4),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit() -> str:
+    """Return the checked-out commit hash, or "unknown" outside a git checkout."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarize_llm(spans) -> dict:
+    """Aggregate call, retry, cache, error and token counts and latency of LLM spans."""
+    by_node = {}
+    for span in spans:
+        node = span.attributes.get("node", "unknown")
+        by_node.setdefault(node, 0)
+        by_node[node] += 1
+    return {
+        "calls": len(spans),
+        "attempts": sum(span.attributes.get("attempts", 0) for span in spans),
+        "cached": sum(1 for span in spans if span.attributes.get("cached")),
+        "errors": sum(1 for span in spans if span.status == "error"),
+        "input_tokens": sum(span.attributes.get("input_tokens", 0) for span in spans),
+        "output_tokens": sum(span.attributes.get("output_tokens", 0) for span in spans),
+        "calls_by_node": by_node,
+        "latency": describe([span.duration for span in spans]),
+    }
+
+
+# ===== RUNNER =====
+
+
+async def run_one(graph, prompt: str, index: int) -> dict:
+    """Run one prompt through the graph and collect its spans and timings."""
+    from langchain_core.messages import HumanMessage
+
+    from deep_research.tracing import TraceRecorder, current_trace
+
+    recorder = TraceRecorder()
+    token = current_trace.set(recorder)
+    started = time.monotonic()
+    error = None
+    try:
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content=prompt)], "user_request": prompt},
+            config={
+                "configurable": {"thread_id": f"benchmark-{index}"},
+                "recursion_limit": 50,
+                "callbacks": [recorder],
+            },
+        )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        current_trace.reset(token)
+    wall_time = time.monotonic() - started
+
+    spans = recorder.snapshot()
+    nodes = {}
+    for span in spans:
+        if span.kind == "node":
+            nodes.setdefault(span.name, []).append(span.duration)
+    return {
+        "prompt": prompt,
+        "wall_time": round(wall_time, 4),
+        "error": error,
+        "nodes": {name: describe(durations) for name, durations in nodes.items()},
+        "llm": summarize_llm([span for span in spans if span.kind == "llm"]),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "_spans": spans,
+    }
+
+
+async def main():
+    """Run the corpus and write the benchmark report."""
+    args = parse_args()
+    configure_backend(args)
+
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    from deep_research.cassettes import get_cassette
+    from deep_research.research_agent_full import deep_researcher_builder
+
+    with open(args.prompts, encoding="utf-8") as f:
+        prompts = json.load(f)
+    if args.limit:
+        prompts = prompts[: args.limit]
+    total_runs = len(prompts) * args.repeat
+
+    graph = deep_researcher_builder.compile(checkpointer=InMemorySaver())
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(index: int, prompt: str) -> dict:
+        async with semaphore:
+            print(f"⏳ [{index + 1}/{total_runs}] {prompt[:60]}...")
+            return await run_one(graph, prompt, index)
+
+    print(f"🔧 Benchmarking {total_runs} runs with backend={args.backend}, concurrency={args.concurrency}")
+    started = time.monotonic()
+    runs = []
+    # Each pass runs the whole corpus against the same starting conditions: a
+    # replayed cassette is rewound so its recordings are served again
+    for repeat in range(args.repeat):
+        cassette = get_cassette()
+        if cassette is not None:
+            cassette.rewind()
+        offset = repeat * len(prompts)
+        runs.extend(
+            await asyncio.gather(*(bounded(offset + i, p) for i, p in enumerate(prompts)))
+        )
+    total_time = time.monotonic() - started
+
+    all_spans = [span for run in runs for span in run.pop("_spans")]
+    node_durations = {}
+    for span in all_spans:
+        if span.kind == "node":
+            node_durations.setdefault(span.name, []).append(span.duration)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "prompts": len(prompts),
+            "repeat": args.repeat,
+            "concurrency": args.concurrency,
+        },
+        "summary": {
+            "total_time": round(total_time, 4),
+            "runs": len(runs),
+            "errors": sum(1 for run in runs if run["error"]),
+            "wall_time": describe([run["wall_time"] for run in runs]),
+            "nodes": {
+                name: describe(durations)
+                for name, durations in sorted(node_durations.items())
+            },
+            "llm": summarize_llm([span for span in all_spans if span.kind == "llm"]),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        },
+        "runs": runs,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    summary = results["summary"]
+    print(f"\n✅ {summary['runs']} runs in {summary['total_time']:.1f}s ({summary['errors']} errors)")
+    print(f"   wall time p50={summary['wall_time']['p50']:.2f}s p95={summary['wall_time']['p95']:.2f}s")
+    for name, stats in summary["nodes"].items():
+        print(f"   {name:<26} n={stats['count']:<4} p50={stats['p50']:.3f}s p95={stats['p95']:.3f}s")
+    llm = summary["llm"]
+    print(
+        f"   LLM calls={llm['calls']} tokens in={llm['input_tokens']} out={llm['output_tokens']}"
+        f" peak RSS={summary['peak_rss_mb']} MiB"
+    )
+    print(f"📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
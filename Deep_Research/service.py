@@ -12,13 +12,21 @@ from langgraph.checkpoint.memory import InMemorySaver
 from langchain_core.messages import HumanMessage
 
 from deep_research.research_agent_full import deep_researcher_builder
+from deep_research.tracing import TraceRecorder, current_trace
+from deep_research.url_registry import URLRegistry, current_url_registry
 
-from typing import Callable, Awaitable
+from typing import Any, Callable, Awaitable, Dict
 
-async def run_deep_research(prompt: str, status_callback: Callable[[str], Awaitable[None]] = None) -> str:
+async def run_deep_research(
+    prompt: str,
+    status_callback: Callable[[str], Awaitable[None]] = None,
+    span_callback: Callable[[Dict[str, Any]], Awaitable[None]] = None,
+) -> str:
     """
     Runs the deep research agent with the given prompt and returns the final report.
-    accepts an optional status_callback to report progress.
+    accepts an optional status_callback to report progress, and an optional
+    span_callback that receives a dict for every completed node and LLM call span
+    (timestamps, duration, token counts, retries).
     """
     load_dotenv()
     
@@ -30,12 +38,32 @@ async def run_deep_research(prompt: str, status_callback: Callable[[str], Awaita
     memory = InMemorySaver()
     full_agent = deep_researcher_builder.compile(checkpointer=memory)
 
+    # Spans can complete on worker threads; hand them to the loop in order
+    loop = asyncio.get_running_loop()
+    span_queue: asyncio.Queue = asyncio.Queue()
+
+    def on_span(span):
+        loop.call_soon_threadsafe(span_queue.put_nowait, span.to_dict())
+
+    async def forward_spans():
+        while True:
+            span = await span_queue.get()
+            if span is None:
+                return
+            try:
+                await span_callback(span)
+            except Exception:
+                pass
+
+    recorder = TraceRecorder(on_span=on_span if span_callback else None)
+
     # LangGraph config: increase recursion_limit enough for full pipeline
     thread_config = {
         "configurable": {
             "thread_id": "researchoutput",
             "recursion_limit": 50,
-        }
+        },
+        "callbacks": [recorder],
     }
 
     # ----- Invoke the full graph with streaming -----
@@ -52,6 +80,38 @@ async def run_deep_research(prompt: str, status_callback: Callable[[str], Awaita
                 pass
         print(f"STATUS: {msg}")
 
+    trace_token = current_trace.set(recorder)
+    # One URL registry per job; every researcher in every supervisor round shares it
+    registry_token = current_url_registry.set(URLRegistry())
+    forwarder = asyncio.create_task(forward_spans()) if span_callback else None
+    try:
+        final_state = await _stream_graph(full_agent, prompt, thread_config, report)
+    finally:
+        current_url_registry.reset(registry_token)
+        current_trace.reset(trace_token)
+        if forwarder is not None:
+            span_queue.put_nowait(None)
+            await forwarder
+
+    if not final_state:
+        return "Error: No final state returned from graph stream."
+    
+    # ----- Extract the final profile -----
+    final_profile = final_state.get("final_report")
+    if not final_profile:
+        # Fallback: try draft_report if final_report missing
+        final_profile = final_state.get("draft_report")
+
+    if not final_profile:
+        return "Error: No final_report or draft_report found in result state."
+
+    return final_profile
+
+
+async def _stream_graph(full_agent, prompt: str, thread_config, report):
+    """Run the graph with astream_events, reporting progress; return the final state."""
+    final_state = None
+
     # Use astream_events to get real-time progress
     async for event in full_agent.astream_events(
         {
@@ -80,19 +140,7 @@ async def run_deep_research(prompt: str, status_callback: Callable[[str], Awaita
              # The final output is in event['data']['output']
              final_state = event['data'].get('output')
 
-    if not final_state:
-        return "Error: No final state returned from graph stream."
-    
-    # ----- Extract the final profile -----
-    final_profile = final_state.get("final_report")
-    if not final_profile:
-        # Fallback: try draft_report if final_report missing
-        final_profile = final_state.get("draft_report")
-
-    if not final_profile:
-        return "Error: No final_report or draft_report found in result state."
-
-    return final_profile
+    return final_state
 
     # ----- Extract the final profile -----
     final_profile = result.get("final_report")
@@ -0,0 +1,249 @@
+"""Caching Utilities.
+
+This module provides the cache tiers shared by the research pipeline: a
+thread-safe in-process LRU, an optional on-disk SQLite store with TTL and
+size-based eviction, and a tiered cache combining both with hit/miss counters.
+Async callers use ``aget``/``aset``, which run disk-tier queries on a worker
+thread so the event loop never waits on SQLite.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing_extensions import Any, Optional
+
+# ===== KEYS =====
+
+
+def content_hash(*parts: str) -> str:
+    """Build a stable SHA-256 cache key from one or more string parts.
+
+    Args:
+        parts: Strings that together identify the cached value
+
+    Returns:
+        Hex digest uniquely identifying the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8", errors="replace"))
+        # Separator so ("ab", "c") and ("a", "bc") hash differently
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+# ===== CACHE TIERS =====
+
+
+class LRUCache:
+    """Thread-safe in-process least-recently-used cache.
+
+    Entries remember when they were written so callers can apply a
+    per-lookup ``ttl``; expired entries are dropped on access.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """Create an empty cache holding at most ``max_size`` entries."""
+        self.max_size = max_size
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or older than ``ttl`` seconds."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            value, created_at = self._data[key]
+            if ttl is not None and time.time() - created_at > ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, created_at: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries past ``max_size``."""
+        with self._lock:
+            self._data[key] = (value, created_at or time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return the number of entries held."""
+        return len(self._data)
+
+
+class SQLiteCache:
+    """On-disk JSON value store with TTL and size-based eviction.
+
+    Entries older than ``ttl`` seconds are treated as misses and purged.
+    When the store grows past ``max_entries``, the least recently written
+    entries are evicted.
+
+    One connection is opened lazily and shared by every thread; queries are
+    serialized by a lock, and ``close`` releases the connection.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int = 10000):
+        """Open (creating if needed) the cache database at ``path``."""
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Called with the lock held; ``with conn`` only scopes a transaction
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the connection; the next query reopens it."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        entry = self.get_entry(key, ttl=ttl)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str, ttl: Optional[float] = None) -> Optional[tuple]:
+        """Return ``(value, created_at)`` for a fresh entry, or None."""
+        max_age = self.ttl if ttl is None else ttl
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if time.time() - created_at > max_age:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+        return json.loads(value), created_at
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value and evict expired and excess entries."""
+        payload = json.dumps(value)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY created_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+
+class TieredCache:
+    """In-process LRU in front of an optional SQLite tier, with hit/miss counters.
+
+    Disk hits are promoted into the memory tier. Values must be
+    JSON-serializable when a disk tier is configured.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        """Combine a memory tier with an optional disk tier."""
+        self.memory = memory
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Return the value from memory, then disk, or None on a miss."""
+        value = self._memory_get(key, ttl)
+        if value is None and self.disk is not None:
+            value = self._disk_get(key, ttl)
+        if value is None:
+            self._count("misses")
+        return value
+
+    async def aget(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Async variant of ``get``; the disk tier is read on a worker thread."""
+        value = self._memory_get(key, ttl)
+        if value is None and self.disk is not None:
+            value = await asyncio.to_thread(self._disk_get, key, ttl)
+        if value is None:
+            self._count("misses")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers."""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self._disk_set(key, value)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Async variant of ``set``; the disk tier is written on a worker thread."""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self._disk_set, key, value)
+
+    def _memory_get(self, key: str, ttl: Optional[float]) -> Optional[Any]:
+        value = self.memory.get(key, ttl=ttl)
+        if value is not None:
+            self._count("memory_hits")
+        return value
+
+    def _disk_get(self, key: str, ttl: Optional[float]) -> Optional[Any]:
+        try:
+            entry = self.disk.get_entry(key, ttl=ttl)
+        except sqlite3.Error as e:
+            print(f"Cache disk read failed: {e}")
+            return None
+        if entry is None:
+            return None
+        value, created_at = entry
+        self._count("disk_hits")
+        # Keep the original write time so promotion does not extend the TTL
+        self.memory.set(key, value, created_at=created_at)
+        return value
+
+    def _disk_set(self, key: str, value: Any) -> None:
+        try:
+            self.disk.set(key, value)
+        except sqlite3.Error as e:
+            print(f"Cache disk write failed: {e}")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the overall hit ratio."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
@@ -0,0 +1,256 @@
+"""Record/Replay Cassettes.
+
+This module captures the external calls made by the research pipeline (chat
+model responses, Tavily searches and PDF fetches) into a cassette file and
+serves them back later, so the whole graph can run offline and
+deterministically for benchmarking.
+
+Set ``CASSETTE_MODE=record`` to call the live services and write every
+response to ``CASSETTE_PATH``; set ``CASSETTE_MODE=replay`` to serve the
+recorded responses instead. ``CASSETTE_LATENCY_SCALE`` multiplies the
+recorded latency on replay (0 replays instantly, 1 reproduces the original
+timing). The recording date is stored in the cassette and reported as today's
+date during replay, so prompts that embed it match the recording.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import date
+from pathlib import Path
+from typing_extensions import Any, Awaitable, Callable, Dict, Optional
+
+from deep_research.cache import content_hash
+
+# ===== CONFIGURATION =====
+
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "").lower()
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", "cassettes/deep_research.jsonl")
+CASSETTE_LATENCY_SCALE = float(os.getenv("CASSETTE_LATENCY_SCALE", "1.0"))
+
+
+class CassetteMissError(LookupError):
+    """Raised on replay when no recorded response matches a request."""
+
+
+# ===== CASSETTE =====
+
+
+class Cassette:
+    """JSONL file of recorded requests and responses.
+
+    Each entry stores the call kind (``llm``, ``search`` or ``pdf``), a hash
+    of the full request, a group naming the client that made it, the
+    response and the observed latency.
+
+    The first line is a session header holding the recording date, which
+    ``today`` reports during the session (None for cassettes without one).
+
+    On replay a request is matched by its hash first; identical requests are
+    served their recordings in order. A request that does not match exactly
+    falls back to the oldest unused recording of the same kind and group.
+    """
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 1.0):
+        """Start a recording at ``path``, or load it for replay."""
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = str(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._by_key: Dict[tuple, deque] = defaultdict(deque)
+        self._by_group: Dict[tuple, deque] = defaultdict(deque)
+        self.recorded = 0
+        self.exact_hits = 0
+        self.fallback_hits = 0
+        self.misses = 0
+        self.today: Optional[date] = None
+
+        if mode == "record":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self.today = date.today()
+            # Start a fresh cassette for each recording session
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"kind": "session", "date": self.today.isoformat()}) + "\n")
+        else:
+            self._load()
+
+    def rewind(self) -> None:
+        """Make every recording available again, to replay the session once more."""
+        if self.mode != "replay":
+            return
+        with self._lock:
+            self._by_key.clear()
+            self._by_group.clear()
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["kind"] == "session":
+                    self.today = date.fromisoformat(entry["date"])
+                    continue
+                entry["used"] = False
+                self._by_key[(entry["kind"], entry["key"])].append(entry)
+                self._by_group[(entry["kind"], entry["group"])].append(entry)
+
+    def _take(self, kind: str, key: str, group: str) -> dict:
+        with self._lock:
+            matches = self._by_key.get((kind, key))
+            while matches:
+                entry = matches.popleft()
+                if not entry["used"]:
+                    entry["used"] = True
+                    self.exact_hits += 1
+                    return entry
+
+            candidates = self._by_group.get((kind, group))
+            while candidates:
+                entry = candidates.popleft()
+                if not entry["used"]:
+                    entry["used"] = True
+                    self.fallback_hits += 1
+                    return entry
+
+            self.misses += 1
+        raise CassetteMissError(f"No recorded {kind} response for group {group!r}")
+
+    def _record(self, kind: str, key: str, group: str, response: Any, latency: float) -> None:
+        line = json.dumps(
+            {
+                "kind": kind,
+                "key": key,
+                "group": group,
+                "latency": round(latency, 4),
+                "response": response,
+            }
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    def call(
+        self,
+        kind: str,
+        key: str,
+        group: str,
+        fn: Callable[[], Any],
+        dump: Callable[[Any], Any] = lambda value: value,
+        load: Callable[[Any], Any] = lambda value: value,
+    ) -> Any:
+        """Record or replay one synchronous call.
+
+        Args:
+            kind: Call kind, e.g. "llm", "search" or "pdf"
+            key: Hash identifying the full request
+            group: Client identity used for fallback matching
+            fn: Zero-argument function performing the live call
+            dump: Converts the live response to JSON-serializable data
+            load: Rebuilds a response from recorded data
+
+        Returns:
+            The live (record mode) or recorded (replay mode) response
+        """
+        if self.mode == "replay":
+            entry = self._take(kind, key, group)
+            time.sleep(entry["latency"] * self.latency_scale)
+            return load(entry["response"])
+
+        started = time.monotonic()
+        response = fn()
+        self._record(kind, key, group, dump(response), time.monotonic() - started)
+        return response
+
+    async def acall(
+        self,
+        kind: str,
+        key: str,
+        group: str,
+        fn: Callable[[], Awaitable[Any]],
+        dump: Callable[[Any], Any] = lambda value: value,
+        load: Callable[[Any], Any] = lambda value: value,
+    ) -> Any:
+        """Async variant of ``call``; replay latency does not block the event loop."""
+        if self.mode == "replay":
+            entry = self._take(kind, key, group)
+            await asyncio.sleep(entry["latency"] * self.latency_scale)
+            return load(entry["response"])
+
+        started = time.monotonic()
+        response = await fn()
+        self._record(kind, key, group, dump(response), time.monotonic() - started)
+        return response
+
+    def stats(self) -> dict:
+        """Return recording and replay counters."""
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "exact_hits": self.exact_hits,
+            "fallback_hits": self.fallback_hits,
+            "misses": self.misses,
+        }
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Return the process-wide cassette, or None when record/replay is off."""
+    global _cassette
+    if CASSETTE_MODE not in ("record", "replay"):
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_LATENCY_SCALE)
+    return _cassette
+
+
+# ===== CLIENT WRAPPERS =====
+
+
+class CassetteTavilyClient:
+    """Tavily client whose searches go through the cassette.
+
+    ``client`` may be None on replay, so no API key is needed offline.
+    """
+
+    def __init__(self, client, cassette: Cassette):
+        """Wrap a Tavily client (None on replay) with a cassette."""
+        self.client = client
+        self.cassette = cassette
+
+    def search(self, query: str, **kwargs) -> dict:
+        """Run, record or replay one Tavily search."""
+        return self.cassette.call(
+            "search",
+            _search_key(query, kwargs),
+            "tavily",
+            lambda: self.client.search(query, **kwargs),
+        )
+
+
+class AsyncCassetteTavilyClient(CassetteTavilyClient):
+    """Async Tavily client whose searches go through the cassette."""
+
+    async def search(self, query: str, **kwargs) -> dict:
+        """Run, record or replay one Tavily search without blocking the event loop."""
+        return await self.cassette.acall(
+            "search",
+            _search_key(query, kwargs),
+            "tavily",
+            lambda: self.client.search(query, **kwargs),
+        )
+
+
+def _search_key(query: str, kwargs: dict) -> str:
+    return content_hash(query, json.dumps(kwargs, sort_keys=True, default=str))
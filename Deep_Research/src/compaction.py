@@ -0,0 +1,122 @@
+"""Researcher Context Compaction.
+
+This module keeps a researcher's per-turn prompt bounded. Each ``llm_call``
+resends the whole ``researcher_messages`` history, and every search result in
+it carries full page summaries, so prompt size grows with every round. Once
+the history passes a token threshold, the oldest tool outputs are replaced in
+the prompt by short digests (sources and the opening of each summary) with a
+note that the full text was kept.
+
+Compaction only rewrites the prompt; the graph state keeps every message
+intact, so ``compress_research`` still sees the full tool outputs. Outputs are
+compacted oldest first and digests are deterministic, so once a message is
+compacted it reads the same on every later turn.
+"""
+
+import os
+import re
+from typing_extensions import List, Sequence
+
+from langchain_core.messages import BaseMessage, ToolMessage
+
+# ===== CONFIGURATION =====
+
+# Prompt history size (estimated tokens) above which old tool outputs are compacted; 0 disables
+RESEARCHER_CONTEXT_TOKENS = int(os.getenv("RESEARCHER_CONTEXT_TOKENS", "40000"))
+# Characters kept from each source summary, and from other tool outputs
+COMPACT_SOURCE_CHARS = int(os.getenv("COMPACT_SOURCE_CHARS", "200"))
+COMPACT_OUTPUT_CHARS = int(os.getenv("COMPACT_OUTPUT_CHARS", "600"))
+
+# Matches one source block of ``format_search_output``
+_SOURCE_PATTERN = re.compile(
+    r"--- SOURCE \d+: (?P<title>.*?) ---\s*URL: (?P<url>\S+)\s*SUMMARY:\s*(?P<summary>.*?)(?=\n-{80}|\Z)",
+    re.DOTALL,
+)
+
+
+# ===== DIGESTS =====
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + " ..."
+
+
+def digest_tool_output(message: ToolMessage) -> str:
+    """Return a compact stand-in for a tool output.
+
+    Search results are reduced to one line per source (title, URL and the
+    start of its summary); other outputs keep their opening characters.
+
+    Args:
+        message: Tool message to digest
+
+    Returns:
+        Digest text, marked as compacted
+    """
+    content = str(message.content)
+    sources = list(_SOURCE_PATTERN.finditer(content))
+    if sources:
+        lines = []
+        for match in sources:
+            summary = re.sub(r"</?(summary|key_excerpts)>", " ", match.group("summary"))
+            lines.append(
+                f"- {match.group('title').strip()} ({match.group('url')}): "
+                f"{_shorten(summary, COMPACT_SOURCE_CHARS)}"
+            )
+        body = "Sources found:\n" + "\n".join(lines)
+    else:
+        body = _shorten(content, COMPACT_OUTPUT_CHARS)
+    return (
+        f"[Compacted {message.name or 'tool'} output; the full text is kept for the "
+        f"final research summary]\n{body}"
+    )
+
+
+# ===== COMPACTION =====
+
+
+def _estimate(message: BaseMessage) -> int:
+    # Same ~4 characters per token heuristic as ``estimate_tokens``
+    return len(str(message.content)) // 4 + 1
+
+
+def compact_history(
+    messages: Sequence[BaseMessage],
+    max_tokens: int = RESEARCHER_CONTEXT_TOKENS,
+) -> List[BaseMessage]:
+    """Replace the oldest tool outputs with digests until the history fits.
+
+    Tool outputs from the latest tool round (after the last AI message) are
+    never compacted, so the model always sees its newest results in full.
+
+    Args:
+        messages: Researcher message history
+        max_tokens: Estimated token size to bring the history under (0 disables)
+
+    Returns:
+        A new message list; the input messages are not modified
+    """
+    compacted = list(messages)
+    total = sum(_estimate(message) for message in compacted)
+    if not max_tokens or total <= max_tokens:
+        return compacted
+
+    last_ai = max(
+        (i for i, message in enumerate(compacted) if message.type == "ai"), default=-1
+    )
+    for i in range(last_ai):
+        if total <= max_tokens:
+            break
+        message = compacted[i]
+        if not isinstance(message, ToolMessage):
+            continue
+        digest = digest_tool_output(message)
+        if len(digest) >= len(str(message.content)):
+            continue
+        replacement = message.model_copy(update={"content": digest})
+        total -= _estimate(message) - _estimate(replacement)
+        compacted[i] = replacement
+    return compacted
@@ -0,0 +1,406 @@
+"""Concurrency Utilities.
+
+This module provides asyncio coordination primitives shared by the research
+pipeline, such as coalescing identical in-flight requests across researchers,
+client-side rate limiting of LLM calls and adaptive concurrency limits.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+import weakref
+from typing_extensions import Any, Awaitable, Callable, Hashable, Optional
+
+
+class EventLoopBlockedError(RuntimeError):
+    """A synchronous limiter call would block the event loop running on its thread."""
+
+
+def _loop_running_here() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+# ===== SINGLE-FLIGHT =====
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still in flight await the same result instead of starting their own.
+    Once the work finishes the key is released, so later calls run afresh
+    (pair this with a cache to reuse completed results).
+
+    In-flight calls are tracked per event loop, since asyncio futures cannot
+    be awaited across loops.
+    """
+
+    def __init__(self):
+        """Create a coalescer with no calls in flight."""
+        # event loop -> {key: in-flight task}
+        self._calls = weakref.WeakKeyDictionary()
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        The shared work is shielded, so a caller that is cancelled (e.g. by
+        a timeout) does not cancel the result other callers are waiting on.
+
+        Args:
+            key: Identity of the work being requested
+            fn: Zero-argument coroutine factory that performs the work
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        task = calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = loop.create_task(fn())
+        calls[key] = task
+        self.executions += 1
+
+        def release(done: asyncio.Task) -> None:
+            if calls.get(key) is done:
+                del calls[key]
+            # Mark the exception as retrieved if every caller was cancelled
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(release)
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently in flight across all loops."""
+        return sum(len(calls) for calls in self._calls.values())
+
+    def stats(self) -> dict:
+        """Return execution and coalescing counters."""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight(),
+        }
+
+
+# ===== RATE LIMITING =====
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``.
+
+    Callers reserve tokens up front and are told how long to wait; the
+    balance may go negative, so waiters are served in arrival order without
+    polling.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        """Create a full bucket holding one minute of tokens."""
+        self.capacity = float(rate_per_minute)
+        self.fill_rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Reserve ``amount`` tokens and return the seconds to wait before using them."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.fill_rate
+            )
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.fill_rate)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one model endpoint.
+
+    A limit of 0 disables that bucket. Waiting never blocks the event loop on
+    the async path, and the limiter can be shared across threads and loops.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0):
+        """Create request and token buckets for the non-zero limits."""
+        self.request_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self.token_bucket = TokenBucket(tpm) if tpm > 0 else None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tokens = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        with self._lock:
+            self.requests += 1
+            self.tokens += tokens
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def _set_waiting(self, delta: int) -> None:
+        with self._lock:
+            self.waiting += delta
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait until one request of ``tokens`` estimated tokens may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._set_waiting(1)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._set_waiting(-1)
+        return wait
+
+    def acquire_sync(self, tokens: int = 0) -> float:
+        """Blocking variant of ``acquire`` for synchronous callers.
+
+        Raises:
+            EventLoopBlockedError: If it would have to sleep on a thread that
+                is running an event loop
+        """
+        wait = self._reserve(tokens)
+        if wait > 0 and _loop_running_here():
+            raise EventLoopBlockedError(
+                f"Synchronous LLM call would stall the running event loop for {wait:.1f}s "
+                "waiting for request quota; use the async API"
+            )
+        if wait > 0:
+            self._set_waiting(1)
+            try:
+                time.sleep(wait)
+            finally:
+                self._set_waiting(-1)
+        return wait
+
+    def stats(self) -> dict:
+        """Return queue depth, wait time and throughput counters."""
+        return {
+            "requests": self.requests,
+            "estimated_tokens": self.tokens,
+            "queue_depth": self.waiting,
+            "total_wait_seconds": self.total_wait,
+            "avg_wait_seconds": self.total_wait / self.requests if self.requests else 0.0,
+            "max_wait_seconds": self.max_wait,
+        }
+
+
+# ===== ADAPTIVE CONCURRENCY =====
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight calls to one backend.
+
+    The limit grows additively (about +1 per ``limit`` successful calls)
+    while calls succeed with every slot in use, and is multiplied by
+    ``decrease_factor`` when a call fails with an overload error (429/5xx).
+    Only error feedback drives the limit: call latency varies with prompt and
+    output length, so it says little about backend saturation. Decreases are
+    spaced by the smoothed latency, so a burst of failures from the same
+    window halves the limit once rather than repeatedly.
+
+    Slots are shared across threads and event loops: async callers wait on
+    a future of their own loop and sync callers on an event.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        is_overload: Optional[Callable[[BaseException], bool]] = None,
+        decrease_factor: float = 0.5,
+    ):
+        """Create a limiter starting at ``initial_limit``, clamped to ``[min_limit, max_limit]``."""
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self.is_overload = is_overload or (lambda error: False)
+        self.decrease_factor = decrease_factor
+        self._lock = threading.Lock()
+        self._waiters = collections.deque()
+        self._in_flight = 0
+        self._latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self.calls = 0
+        self.overloads = 0
+        self.decreases = 0
+
+    # ----- slots -----
+
+    def _has_capacity(self) -> bool:
+        return self._in_flight < int(self.limit)
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to queued waiters in arrival order."""
+        while True:
+            with self._lock:
+                if not self._waiters or not self._has_capacity():
+                    return
+                wake = self._waiters.popleft()
+                self._in_flight += 1
+            if not wake():
+                self._release_slot()
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._wake_waiters()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._has_capacity() and not self._waiters:
+                self._in_flight += 1
+                return
+            future = loop.create_future()
+
+            def deliver() -> None:
+                # Runs on the waiter's loop; give the slot back if it gave up
+                if future.done():
+                    self._release_slot()
+                else:
+                    future.set_result(None)
+
+            def wake() -> bool:
+                try:
+                    loop.call_soon_threadsafe(deliver)
+                except RuntimeError:  # the waiter's loop has closed
+                    return False
+                return True
+
+            self._waiters.append(wake)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = wake in self._waiters
+                if queued:
+                    self._waiters.remove(wake)
+            if not queued and future.done() and not future.cancelled():
+                self._release_slot()
+            raise
+
+    def acquire_sync(self) -> None:
+        """Blocking variant of ``acquire`` for synchronous callers.
+
+        Raises:
+            EventLoopBlockedError: If no slot is free and this thread is running
+                an event loop, whose own calls may hold every slot
+        """
+        with self._lock:
+            if self._has_capacity() and not self._waiters:
+                self._in_flight += 1
+                return
+            if _loop_running_here():
+                raise EventLoopBlockedError(
+                    "Synchronous LLM call would block the running event loop "
+                    "waiting for a concurrency slot; use the async API"
+                )
+            event = threading.Event()
+
+            def wake() -> bool:
+                event.set()
+                return True
+
+            self._waiters.append(wake)
+        event.wait()
+
+    # ----- feedback -----
+
+    def _record(self, latency: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            self.calls += 1
+            if error is not None and self.is_overload(error):
+                self.overloads += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= (self._latency or 0.0):
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.decreases += 1
+                return
+            if error is not None:
+                return
+
+            self._latency = (
+                latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            )
+            # Grow only under load, so an idle period does not raise the limit
+            # to the maximum ahead of the next burst
+            if self._in_flight >= int(self.limit):
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _finish(self, started: float, error: Optional[BaseException]) -> None:
+        self._record(time.monotonic() - started, error)
+        self._release_slot()
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()`` inside a slot and feed its outcome back into the limit."""
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(started, e)
+            raise
+        except BaseException:
+            # Cancelled calls say nothing about backend health
+            self._release_slot()
+            raise
+        self._finish(started, None)
+        return result
+
+    def run_sync(self, fn: Callable[[], Any]) -> Any:
+        """Call ``fn()`` inside a slot and feed its outcome back into the limit."""
+        self.acquire_sync()
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(started, e)
+            raise
+        except BaseException:
+            # Cancelled calls say nothing about backend health
+            self._release_slot()
+            raise
+        self._finish(started, None)
+        return result
+
+    def stats(self) -> dict:
+        """Return the current limit, occupancy and overload counters."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "calls": self.calls,
+            "overloads": self.overloads,
+            "decreases": self.decreases,
+            "latency_ewma_seconds": self._latency,
+        }
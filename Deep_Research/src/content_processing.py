@@ -0,0 +1,499 @@
+"""Local Content Processing.
+
+This module provides cheap, in-process text and URL processing applied to
+search results before any LLM is involved, including URL canonicalization,
+near-duplicate detection for page bodies, boilerplate stripping, BM25
+relevance ranking and structural chunking of long pages.
+"""
+
+import heapq
+import math
+import os
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from collections import Counter
+from typing_extensions import Dict, List, Optional
+
+from deep_research.metrics import registry
+
+# ===== URL CANONICALIZATION =====
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref_src",
+    "ref_url",
+    "cmpid",
+    "spm",
+    "_ga",
+    "_gl",
+    "ocid",
+    "amp",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+# Host prefixes for mobile/AMP mirrors of the same page; stripped only when a
+# registrable domain remains (amp.dev and m.dev are sites of their own)
+MIRROR_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+
+def canonicalize_url(url: str) -> str:
+    """Reduce a URL to a canonical form shared by its trivial variants.
+
+    Normalizes the scheme to https, lowercases the host, strips ``www``/mobile/AMP
+    host prefixes, default ports, fragments, tracking parameters, AMP path
+    segments and trailing slashes, and sorts the remaining query parameters.
+
+    Args:
+        url: URL as returned by the search API
+
+    Returns:
+        Canonical URL used as the deduplication key
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    if not parts.netloc:
+        return url.strip()
+
+    host = parts.hostname or ""
+    for prefix in MIRROR_HOST_PREFIXES:
+        if host.startswith(prefix) and "." in host[len(prefix):]:
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/amp(?=/|$)", "", parts.path)
+    path = re.sub(r"\.amp(?=\.html?$|$)", "", path)
+    path = re.sub(r"/index\.html?$", "/", path)
+    path = re.sub(r"/{2,}", "/", path).rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+# ===== NEAR-DUPLICATE DETECTION =====
+
+# Estimated Jaccard similarity above which two bodies are treated as copies
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+MINHASH_SKETCH_SIZE = 128
+SHINGLE_WORDS = 5
+# Characters of each page fingerprinted; copies agree well before this point
+FINGERPRINT_TEXT_LIMIT = 50000
+
+
+def minhash_fingerprint(text: str, sketch_size: int = MINHASH_SKETCH_SIZE) -> List[int]:
+    """Compute a bottom-k MinHash sketch of a document's word shingles.
+
+    Each word shingle is hashed once and the ``sketch_size`` smallest hashes
+    are kept, which estimates Jaccard similarity in a single linear pass.
+    Only the first FINGERPRINT_TEXT_LIMIT characters are shingled.
+
+    Args:
+        text: Page body to fingerprint
+        sketch_size: Number of minimum hashes to keep
+
+    Returns:
+        Sorted list of the smallest shingle hashes
+    """
+    words = re.findall(r"\w+", text[:FINGERPRINT_TEXT_LIMIT].lower())
+    if len(words) < SHINGLE_WORDS:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {
+            " ".join(words[i : i + SHINGLE_WORDS])
+            for i in range(len(words) - SHINGLE_WORDS + 1)
+        }
+    hashes = {zlib.crc32(shingle.encode("utf-8")) for shingle in shingles}
+    return heapq.nsmallest(sketch_size, hashes)
+
+
+def estimate_similarity(
+    sketch_a: List[int], sketch_b: List[int], sketch_size: int = MINHASH_SKETCH_SIZE
+) -> float:
+    """Estimate the Jaccard similarity of two documents from their MinHash sketches."""
+    if not sketch_a or not sketch_b:
+        return 0.0
+    set_a, set_b = set(sketch_a), set(sketch_b)
+    union_sketch = heapq.nsmallest(sketch_size, set_a | set_b)
+    shared = sum(1 for h in union_sketch if h in set_a and h in set_b)
+    return shared / len(union_sketch)
+
+
+# ===== DEDUPLICATION =====
+
+duplicates_collapsed_total = registry.counter(
+    "deep_research_duplicates_collapsed_total",
+    "Search results collapsed before summarization, by match type (url or content).",
+    ("match",),
+)
+dedup_summaries_saved_total = registry.counter(
+    "deep_research_dedup_summaries_saved_total",
+    "Page summaries avoided by collapsing duplicate search results.",
+)
+
+
+def collapse_duplicates(
+    search_results: List[dict], threshold: Optional[float] = None
+) -> Dict[str, dict]:
+    """Collapse URL variants and near-duplicate bodies across search responses.
+
+    Results are visited in rank order; the first result of each duplicate
+    group is kept. Two results are duplicates when their canonical URLs match
+    or when their ``raw_content`` MinHash similarity reaches ``threshold``.
+
+    Args:
+        search_results: List of Tavily search response dictionaries
+        threshold: Similarity threshold (defaults to NEAR_DUPLICATE_THRESHOLD)
+
+    Returns:
+        Dictionary mapping the kept results' URLs to their results
+    """
+    threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+    unique_results: Dict[str, dict] = {}
+    seen_urls = set()
+    sketches: List[List[int]] = []
+    url_duplicates = near_duplicates = llm_calls_saved = 0
+
+    for response in search_results:
+        for result in response["results"]:
+            canonical = canonicalize_url(result["url"])
+            if canonical in seen_urls:
+                url_duplicates += 1
+                llm_calls_saved += bool(result.get("raw_content"))
+                continue
+            seen_urls.add(canonical)
+
+            raw_content = result.get("raw_content")
+            if raw_content:
+                sketch = minhash_fingerprint(raw_content)
+                if any(
+                    estimate_similarity(sketch, other) >= threshold
+                    for other in sketches
+                ):
+                    near_duplicates += 1
+                    llm_calls_saved += 1
+                    continue
+                sketches.append(sketch)
+
+            unique_results[result["url"]] = result
+
+    duplicates_collapsed_total.inc(url_duplicates, match="url")
+    duplicates_collapsed_total.inc(near_duplicates, match="content")
+    dedup_summaries_saved_total.inc(llm_calls_saved)
+    return unique_results
+
+
+# ===== BOILERPLATE STRIPPING =====
+
+# Short, sentence-less lines containing these phrases (or equal to these lines)
+# are navigation, consent or footer chrome. Plain substring checks keep this fast.
+BOILERPLATE_PHRASES = (
+    "cookie",
+    "accept all",
+    "reject all",
+    "manage preferences",
+    "privacy policy",
+    "terms of use",
+    "terms of service",
+    "all rights reserved",
+    "subscribe to our newsletter",
+    "skip to content",
+    "skip to main content",
+    "follow us on",
+    "back to top",
+)
+BOILERPLATE_LINES = {
+    "sign in",
+    "sign up",
+    "log in",
+    "register",
+    "share",
+    "share this",
+    "advertisement",
+    "menu",
+    "search",
+}
+BOILERPLATE_MAX_LINE = 200
+# Phrase filters only apply to lines of at most this many words
+CHROME_MAX_WORDS = 6
+# Short lines whose text is mostly link text or URLs are dropped
+MAX_LINK_DENSITY = 0.5
+# Lines with numbers or table rows are likely data and are always kept
+PROTECTED_LINE = re.compile(r"\d|\|.*\|")
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+BARE_URL = re.compile(r"https?://\S+")
+INVISIBLE_CHARS = re.compile(r"[\u200b-\u200f\u2060\ufeff]")
+# Characters saved per page, from clean articles to chrome-heavy pages
+SAVED_CHARS_BUCKETS = (0, 100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+
+
+def _link_density(line: str) -> float:
+    if "](" not in line and "://" not in line:
+        return 0.0
+    link_chars = sum(len(m.group(0)) for m in MARKDOWN_LINK.finditer(line))
+    link_chars += sum(len(m.group(0)) for m in BARE_URL.finditer(MARKDOWN_LINK.sub("", line)))
+    return link_chars / len(line) if line else 0.0
+
+
+def _is_chrome(line: str) -> bool:
+    """Whether a short line reads like consent, navigation or footer chrome."""
+    lower = line.lower()
+    if lower in BOILERPLATE_LINES:
+        return True
+    # Phrases inside real sentences ("... privacy policy of the agency.") are content
+    if len(line.split()) > CHROME_MAX_WORDS or line.endswith((".", "?", "!")):
+        return False
+    return any(phrase in lower for phrase in BOILERPLATE_PHRASES)
+
+
+pages_cleaned_total = registry.counter(
+    "deep_research_pages_cleaned_total",
+    "Pages stripped of boilerplate before summarization.",
+)
+page_chars_total = registry.counter(
+    "deep_research_page_chars_total",
+    "Characters of page text before and after boilerplate stripping, by stage (raw or cleaned).",
+    ("stage",),
+)
+page_chars_saved = registry.histogram(
+    "deep_research_page_chars_saved",
+    "Characters removed from a single page by boilerplate stripping.",
+    buckets=SAVED_CHARS_BUCKETS,
+)
+
+
+def clean_page_text(text: str) -> str:
+    """Strip boilerplate and redundant whitespace from raw page text.
+
+    Removes invisible characters, collapses whitespace runs, and drops short
+    lines that are consent/navigation chrome or mostly links. Repeated lines
+    (menus and footers) keep only their first occurrence. Lines with digits
+    or table syntax are always kept. Character totals are recorded in
+    ``page_chars_total`` and the saving per page in ``page_chars_saved``.
+
+    Args:
+        text: Raw page content from the search API
+
+    Returns:
+        Cleaned page content
+    """
+    normalized = INVISIBLE_CHARS.sub("", text.replace("\r\n", "\n").replace("\xa0", " "))
+    lines = [" ".join(line.split()) for line in normalized.split("\n")]
+
+    kept: List[str] = []
+    seen = set()
+    for line in lines:
+        if not line:
+            # Collapse runs of blank lines into a single paragraph break
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if PROTECTED_LINE.search(line):
+            kept.append(line)
+            continue
+        if len(line) < BOILERPLATE_MAX_LINE and (
+            _is_chrome(line) or _link_density(line) > MAX_LINK_DENSITY
+        ):
+            continue
+        if line in seen:
+            continue
+        seen.add(line)
+        kept.append(line)
+
+    cleaned = "\n".join(kept).strip()
+    pages_cleaned_total.inc()
+    page_chars_total.inc(len(text), stage="raw")
+    page_chars_total.inc(len(cleaned), stage="cleaned")
+    page_chars_saved.observe(len(text) - len(cleaned))
+    return cleaned
+
+
+# ===== RELEVANCE RANKING =====
+
+# Only the top-k results by BM25 relevance get an LLM summary; the rest keep
+# their Tavily snippet. Results scoring below SUMMARY_MIN_RELEVANCE (relative to
+# the best result, 0-1) are also passed through. Searches return 3 results by
+# default, so the relative threshold is what prunes; the cap matters for larger
+# max_results.
+SUMMARY_TOP_K = int(os.getenv("SUMMARY_TOP_K", "3"))
+SUMMARY_MIN_RELEVANCE = float(os.getenv("SUMMARY_MIN_RELEVANCE", "0.2"))
+# Characters of each page considered when ranking
+RANKING_TEXT_LIMIT = 100000
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def _tokenize(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def bm25_scores(query: str, documents: List[str]) -> List[float]:
+    """Score documents against a query with Okapi BM25, using the documents as the corpus.
+
+    Args:
+        query: Search query
+        documents: Texts to score
+
+    Returns:
+        One score per document, in input order
+    """
+    query_terms = set(_tokenize(query))
+    doc_terms = [Counter(_tokenize(doc)) for doc in documents]
+    if not query_terms or not doc_terms:
+        return [0.0] * len(documents)
+
+    doc_lengths = [sum(terms.values()) for terms in doc_terms]
+    avg_length = (sum(doc_lengths) / len(doc_lengths)) or 1.0
+    num_docs = len(doc_terms)
+
+    scores = []
+    for terms, length in zip(doc_terms, doc_lengths):
+        score = 0.0
+        for term in query_terms:
+            freq = terms.get(term, 0)
+            if not freq:
+                continue
+            doc_freq = sum(1 for other in doc_terms if term in other)
+            idf = math.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            score += idf * freq * (BM25_K1 + 1) / (
+                freq + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+            )
+        scores.append(score)
+    return scores
+
+
+results_ranked_total = registry.counter(
+    "deep_research_results_ranked_total",
+    "Search results ranked by relevance before summarization.",
+)
+summaries_skipped_total = registry.counter(
+    "deep_research_summaries_skipped_total",
+    "Search results passed through with their snippet by relevance ranking.",
+)
+
+
+def select_for_summarization(
+    query: str,
+    unique_results: Dict[str, dict],
+    top_k: Optional[int] = None,
+    min_relevance: Optional[float] = None,
+) -> Dict[str, dict]:
+    """Keep raw content only on the results worth an LLM summary.
+
+    Results with ``raw_content`` are ranked by BM25 against the query. Those
+    outside the top ``top_k``, or scoring below ``min_relevance`` of the best
+    score, have their ``raw_content`` dropped so they pass through with the
+    Tavily ``content`` snippet. Result order is unchanged.
+
+    Args:
+        query: Search query the results were returned for
+        unique_results: Dictionary of unique search results
+        top_k: Number of results to summarize (defaults to SUMMARY_TOP_K)
+        min_relevance: Minimum score relative to the best result (defaults to SUMMARY_MIN_RELEVANCE)
+
+    Returns:
+        Dictionary of search results, with low-value pages stripped of raw content
+    """
+    top_k = SUMMARY_TOP_K if top_k is None else top_k
+    min_relevance = SUMMARY_MIN_RELEVANCE if min_relevance is None else min_relevance
+
+    candidates = [url for url, result in unique_results.items() if result.get("raw_content")]
+    if not candidates:
+        return unique_results
+
+    scores = bm25_scores(
+        query,
+        [
+            f"{unique_results[url].get('title', '')}\n"
+            f"{unique_results[url]['raw_content'][:RANKING_TEXT_LIMIT]}"
+            for url in candidates
+        ],
+    )
+    best = max(scores)
+    ranked = sorted(zip(candidates, scores), key=lambda item: item[1], reverse=True)
+    keep = {
+        url
+        for url, score in ranked[:top_k]
+        if best <= 0 or score / best >= min_relevance
+    }
+
+    selected = {}
+    for url, result in unique_results.items():
+        if result.get("raw_content") and url not in keep:
+            result = {k: v for k, v in result.items() if k != "raw_content"}
+        selected[url] = result
+
+    results_ranked_total.inc(len(candidates))
+    summaries_skipped_total.inc(len(candidates) - len(keep))
+    return selected
+
+
+# ===== CHUNKING =====
+
+# Separators tried in order, from the coarsest structural boundary to the finest
+CHUNK_SEPARATORS = [
+    r"\n(?=#{1,6} )",  # markdown headings
+    r"\n\s*\n",  # paragraphs
+    r"\n",  # lines
+    r"(?<=[.!?])\s+",  # sentences
+]
+
+
+def split_into_chunks(text: str, chunk_size: int) -> List[str]:
+    """Split text into chunks of at most ``chunk_size`` characters on structural boundaries.
+
+    The text is split on the coarsest boundary available (headings, then
+    paragraphs, lines and sentences) and adjacent pieces are packed greedily
+    into chunks. Pieces still larger than ``chunk_size`` are split on the next
+    finer boundary, and hard-cut only as a last resort.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum chunk length in characters
+
+    Returns:
+        List of chunks in document order
+    """
+    return [chunk for chunk in _split(text, chunk_size, 0) if chunk.strip()]
+
+
+def _split(text: str, chunk_size: int, level: int) -> List[str]:
+    if len(text) <= chunk_size:
+        return [text]
+    if level >= len(CHUNK_SEPARATORS):
+        return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+    pieces = re.split(CHUNK_SEPARATORS[level], text)
+    if len(pieces) == 1:
+        return _split(text, chunk_size, level + 1)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if len(piece) > chunk_size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split(piece, chunk_size, level + 1))
+        elif current and len(current) + len(piece) + 1 > chunk_size:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,294 @@
+"""Fake LLM and Search Backends.
+
+This module provides stand-ins for the OpenAI-compatible chat model and the
+Tavily search API, so the service can be load-tested at high concurrency
+without spending tokens or search credits.
+
+Set ``LLM_BACKEND=fake`` and/or ``SEARCH_BACKEND=fake`` to select them. The
+fake chat model answers structured-output requests and tool-bound calls with
+schema-valid tool calls, and the fake search provider returns synthetic
+results with ``raw_content`` of configurable size. Both sleep for a latency
+drawn from a configurable distribution, so the real orchestration code
+(retries, limiters, caches, fan-out) runs under realistic timing.
+
+Latency specs take the form ``fixed:S``, ``uniform:LOW,HIGH``,
+``normal:MEAN,STDDEV`` or ``lognormal:MEDIAN,SIGMA`` (all in seconds).
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+import uuid
+from functools import lru_cache
+from typing_extensions import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from deep_research.cache import content_hash
+
+# ===== CONFIGURATION =====
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "live").lower()
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "live").lower()
+
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "lognormal:2.0,0.5")
+# Characters of plain-text content and of each generated string field
+FAKE_LLM_RESPONSE_CHARS = int(os.getenv("FAKE_LLM_RESPONSE_CHARS", "4000"))
+FAKE_LLM_FIELD_CHARS = int(os.getenv("FAKE_LLM_FIELD_CHARS", "400"))
+# Parallel tool calls per tool-calling turn, and tool rounds before a final answer
+FAKE_LLM_TOOL_CALLS = int(os.getenv("FAKE_LLM_TOOL_CALLS", "3"))
+FAKE_LLM_TOOL_ROUNDS = int(os.getenv("FAKE_LLM_TOOL_ROUNDS", "2"))
+
+FAKE_SEARCH_LATENCY = os.getenv("FAKE_SEARCH_LATENCY", "lognormal:1.0,0.4")
+FAKE_SEARCH_RAW_CONTENT_CHARS = int(os.getenv("FAKE_SEARCH_RAW_CONTENT_CHARS", "20000"))
+
+
+# ===== LATENCY AND TEXT =====
+
+
+@lru_cache(maxsize=None)
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency spec into a sampler returning seconds.
+
+    Args:
+        spec: Distribution spec, e.g. "lognormal:2.0,0.5" or "fixed:0.1"
+
+    Returns:
+        Function drawing one non-negative latency from a random generator
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(p) for p in params.split(",") if p.strip()]
+    kind = kind.strip().lower()
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: max(0.0, values[0])
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: max(0.0, rng.uniform(values[0], values[1]))
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(max(values[0], 1e-6))
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+_WORDS = (
+    "market revenue growth quarter annual report analysis data policy research "
+    "industry company customers product service platform strategy regional global "
+    "investment capital margin operating forecast demand supply pricing regulation "
+    "technology adoption survey results study evidence trend segment share leading "
+    "increase decrease percent million billion estimate fiscal year outlook risk "
+    "performance efficiency cost network security infrastructure energy health "
+    "the of and to in for with on by from as that this which across between while"
+).split()
+
+_latency_rng = random.Random()
+
+
+def _text(rng: random.Random, chars: int, paragraphs: bool = False) -> str:
+    """Generate pseudo-random prose of about ``chars`` characters."""
+    words: List[str] = []
+    length = 0
+    sentence_length = 0
+    sentences = 0
+    while length < chars:
+        word = rng.choice(_WORDS)
+        if sentence_length == 0:
+            word = word.capitalize()
+        sentence_length += 1
+        if sentence_length >= rng.randint(8, 16):
+            word += "."
+            sentence_length = 0
+            sentences += 1
+            if paragraphs and sentences % 6 == 0:
+                word += "\n\n"
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+# ===== FAKE CHAT MODEL =====
+
+
+def _resolve_ref(schema: dict, definitions: dict) -> dict:
+    ref = schema.get("$ref")
+    if ref:
+        return definitions.get(ref.rsplit("/", 1)[-1], {})
+    return schema
+
+
+def _sample_value(schema: dict, definitions: dict, rng: random.Random, field_chars: int) -> Any:
+    """Generate a value that validates against a JSON schema."""
+    schema = _resolve_ref(schema, definitions)
+    if "default" in schema:
+        return schema["default"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return _sample_value(options[0], definitions, rng, field_chars)
+
+    kind = schema.get("type", "string")
+    if kind == "object":
+        return _sample_object(schema, definitions, rng, field_chars)
+    if kind == "array":
+        return [
+            _sample_value(schema.get("items", {}), definitions, rng, field_chars)
+            for _ in range(max(schema.get("minItems", 0), 2))
+        ]
+    if kind == "integer":
+        return rng.randint(schema.get("minimum", 1), schema.get("maximum", 5))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0), schema.get("maximum", 1)), 3)
+    if kind == "boolean":
+        return True
+    return _text(rng, field_chars)
+
+
+def _sample_object(schema: dict, definitions: dict, rng: random.Random, field_chars: int) -> dict:
+    return {
+        name: _sample_value(prop, definitions, rng, field_chars)
+        for name, prop in schema.get("properties", {}).items()
+    }
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that fabricates schema-valid responses after a simulated delay.
+
+    With tools bound and a forced ``tool_choice`` (structured output), it
+    returns one call of the first tool. Otherwise it calls the first bound
+    tool ``tool_calls`` times in parallel for the first ``tool_rounds``
+    tool-calling turns of a conversation, then answers in plain text.
+    """
+
+    latency: str = FAKE_LLM_LATENCY
+    response_chars: int = FAKE_LLM_RESPONSE_CHARS
+    field_chars: int = FAKE_LLM_FIELD_CHARS
+    tool_calls: int = FAKE_LLM_TOOL_CALLS
+    tool_rounds: int = FAKE_LLM_TOOL_ROUNDS
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def bind_tools(self, tools, *, tool_choice: Optional[str] = None, **kwargs):
+        """Bind tools in OpenAI format so the fake model can answer with tool calls."""
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tools: Optional[List[dict]], tool_choice) -> AIMessage:
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = random.Random(content_hash(prompt))
+        calls: List[dict] = []
+
+        if tools:
+            tool_rounds_done = sum(
+                1 for message in messages if getattr(message, "tool_calls", None)
+            )
+            if tool_choice:
+                count = 1
+            elif tool_rounds_done < self.tool_rounds:
+                count = self.tool_calls
+            else:
+                count = 0
+            function = tools[0]["function"]
+            parameters = function.get("parameters", {})
+            definitions = parameters.get("$defs", {})
+            for _ in range(count):
+                calls.append(
+                    {
+                        "name": function["name"],
+                        "args": _sample_object(parameters, definitions, rng, self.field_chars),
+                        "id": f"call_{uuid.uuid4().hex[:24]}",
+                        "type": "tool_call",
+                    }
+                )
+
+        content = "" if calls else _text(rng, self.response_chars)
+        output_chars = len(content) + sum(len(str(call["args"])) for call in calls)
+        input_tokens = len(prompt) // 4 + 1
+        output_tokens = output_chars // 4 + 1
+        return AIMessage(
+            content=content,
+            tool_calls=calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(parse_latency(self.latency)(_latency_rng))
+        message = self._respond(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(parse_latency(self.latency)(_latency_rng))
+        message = self._respond(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+# ===== FAKE SEARCH =====
+
+
+def _fake_results(query: str, max_results: int, include_raw_content: bool) -> dict:
+    results = []
+    for i in range(max_results):
+        url_id = content_hash(query, str(i))[:12]
+        rng = random.Random(url_id)
+        results.append(
+            {
+                "url": f"https://example.com/{url_id}",
+                "title": _text(rng, 60).rstrip("."),
+                "content": _text(rng, 300),
+                "score": round(1.0 - i * 0.1, 2),
+                "raw_content": (
+                    _text(rng, FAKE_SEARCH_RAW_CONTENT_CHARS, paragraphs=True)
+                    if include_raw_content
+                    else None
+                ),
+            }
+        )
+    return {"query": query, "results": results}
+
+
+class FakeTavilyClient:
+    """Synchronous Tavily stand-in returning synthetic results."""
+
+    def __init__(self, latency: str = FAKE_SEARCH_LATENCY):
+        """Create a fake search client with the given latency distribution."""
+        self._sample_latency = parse_latency(latency)
+
+    def search(self, query: str, max_results: int = 5, include_raw_content: bool = False, **kwargs) -> Dict:
+        """Return deterministic synthetic results for ``query`` after a simulated delay."""
+        started = time.monotonic()
+        time.sleep(self._sample_latency(_latency_rng))
+        response = _fake_results(query, max_results, include_raw_content)
+        response["response_time"] = round(time.monotonic() - started, 3)
+        return response
+
+
+class AsyncFakeTavilyClient(FakeTavilyClient):
+    """Async Tavily stand-in returning synthetic results."""
+
+    async def search(self, query: str, max_results: int = 5, include_raw_content: bool = False, **kwargs) -> Dict:
+        """Async variant of ``search``; the simulated delay does not block the event loop."""
+        started = time.monotonic()
+        await asyncio.sleep(self._sample_latency(_latency_rng))
+        response = _fake_results(query, max_results, include_raw_content)
+        response["response_time"] = round(time.monotonic() - started, 3)
+        return response
+
+
+def fake_pdf_text(pdf_url: str, pages: int = 3) -> str:
+    """Return synthetic extracted PDF text in ``fetch_pdf_content``'s format."""
+    rng = random.Random(content_hash(pdf_url))
+    return "\n".join(
+        f"--- Page {i + 1} ---\n{_text(rng, 2000)}\n" for i in range(pages)
+    )
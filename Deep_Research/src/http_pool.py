@@ -0,0 +1,117 @@
+"""Shared HTTP Connection Pools.
+
+This module provides the process-wide keep-alive HTTP clients shared by every
+chat-model client, so LLM calls reuse open connections instead of paying for
+client setup and TLS handshakes on each hop.
+
+HTTP/2 is used when the optional ``h2`` package is installed.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing_extensions import Optional
+
+import httpx
+
+# ===== CONFIGURATION =====
+
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "600"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() in ("1", "true", "yes")
+
+
+def http2_available() -> bool:
+    """Return whether HTTP/2 is requested and the ``h2`` package is installed."""
+    if not LLM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_limits() -> httpx.Limits:
+    """Return the connection pool limits shared by all LLM clients."""
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+# ===== TRANSPORTS =====
+
+
+class LoopLocalAsyncTransport(httpx.AsyncBaseTransport):
+    """Async transport that keeps one connection pool per event loop.
+
+    Async connections cannot be shared across event loops, but synchronous
+    entry points run coroutines on short-lived loops. Delegating to a
+    per-loop pool lets a single ``httpx.AsyncClient`` be shared by every
+    model client regardless of which loop calls it.
+    """
+
+    def __init__(self):
+        """Create a transport with no per-loop pools yet."""
+        self._transports = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _current(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(
+                    limits=get_limits(), http2=http2_available()
+                )
+                self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the running loop's connection pool."""
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the running loop's connection pool."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.pop(loop, None)
+        if transport is not None:
+            await transport.aclose()
+
+
+# ===== SHARED CLIENTS =====
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_clients_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Lazy-load the process-wide synchronous keep-alive client."""
+    global _http_client
+    with _clients_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                limits=get_limits(),
+                http2=http2_available(),
+                timeout=LLM_HTTP_TIMEOUT,
+            )
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Lazy-load the process-wide asynchronous keep-alive client."""
+    global _async_http_client
+    with _clients_lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(
+                transport=LoopLocalAsyncTransport(),
+                timeout=LLM_HTTP_TIMEOUT,
+            )
+    return _async_http_client
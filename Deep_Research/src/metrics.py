@@ -0,0 +1,263 @@
+"""Service Metrics.
+
+This module keeps in-process counters, gauges and histograms and renders them
+in the Prometheus text exposition format for the ``/metrics`` endpoint.
+
+Instruments are updated on the request path with a single locked dict update,
+so recording is cheap. Values that already live elsewhere (job tables, queue
+depths, cache and limiter stats) are not mirrored; they are read by collector
+functions only when the endpoint is scraped.
+"""
+
+import bisect
+import math
+import threading
+from typing_extensions import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from fast cache hits to multi-minute jobs
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+JOB_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+# A collected sample: (metric name, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+# ===== EXPOSITION FORMAT =====
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _header(name: str, kind: str, documentation: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+# ===== INSTRUMENTS =====
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add ``amount`` to the series with these labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        """Render the metric in the text exposition format."""
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = _header(self.name, self.kind, self.documentation)
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Subtract ``amount`` from the series with these labels."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the series with these labels to ``value``."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """Create a histogram over ``buckets`` (upper bounds; +Inf is implicit)."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one value in the series with these labels."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, with a final +Inf slot
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> List[str]:
+        """Render cumulative buckets, sum and count in the text exposition format."""
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._values.items())
+        lines = _header(self.name, self.kind, self.documentation)
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+# ===== REGISTRY =====
+
+
+class MetricsRegistry:
+    """Holds instruments and scrape-time collectors and renders them together.
+
+    A collector returns ``{metric name: (type, help, [(name, labels, value)])}``
+    and is called once per scrape; a collector that fails is skipped.
+    """
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Dict[str, tuple]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def _add(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Dict[str, tuple]]) -> None:
+        """Add a collector called on every scrape."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every instrument and collector in the text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, (kind, documentation, samples) in families.items():
+                lines.extend(_header(name, kind, documentation))
+                for sample_name, labels, value in samples:
+                    lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served by the /metrics endpoint
+registry = MetricsRegistry()
+
+llm_request_seconds = registry.histogram(
+    "deep_research_llm_request_duration_seconds",
+    "Logical LLM call latency including retries, by call site and outcome.",
+    ("site", "status"),
+)
+llm_errors_total = registry.counter(
+    "deep_research_llm_errors_total",
+    "LLM calls that failed after retries, by call site and error type.",
+    ("site", "error"),
+)
+search_request_seconds = registry.histogram(
+    "deep_research_search_request_duration_seconds",
+    "Search backend request latency, by call site and outcome.",
+    ("site", "status"),
+)
+search_errors_total = registry.counter(
+    "deep_research_search_errors_total",
+    "Failed search backend requests, by call site and error type.",
+    ("site", "error"),
+)
+researchers_in_flight = registry.gauge(
+    "deep_research_researchers_in_flight",
+    "Researcher subgraphs currently running.",
+)
+
+
+def observe_request(
+    histogram: Histogram,
+    errors: Counter,
+    site: str,
+    duration: float,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Record one backend request's latency and, if it failed, its error type."""
+    if error is None:
+        histogram.observe(duration, site=site, status="ok")
+        return
+    histogram.observe(duration, site=site, status="error")
+    errors.inc(site=site, error=type(error).__name__)
@@ -22,18 +22,25 @@ from langchain_core.messages import (
     ToolMessage,
     filter_messages,
 )
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
 from deep_research.prompts import (
     lead_researcher_with_multiple_steps_diffusion_double_check_prompt,
 )
+from deep_research.metrics import researchers_in_flight
 from deep_research.research_agent import researcher_agent
 from deep_research.state_multi_agent_supervisor import (
     SupervisorState,
     ConductResearch,
     ResearchComplete,
 )
+from deep_research.url_registry import (
+    current_researcher,
+    current_url_registry,
+    job_url_registry,
+)
 from deep_research.utils import get_today_str, think_tool, refine_draft_report
 
 
@@ -128,18 +135,9 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
     messages = [SystemMessage(content=system_message)] + filtered_history
 
     supervisor_model_with_tools = get_supervisor_model_with_tools()
-    
-    # Retry loop for supervisor model invocation to handle transient gateway errors
-    response = None
-    for attempt in range(1, 4):
-        try:
-            response = await supervisor_model_with_tools.ainvoke(messages)
-            break
-        except Exception as e:
-            print(f"Supervisor model invocation attempt {attempt} failed: {e}")
-            if attempt == 3:
-                raise e
-            await asyncio.sleep(2)
+
+    # Transient gateway errors are retried by the model's retry policy
+    response = await supervisor_model_with_tools.ainvoke(messages)
 
     # We append the new assistant response (with tool_calls) to the existing history;
     # supervisor_tools() will actually execute those tool calls.
@@ -157,6 +155,7 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
 
 async def supervisor_tools(
     state: SupervisorState,
+    config: RunnableConfig,
 ) -> Command[Literal["__end__"]]:
     """Execute supervisor decisions (tool calls) and end the subgraph.
 
@@ -220,26 +219,36 @@ async def supervisor_tools(
 
         # 2) ConductResearch (async, parallel)
         if conduct_research_calls:
-            async def run_researcher_with_retry(tc_args: dict, max_retries: int = 3) -> dict:
-                for attempt in range(1, max_retries + 1):
-                    try:
-                        res = await researcher_agent.ainvoke(
-                            {
-                                "researcher_messages": [
-                                    HumanMessage(content=tc_args["research_topic"])
-                                ],
-                                "research_topic": tc_args["research_topic"],
-                            }
-                        )
-                        return res
-                    except Exception as e:
-                        print(f"Researcher attempt {attempt} for topic '{tc_args['research_topic']}' failed: {e}")
-                        if attempt == max_retries:
-                            raise e
-                        await asyncio.sleep(3)
+            # Share one URL registry across every researcher of this job, in
+            # every round, so overlapping sources are summarized and reported once
+            url_registry = job_url_registry(
+                config.get("configurable", {}).get("thread_id")
+            )
+            current_url_registry.set(url_registry)
+
+            async def run_researcher(tc_args: dict, researcher_label: str) -> dict:
+                # Each gathered coroutine runs in its own task context
+                current_researcher.set(researcher_label)
+                researchers_in_flight.inc()
+                # Model calls inside the researcher already retry transient errors;
+                # a researcher that still fails reports an error instead of re-running
+                try:
+                    return await researcher_agent.ainvoke(
+                        {
+                            "researcher_messages": [
+                                HumanMessage(content=tc_args["research_topic"])
+                            ],
+                            "research_topic": tc_args["research_topic"],
+                        }
+                    )
+                except Exception as e:
+                    print(f"Researcher for topic '{tc_args['research_topic']}' failed: {e}")
+                    return {}
+                finally:
+                    researchers_in_flight.dec()
 
             coros = [
-                run_researcher_with_retry(tc["args"])
+                run_researcher(tc["args"], url_registry.next_researcher_label())
                 for tc in conduct_research_calls
             ]
             results = await asyncio.gather(*coros)
@@ -257,12 +266,12 @@ async def supervisor_tools(
                 )
                 all_raw_notes.append("\n".join(res.get("raw_notes", [])))
 
-        # 3) refine_draft_report (sync)
+        # 3) refine_draft_report (async)
         if refine_report_calls:
             notes = get_notes_from_tool_calls(supervisor_messages) + all_raw_notes
             findings = "\n".join(notes)
 
-            draft_report = refine_draft_report.invoke(
+            draft_report = await refine_draft_report.ainvoke(
                 {
                     "research_brief": research_brief,
                     "findings": findings,
@@ -209,6 +209,37 @@ Remember, your goal is to create a summary that can be easily understood and uti
 Today's date is {date}.
 """
 
+reduce_webpage_summaries_prompt = """You are tasked with merging partial summaries of one long webpage into a single summary. The webpage was too long to summarize in one pass, so it was split into consecutive sections and each section was summarized separately. This summary will be used by a downstream research agent, so it's crucial to maintain the key details without losing essential information.
+
+Here are the section summaries, in page order:
+
+<section_summaries>
+{section_summaries}
+</section_summaries>
+
+Please follow these guidelines to create the merged summary:
+
+1. Identify and preserve the main topic or purpose of the webpage as a whole.
+2. Combine overlapping points from different sections instead of repeating them.
+3. Retain every key fact, statistic and data point from the sections, keeping the chronological order of events where relevant.
+4. **Strict Verbatim Accuracy & Zero Hallucination**:
+   - Do NOT invent, assume, or modify any numbers, percentages, dates, or financial figures.
+   - Every metric or number must be copied verbatim from the section summaries, together with its exact fiscal year or period.
+   - Do not perform calculations or aggregate figures across sections.
+5. Choose the most important quotes from the sections' key excerpts, up to a maximum of 5.
+
+Present your summary in the following format:
+
+```
+{{
+   "summary": "Your merged summary here, structured with appropriate paragraphs or bullet points as needed",
+   "key_excerpts": "First important quote or excerpt, Second important quote or excerpt, ...up to a maximum of 5"
+}}
+```
+
+Today's date is {date}.
+"""
+
 lead_researcher_with_multiple_steps_diffusion_double_check_prompt = """You are a research supervisor. You operate in a SINGLE-TURN orchestration phase. You will not get another turn to call tools, so you MUST perform all your actions in parallel in your current response.
 
 Specifically:
@@ -352,6 +383,36 @@ CRITICAL REQUIREMENTS:
 
 The cleaned findings will be used for final report generation, so comprehensiveness is critical."""
 
+fold_research_findings_prompt = """You are a research assistant keeping a running record of findings while a researcher works on the following topic. For context, today's date is {date}.
+
+RESEARCH TOPIC: {research_topic}
+
+Below are the findings recorded so far, followed by the results of the researcher's latest tool calls. Merge the new results into the findings and return the complete updated findings.
+
+<findings_so_far>
+{findings}
+</findings_so_far>
+
+<new_tool_results>
+{new_results}
+</new_tool_results>
+
+<Guidelines>
+1. Keep everything already in the findings; only add to, merge with or deduplicate against it.
+2. Add every fact, statistic, name and quote from the new results that is relevant to the research topic, preserved verbatim.
+3. Keep the source title and URL next to each statement it supports, and keep a running list of the search queries made.
+4. If several sources state the same thing, record it once and cite all of them.
+5. **Strict Verbatim Accuracy & Zero Hallucination**:
+   - Never invent, modify or extrapolate numbers, percentages, financial metrics or dates.
+   - Keep every number coupled to its exact date or fiscal year, and do not perform calculations.
+</Guidelines>
+
+Return only the updated findings, organized as:
+**Queries Made**
+**Findings**
+**Sources** (title and URL of every source found so far)
+"""
+
 final_report_generation_with_helpfulness_insightfulness_hit_citation_prompt = """Based on all the research conducted and draft report, create a comprehensive, well-structured answer to the overall research brief:
 <Research Brief>
 {research_brief}
@@ -4,23 +4,39 @@ This module implements a research agent that can perform iterative web searches
 and synthesis to answer complex research questions.
 """
 
+import asyncio
+import json
+import os
 import time
-from typing_extensions import Literal
+import uuid
+from collections import OrderedDict
+
+from typing_extensions import List, Literal, Optional, Sequence
 
 from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
     SystemMessage,
     HumanMessage,
     ToolMessage,
     filter_messages,
 )
 
+from deep_research.compaction import compact_history
 from deep_research.state_research import ResearcherState, ResearcherOutputState
-from deep_research.utils import tavily_search, get_today_str, think_tool, fetch_pdf_content
+from deep_research.utils import (
+    estimate_tokens,
+    fetch_pdf_content,
+    get_today_str,
+    tavily_search,
+    think_tool,
+)
 from deep_research.prompts import (
     research_agent_prompt,
     compress_research_system_prompt,
     compress_research_human_message,
+    fold_research_findings_prompt,
 )
 
 # ===== CONFIGURATION =====
@@ -29,6 +45,21 @@ from deep_research.prompts import (
 tools = [tavily_search, think_tool, fetch_pdf_content]
 tools_by_name = {tool.name: tool for tool in tools}
 
+# Tool calls from one model turn run concurrently, at most this many per researcher
+RESEARCHER_TOOL_CONCURRENCY = int(os.getenv("RESEARCHER_TOOL_CONCURRENCY", "4"))
+
+# Per-researcher budgets; once one is spent the researcher compresses what it has.
+# 0 disables the corresponding budget.
+RESEARCHER_MAX_TOOL_ROUNDS = int(os.getenv("RESEARCHER_MAX_TOOL_ROUNDS", "12"))
+RESEARCHER_MAX_PROMPT_TOKENS = int(os.getenv("RESEARCHER_MAX_PROMPT_TOKENS", "500000"))
+RESEARCHER_DEADLINE = float(os.getenv("RESEARCHER_DEADLINE", "600"))
+
+# Fold each tool round into a running digest in the background while the
+# researcher keeps working, so the final compression only polishes the digest
+INCREMENTAL_COMPRESSION = os.getenv("INCREMENTAL_COMPRESSION", "false").lower() in ("1", "true", "yes")
+# Running digests kept for researchers that have not reached compress_research
+MAX_RUNNING_DIGESTS = 1024
+
 
 def get_model_with_tools():
     """Lazy-load main research model and bind tools AFTER env is loaded."""
@@ -48,7 +79,7 @@ def get_compress_model():
 # ===== AGENT NODES =====
 
 
-def llm_call(state: ResearcherState):
+async def llm_call(state: ResearcherState):
     """Analyze current state and decide on next actions.
 
     The model analyzes the current conversation state and decides whether to:
@@ -58,64 +89,200 @@ def llm_call(state: ResearcherState):
     Returns updated state with the model's response.
     """
     model_with_tools = get_model_with_tools()
+    started_at = state.get("started_at") or time.time()
+    # Old tool outputs are digested in the prompt only; state keeps them in full
+    messages = [SystemMessage(content=research_agent_prompt)] + compact_history(
+        state["researcher_messages"]
+    )
 
-    # Retry loop to handle transient nextgen/ICA gateway errors
-    response = None
-    for attempt in range(1, 4):
-        try:
-            response = model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt)]
-                + state["researcher_messages"]
-            )
-            break
-        except Exception as e:
-            print(f"Researcher LLM invocation attempt {attempt} failed: {e}")
-            if attempt == 3:
-                raise e
-            time.sleep(2)
+    # Transient nextgen/ICA gateway errors are retried by the model's retry policy
+    response = await model_with_tools.ainvoke(messages)
+
+    usage = getattr(response, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens") or estimate_tokens(messages)
 
     return {
-        "researcher_messages": [response]
+        "researcher_messages": [response],
+        "prompt_tokens": state.get("prompt_tokens", 0) + prompt_tokens,
+        "started_at": started_at,
     }
 
 
-def tool_node(state: ResearcherState):
+async def tool_node(state: ResearcherState):
     """Execute all tool calls from the previous LLM response.
 
-    Executes all tool calls from the previous LLM responses.
-    Returns updated state with tool execution results.
+    Executes all tool calls from the previous LLM responses concurrently,
+    up to RESEARCHER_TOOL_CONCURRENCY at a time. A tool that fails yields an
+    error ToolMessage so the rest of the batch still completes.
+    Returns updated state with tool execution results in tool-call order.
     """
     tool_calls = state["researcher_messages"][-1].tool_calls
+    semaphore = asyncio.Semaphore(RESEARCHER_TOOL_CONCURRENCY)
 
-    # Execute all tool calls
-    observations = []
-    for tool_call in tool_calls:
-        tool = tools_by_name[tool_call["name"]]
-        observations.append(tool.invoke(tool_call["args"]))
-
-    # Create tool message outputs
-    tool_outputs = [
-        ToolMessage(
+    async def run_tool_call(tool_call: dict) -> ToolMessage:
+        tool = tools_by_name.get(tool_call["name"])
+        try:
+            if tool is None:
+                raise ValueError(f"Unknown tool: {tool_call['name']}")
+            async with semaphore:
+                observation = await tool.ainvoke(tool_call["args"])
+        except Exception as e:
+            print(f"Tool {tool_call['name']} failed: {e}")
+            return ToolMessage(
+                content=f"Error running {tool_call['name']}: {e}",
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+        return ToolMessage(
             content=observation, name=tool_call["name"], tool_call_id=tool_call["id"]
         )
-        for observation, tool_call in zip(observations, tool_calls)
-    ]
 
-    return {"researcher_messages": tool_outputs}
+    # Execute all tool calls; gather keeps the tool-call order
+    tool_outputs = await asyncio.gather(
+        *(run_tool_call(tool_call) for tool_call in tool_calls)
+    )
+
+    update = {
+        "researcher_messages": list(tool_outputs),
+        "tool_call_iterations": state.get("tool_call_iterations", 0) + 1,
+    }
+    if INCREMENTAL_COMPRESSION:
+        digest_key = state.get("digest_key") or uuid.uuid4().hex
+        results = _format_tool_results(tool_calls, tool_outputs)
+        if results:
+            get_running_digest(digest_key, state.get("research_topic", "")).add(results)
+        update["digest_key"] = digest_key
+    return update
+
+
+# ===== INCREMENTAL COMPRESSION =====
+
+
+def _format_tool_results(tool_calls: List[dict], tool_outputs: Sequence[ToolMessage]) -> str:
+    """Format one round's tool outputs with the calls that produced them."""
+    results = []
+    for tool_call, message in zip(tool_calls, tool_outputs):
+        # Reflections are internal reasoning, not findings
+        if message.name == "think_tool":
+            continue
+        results.append(
+            f"--- {message.name} {json.dumps(tool_call.get('args', {}))} ---\n{message.content}"
+        )
+    return "\n\n".join(results)
+
+
+class RunningDigest:
+    """Findings of one researcher, folded in by background tasks as they arrive.
 
+    Each ``add`` schedules a fold that runs after the previous one, so merges
+    never overlap and never hold up the researcher's graph steps. Results
+    whose fold fails stay pending and are folded with the next batch.
+    """
+
+    def __init__(self, research_topic: str):
+        """Start an empty digest for a researcher working on ``research_topic``."""
+        self.research_topic = research_topic
+        self.digest = ""
+        self.pending: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, results: str) -> None:
+        """Queue one round of tool results and fold them in the background."""
+        self.pending.append(results)
+        self._task = asyncio.create_task(self._fold_after(self._task))
+
+    async def _fold_after(self, previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        await self._fold()
+
+    async def _fold(self) -> None:
+        if not self.pending:
+            return
+        batch = list(self.pending)
+        prompt = fold_research_findings_prompt.format(
+            date=get_today_str(),
+            research_topic=self.research_topic,
+            findings=self.digest or "(none yet)",
+            new_results="\n\n".join(batch),
+        )
+        try:
+            # Named call site for traces and metrics; cached only if listed in LLM_CACHE_SITES
+            response = await get_compress_model().with_cache("fold").ainvoke(
+                [HumanMessage(content=prompt)]
+            )
+        except Exception as e:
+            print(f"Folding research findings failed: {e}")
+            return
+        self.digest = str(response.content)
+        del self.pending[: len(batch)]
 
-def compress_research(state: ResearcherState) -> dict:
+    async def finish(self) -> Optional[str]:
+        """Wait for background folds, fold what is left and return the digest.
+
+        Returns:
+            The complete digest, or None if some results could not be folded
+        """
+        if self._task is not None:
+            await asyncio.wait([self._task])
+        await self._fold()
+        if self.pending or not self.digest:
+            return None
+        return self.digest
+
+
+# digest_key (kept in researcher state) -> that researcher's running digest
+_running_digests: "OrderedDict[str, RunningDigest]" = OrderedDict()
+
+
+def get_running_digest(digest_key: str, research_topic: str) -> RunningDigest:
+    """Return the running digest for ``digest_key``, creating it on first use."""
+    running = _running_digests.get(digest_key)
+    if running is None:
+        running = _running_digests[digest_key] = RunningDigest(research_topic)
+        # Researchers that fail before compress_research never collect theirs
+        while len(_running_digests) > MAX_RUNNING_DIGESTS:
+            _running_digests.popitem(last=False)
+    return running
+
+
+async def compress_research(state: ResearcherState) -> dict:
     """Compress research findings into a concise summary.
 
     Takes all the research messages and tool outputs and creates
     a compressed summary suitable for the supervisor's decision-making.
+    With incremental compression, it waits for the background folds and
+    polishes the running digest (plus the researcher's final answer)
+    instead of the full history.
     """
     compress_model = get_compress_model()
 
     system_message = compress_research_system_prompt.format(date=get_today_str())
+    researcher_messages: List[BaseMessage] = list(state.get("researcher_messages", []))
+    # A researcher stopped by its budget may end on tool calls that never ran;
+    # the chat API rejects tool calls without results, so keep only the text
+    if researcher_messages and getattr(researcher_messages[-1], "tool_calls", None):
+        last_message = researcher_messages.pop()
+        if last_message.content:
+            researcher_messages.append(AIMessage(content=last_message.content))
+
+    running = _running_digests.pop(state.get("digest_key") or "", None)
+    digest = await running.finish() if running is not None else None
+    # Without a complete digest, compress the full history instead
+    if digest is not None:
+        final_answer = [
+            message
+            for message in researcher_messages[-1:]
+            if isinstance(message, AIMessage) and message.content
+        ]
+        researcher_messages = [
+            HumanMessage(content=f"Research findings recorded so far:\n\n{digest}")
+        ] + final_answer
+
     messages = (
         [SystemMessage(content=system_message)]
-        + state.get("researcher_messages", [])
+        + researcher_messages
         + [
             HumanMessage(
                 content=compress_research_human_message.format(
@@ -124,18 +291,8 @@ def compress_research(state: ResearcherState) -> dict:
             )
         ]
     )
-    
-    # Retry loop to handle transient nextgen/ICA gateway errors
-    response = None
-    for attempt in range(1, 4):
-        try:
-            response = compress_model.invoke(messages)
-            break
-        except Exception as e:
-            print(f"Compression model invocation attempt {attempt} failed: {e}")
-            if attempt == 3:
-                raise e
-            time.sleep(2)
+
+    response = await compress_model.ainvoke(messages)
 
     # Extract raw notes from tool and AI messages
     raw_notes = [
@@ -154,13 +311,26 @@ def compress_research(state: ResearcherState) -> dict:
 # ===== ROUTING LOGIC =====
 
 
+def exhausted_budget(state: ResearcherState) -> Optional[str]:
+    """Return the name of the first researcher budget that has run out, if any."""
+    if RESEARCHER_MAX_TOOL_ROUNDS and state.get("tool_call_iterations", 0) >= RESEARCHER_MAX_TOOL_ROUNDS:
+        return "tool rounds"
+    if RESEARCHER_MAX_PROMPT_TOKENS and state.get("prompt_tokens", 0) >= RESEARCHER_MAX_PROMPT_TOKENS:
+        return "prompt tokens"
+    started_at = state.get("started_at")
+    if RESEARCHER_DEADLINE and started_at and time.time() - started_at >= RESEARCHER_DEADLINE:
+        return "deadline"
+    return None
+
+
 def should_continue(
     state: ResearcherState,
 ) -> Literal["tool_node", "compress_research"]:
     """Determine whether to continue research or provide final answer.
 
     Determines whether the agent should continue the research loop or provide
-    a final answer based on whether the LLM made tool calls.
+    a final answer based on whether the LLM made tool calls and whether the
+    researcher still has budget left.
 
     Returns:
         "tool_node": Continue to tool execution
@@ -171,11 +341,30 @@ def should_continue(
 
     # If the LLM makes a tool call, continue to tool execution
     if last_message.tool_calls:
-        return "tool_node"
+        budget = exhausted_budget(state)
+        if budget is None:
+            return "tool_node"
+        print(f"Researcher {budget} budget exhausted, compressing research so far")
     # Otherwise, we have a final answer
     return "compress_research"
 
 
+def after_tools(
+    state: ResearcherState,
+) -> Literal["llm_call", "compress_research"]:
+    """Loop back to the model unless a budget ran out during the tool round.
+
+    Returns:
+        "llm_call": Continue the research loop
+        "compress_research": Stop and compress research
+    """
+    budget = exhausted_budget(state)
+    if budget is None:
+        return "llm_call"
+    print(f"Researcher {budget} budget exhausted, compressing research so far")
+    return "compress_research"
+
+
 # ===== GRAPH CONSTRUCTION =====
 
 # Build the agent workflow
@@ -196,8 +385,15 @@ agent_builder.add_conditional_edges(
         "compress_research": "compress_research",  # Provide final answer
     },
 )
-agent_builder.add_edge("tool_node", "llm_call")  # Loop back for more research
+agent_builder.add_conditional_edges(
+    "tool_node",
+    after_tools,
+    {
+        "llm_call": "llm_call",  # Loop back for more research
+        "compress_research": "compress_research",  # Budget spent
+    },
+)
 agent_builder.add_edge("compress_research", END)
 
 # Compile the agent
-researcher_agent = agent_builder.compile()
+researcher_agent = agent_builder.compile(name="researcher")
@@ -58,21 +58,11 @@ async def final_report_generation(state: AgentState):
     )
 
     writer_model = get_writer_model()
-    
-    # Retry loop for final report generation to handle transient gateway errors
-    final_report = None
-    for attempt in range(1, 4):
-        try:
-            final_report = await writer_model.ainvoke(
-                [HumanMessage(content=final_report_prompt)]
-            )
-            break
-        except Exception as e:
-            print(f"Final report generation attempt {attempt} failed: {e}")
-            if attempt == 3:
-                raise e
-            import asyncio
-            await asyncio.sleep(2)
+
+    # Transient gateway errors are retried by the model's retry policy
+    final_report = await writer_model.ainvoke(
+        [HumanMessage(content=final_report_prompt)]
+    )
 
     # Verification and correction pass
     verification_prompt = report_verification_prompt.format(
@@ -81,20 +71,13 @@ async def final_report_generation(state: AgentState):
     )
     
     corrected_report = final_report.content
-    for attempt in range(1, 4):
-        try:
-            corrected_msg = await writer_model.ainvoke(
-                [HumanMessage(content=verification_prompt)]
-            )
-            corrected_report = corrected_msg.content
-            break
-        except Exception as e:
-            print(f"Report verification attempt {attempt} failed: {e}")
-            if attempt == 3:
-                print("Failed report verification after 3 attempts, falling back to original final report.")
-            else:
-                import asyncio
-                await asyncio.sleep(2)
+    try:
+        corrected_msg = await writer_model.with_cache("verification").ainvoke(
+            [HumanMessage(content=verification_prompt)]
+        )
+        corrected_report = corrected_msg.content
+    except Exception as e:
+        print(f"Report verification failed ({e}), falling back to original final report.")
 
     return {
         "final_report": corrected_report,
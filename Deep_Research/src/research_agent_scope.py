@@ -104,7 +104,9 @@ def write_research_brief(state: AgentState) -> Command[Literal["write_draft_repo
     and contains all necessary details for effective research.
     """
     # Set up structured output model
-    structured_output_model = get_model().with_structured_output(ResearchQuestion)
+    structured_output_model = (
+        get_model().with_structured_output(ResearchQuestion).with_cache("research_brief")
+    )
 
     # Generate research brief from conversation history
     response = structured_output_model.invoke(
@@ -131,7 +133,9 @@ def write_draft_report(state: AgentState) -> Command[Literal["__end__"]]:
     Synthesizes all research findings into a comprehensive final report
     """
     # Set up structured output model
-    structured_output_model = get_creative_model().with_structured_output(DraftReport)
+    structured_output_model = (
+        get_creative_model().with_structured_output(DraftReport).with_cache("draft_report")
+    )
     research_brief = state.get("research_brief", "")
     draft_report_prompt = draft_report_generation_prompt.format(
         research_brief=research_brief, date=get_today_str()
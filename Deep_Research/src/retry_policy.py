@@ -0,0 +1,287 @@
+"""Retry Policy for LLM Calls.
+
+This module provides the single retry policy applied to every chat-model call:
+errors are classified into rate limit, server error, timeout, connection and
+non-retryable classes, retries use exponential backoff with full jitter and
+honour ``Retry-After`` headers, and each call is bounded by an overall deadline.
+"""
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing_extensions import Any, Awaitable, Callable, Dict, Optional
+
+# ===== CONFIGURATION =====
+
+LLM_RETRY_MAX_ATTEMPTS = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "4"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
+# Overall budget for one call including all attempts and backoff, in seconds
+LLM_RETRY_DEADLINE = float(os.getenv("LLM_RETRY_DEADLINE", "300"))
+
+
+# ===== ERROR CLASSIFICATION =====
+
+
+class ErrorClass(str, Enum):
+    """Category of a failed call, deciding whether and how it is retried."""
+
+    RATE_LIMIT = "rate_limit"
+    SERVER_ERROR = "server_error"
+    TIMEOUT = "timeout"
+    CONNECTION = "connection"
+    NON_RETRYABLE = "non_retryable"
+
+
+RETRYABLE_CLASSES = {
+    ErrorClass.RATE_LIMIT,
+    ErrorClass.SERVER_ERROR,
+    ErrorClass.TIMEOUT,
+    ErrorClass.CONNECTION,
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call's overall retry deadline runs out."""
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(error: BaseException) -> ErrorClass:
+    """Classify an exception raised by a model call.
+
+    Uses the OpenAI/httpx exception types and HTTP status codes when
+    available, and only falls back to the message text for wrapped errors
+    that carry neither.
+
+    Args:
+        error: Exception raised by the model call
+
+    Returns:
+        The error's retry class
+    """
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) and not isinstance(
+        error, DeadlineExceeded
+    ):
+        return ErrorClass.TIMEOUT
+
+    try:
+        import openai
+
+        if isinstance(error, openai.APITimeoutError):
+            return ErrorClass.TIMEOUT
+        if isinstance(error, openai.APIConnectionError):
+            return ErrorClass.CONNECTION
+    except ImportError:
+        pass
+
+    try:
+        import httpx
+
+        if isinstance(error, httpx.TimeoutException):
+            return ErrorClass.TIMEOUT
+        if isinstance(error, httpx.TransportError):
+            return ErrorClass.CONNECTION
+    except ImportError:
+        pass
+
+    message = str(error)
+    status = _status_code(error)
+    if status is None:
+        # Wrapped errors: look for an explicit HTTP status in the message
+        match = re.search(r"\b(?:status(?:[ _]code)?|error code|http)[:= ]*(\d{3})\b", message, re.IGNORECASE)
+        if match:
+            status = int(match.group(1))
+
+    if status is not None:
+        if status == 429:
+            return ErrorClass.RATE_LIMIT
+        if status == 408:
+            return ErrorClass.TIMEOUT
+        if status >= 500:
+            return ErrorClass.SERVER_ERROR
+        # The ICA gateway intermittently reports deployed models as missing
+        if status == 404 and "model not found" in message.lower():
+            return ErrorClass.SERVER_ERROR
+        return ErrorClass.NON_RETRYABLE
+
+    lowered = message.lower()
+    if "rate limit" in lowered or "too many requests" in lowered:
+        return ErrorClass.RATE_LIMIT
+    if "timed out" in lowered or "timeout" in lowered:
+        return ErrorClass.TIMEOUT
+    if "model not found" in lowered:
+        return ErrorClass.SERVER_ERROR
+    return ErrorClass.NON_RETRYABLE
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Return the server-requested delay from ``Retry-After`` headers, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ===== RETRY POLICY =====
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a per-call deadline.
+
+    Non-retryable errors are raised immediately. Retryable errors are retried
+    after ``uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))``
+    seconds, or the server's ``Retry-After`` if longer. When the next wait
+    would overrun the deadline, the last error is raised instead of waiting.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = LLM_RETRY_MAX_ATTEMPTS,
+        base_delay: float = LLM_RETRY_BASE_DELAY,
+        max_delay: float = LLM_RETRY_MAX_DELAY,
+        deadline: float = LLM_RETRY_DEADLINE,
+    ):
+        """Create a policy; the defaults come from the LLM_RETRY_* settings."""
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.failures = 0
+        self.deadline_exceeded = 0
+        self.retries: Dict[str, int] = {cls.value: 0 for cls in RETRYABLE_CLASSES}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _count_retry(self, error_class: ErrorClass) -> None:
+        with self._lock:
+            self.retries[error_class.value] += 1
+
+    def compute_delay(self, attempt: int, error: BaseException) -> float:
+        """Return how long to wait before retrying after ``attempt`` failed."""
+        backoff = random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+        retry_after = retry_after_seconds(error)
+        return max(backoff, retry_after) if retry_after is not None else backoff
+
+    def _next_delay(
+        self, attempt: int, error: BaseException, started: float
+    ) -> Optional[float]:
+        """Return the wait before the next attempt, or None to give up."""
+        error_class = classify_error(error)
+        if error_class not in RETRYABLE_CLASSES or attempt >= self.max_attempts:
+            self._count("failures")
+            return None
+
+        delay = self.compute_delay(attempt, error)
+        if time.monotonic() - started + delay >= self.deadline:
+            self._count("deadline_exceeded")
+            self._count("failures")
+            return None
+
+        self._count_retry(error_class)
+        print(
+            f"Transient model error ({error_class.value}, attempt {attempt}/{self.max_attempts}): "
+            f"{error}. Retrying in {delay:.1f}s..."
+        )
+        return delay
+
+    def run(self, fn: Callable[[], Any]) -> Any:
+        """Call ``fn`` synchronously under this policy."""
+        self._count("calls")
+        started = time.monotonic()
+        for attempt in range(1, self.max_attempts + 1):
+            self._count("attempts")
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def arun(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()`` under this policy without blocking the event loop.
+
+        Each attempt is also cut off when the overall deadline runs out.
+        """
+        self._count("calls")
+        started = time.monotonic()
+        for attempt in range(1, self.max_attempts + 1):
+            self._count("attempts")
+            remaining = self.deadline - (time.monotonic() - started)
+            try:
+                return await asyncio.wait_for(fn(), timeout=remaining)
+            except TimeoutError as e:
+                if time.monotonic() - started >= self.deadline:
+                    self._count("deadline_exceeded")
+                    self._count("failures")
+                    raise DeadlineExceeded(
+                        f"Model call exceeded its {self.deadline:g}s deadline"
+                    ) from e
+                delay = self._next_delay(attempt, e, started)
+                if delay is None:
+                    raise
+            except Exception as e:
+                delay = self._next_delay(attempt, e, started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """Return call, attempt, retry and failure counters."""
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": dict(self.retries),
+            "failures": self.failures,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+
+
+_default_policy: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy shared by all chat models."""
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = RetryPolicy()
+    return _default_policy
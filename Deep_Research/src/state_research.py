@@ -19,13 +19,18 @@ class ResearcherState(TypedDict):
     State for the research agent containing message history and research metadata.
 
     This state tracks the researcher's conversation, iteration count for limiting
-    tool calls, the research topic being investigated, compressed findings,
+    tool calls, the prompt tokens spent and start time for its other budgets,
+    the research topic being investigated, the key of its running digest of
+    findings (incremental compression), compressed findings,
     and raw research notes for detailed analysis.
     """
 
     researcher_messages: Annotated[Sequence[BaseMessage], add_messages]
     tool_call_iterations: int
+    prompt_tokens: int
+    started_at: float
     research_topic: str
+    digest_key: str
     compressed_research: str
     raw_notes: Annotated[List[str], operator.add]
 
@@ -0,0 +1,196 @@
+"""Run Tracing.
+
+This module records timing spans for a research run: one span per graph node
+execution (including each researcher subgraph) and one per logical LLM call,
+with token usage, retry attempts and cache hits.
+
+A ``TraceRecorder`` is both a LangChain callback handler, which captures node
+spans when passed in the graph's ``callbacks`` config, and the sink for LLM
+spans, which ``RetryingChatModel`` reports to the recorder installed in the
+``current_trace`` context variable. Node spans also carry the token usage,
+LLM call count and retries of the LLM calls made while the node ran.
+"""
+
+import contextvars
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing_extensions import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from deep_research.url_registry import current_researcher
+
+# Compiled subgraphs traced as a single span in addition to their own nodes
+SUBGRAPH_NAMES = {"researcher"}
+
+current_trace: contextvars.ContextVar[Optional["TraceRecorder"]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+
+@dataclass
+class Span:
+    """A timed unit of work within a run."""
+
+    kind: str  # "node" or "llm"
+    name: str
+    start: float  # wall-clock epoch seconds
+    duration: float
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def end(self) -> float:
+        """Return the wall-clock end time in epoch seconds."""
+        return self.start + self.duration
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-serializable dict, including its end time."""
+        data = asdict(self)
+        data["end"] = self.end
+        return data
+
+
+def _current_metadata() -> dict:
+    from langchain_core.runnables.config import var_child_runnable_config
+
+    config = var_child_runnable_config.get() or {}
+    return config.get("metadata") or {}
+
+
+def current_node() -> Optional[str]:
+    """Return the LangGraph node currently executing in this context, if any."""
+    return _current_metadata().get("langgraph_node")
+
+
+# Per-node rollups of the LLM calls made during the node's execution
+NODE_LLM_TOTALS = ("llm_calls", "input_tokens", "output_tokens", "retries")
+
+
+class TraceRecorder(BaseCallbackHandler):
+    """Collects node and LLM spans for one run.
+
+    Args:
+        on_span: Optional listener called with every completed span. It may be
+            called from worker threads, so it must be thread-safe.
+    """
+
+    # Record timestamps when events happen rather than from an executor
+    run_inline = True
+
+    def __init__(self, on_span: Optional[Callable[[Span], None]] = None):
+        """Create a recorder with no spans yet."""
+        self.spans: List[Span] = []
+        self.on_span = on_span
+        self._open: Dict[UUID, tuple] = {}
+        # langgraph checkpoint namespace of each running node -> its attributes
+        self._open_by_ns: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # ----- node spans (LangChain callbacks) -----
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Open a span for a graph node or researcher subgraph run."""
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        node = (metadata or {}).get("langgraph_node")
+        if name not in SUBGRAPH_NAMES and (node is None or name != node):
+            return
+        attributes = {}
+        researcher = current_researcher.get()
+        if researcher:
+            attributes["researcher"] = researcher
+        node_run = (metadata or {}).get("langgraph_checkpoint_ns")
+        with self._lock:
+            if name == node and node_run:
+                attributes.update(dict.fromkeys(NODE_LLM_TOTALS, 0))
+                self._open_by_ns[node_run] = attributes
+            self._open[run_id] = (name, node_run, time.time(), time.monotonic(), attributes)
+
+    def _close(self, run_id: UUID, status: str) -> None:
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+            if opened is not None and self._open_by_ns.get(opened[1]) is opened[4]:
+                del self._open_by_ns[opened[1]]
+        if opened is None:
+            return
+        name, _, start, started, attributes = opened
+        self.add_span(
+            Span(
+                kind="node",
+                name=name,
+                start=start,
+                duration=time.monotonic() - started,
+                status=status,
+                attributes=attributes,
+            )
+        )
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Close the run's span as successful."""
+        self._close(run_id, "ok")
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Close the run's span as failed."""
+        self._close(run_id, "error")
+
+    # ----- span sink -----
+
+    def add_span(self, span: Span, node_run: Optional[str] = None) -> None:
+        """Store a span, add LLM spans to their node's totals and notify ``on_span``."""
+        with self._lock:
+            self.spans.append(span)
+            totals = self._open_by_ns.get(node_run) if node_run else None
+            if totals is not None and span.kind == "llm":
+                totals["llm_calls"] += 1
+                for key in ("input_tokens", "output_tokens", "retries"):
+                    totals[key] += span.attributes.get(key, 0)
+        if self.on_span is not None:
+            self.on_span(span)
+
+    def snapshot(self) -> List[Span]:
+        """Return a copy of the spans recorded so far."""
+        with self._lock:
+            return list(self.spans)
+
+
+def record_llm_span(
+    name: str,
+    start: float,
+    duration: float,
+    status: str = "ok",
+    **attributes: Any,
+) -> None:
+    """Add an LLM call span to the active recorder, if any."""
+    recorder = current_trace.get()
+    if recorder is None:
+        return
+    metadata = _current_metadata()
+    node = metadata.get("langgraph_node")
+    if node is not None:
+        attributes["node"] = node
+    researcher = current_researcher.get()
+    if researcher:
+        attributes["researcher"] = researcher
+    recorder.add_span(
+        Span(
+            kind="llm",
+            name=name,
+            start=start,
+            duration=duration,
+            status=status,
+            attributes=attributes,
+        ),
+        node_run=metadata.get("langgraph_checkpoint_ns"),
+    )
@@ -0,0 +1,142 @@
+"""Cross-Researcher URL Registry.
+
+This module tracks which researcher first summarized each URL during a
+research job, so researchers spawned by the supervisor, in the same or later
+rounds, do not summarize and report the same source repeatedly. A URL only
+counts as covered once a real summary of it exists; results that fell back to
+a search snippet are never claimed.
+
+The active registry and researcher are carried in context variables. Job
+runners install a fresh registry before running the graph; a context variable
+set inside a graph node does not carry over to the next node run, so graph
+runs without one get a registry per ``thread_id`` from ``job_url_registry``.
+Every search issued from the researchers (including their worker threads and
+subtasks) sees the same registry.
+"""
+
+import contextvars
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing_extensions import Dict, List, Optional
+
+# "reference" returns a short pointer to the covering researcher;
+# "summary" hands back the already-computed summary when available
+URL_REGISTRY_MODE = os.getenv("URL_REGISTRY_MODE", "reference")
+# Registries kept for graph runs that did not install one, by thread_id
+MAX_THREAD_REGISTRIES = 256
+
+current_url_registry: contextvars.ContextVar[Optional["URLRegistry"]] = (
+    contextvars.ContextVar("current_url_registry", default=None)
+)
+current_researcher: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_researcher", default=None
+)
+
+
+class URLRegistry:
+    """Per-job record of the researcher and summary associated with each URL."""
+
+    def __init__(self, mode: str = URL_REGISTRY_MODE):
+        """Create an empty registry answering in ``mode`` (reference or summary)."""
+        self.mode = mode
+        self._owners: Dict[str, str] = {}
+        self._summaries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.references_served = 0
+        self.summaries_reused = 0
+        self._researchers = 0
+        _live_registries.add(self)
+
+    def next_researcher_label(self) -> str:
+        """Return a researcher label that is unique within this job."""
+        with self._lock:
+            self._researchers += 1
+            return f"researcher {self._researchers}"
+
+    def lookup(self, url: str, title: str, researcher: Optional[str]) -> Optional[str]:
+        """Return what another researcher already reported for ``url``, if anything.
+
+        Args:
+            url: URL of the search result
+            title: Title of the search result, used in the reference text
+            researcher: Label of the researcher issuing the search
+
+        Returns:
+            None if the caller should process the URL itself, otherwise the
+            content to report in place of a fresh summary
+        """
+        researcher = researcher or "researcher"
+        with self._lock:
+            owner = self._owners.get(url)
+            # Pages still being summarized elsewhere are shared by single-flight
+            if owner is None or owner == researcher:
+                return None
+
+            if self.mode == "summary":
+                self.summaries_reused += 1
+                return self._summaries[url]
+
+            self.references_served += 1
+            return (
+                f"Already covered by another researcher ({owner}): \"{title}\". "
+                "See that researcher's findings for the summary of this source."
+            )
+
+    def record(self, url: str, summary: str, researcher: Optional[str]) -> None:
+        """Claim ``url`` for ``researcher`` with the summary it produced.
+
+        Only real summaries may be recorded; the first one recorded wins.
+        """
+        with self._lock:
+            if url not in self._owners:
+                self._owners[url] = researcher or "researcher"
+                self._summaries[url] = summary
+
+    def stats(self) -> dict:
+        """Return counters describing how much duplicate work was avoided."""
+        return {
+            "urls": len(self._owners),
+            "references_served": self.references_served,
+            "summaries_reused": self.summaries_reused,
+        }
+
+
+# Registries of jobs still referenced somewhere, for the /metrics endpoint
+_live_registries: "weakref.WeakSet[URLRegistry]" = weakref.WeakSet()
+_thread_registries: "OrderedDict[str, URLRegistry]" = OrderedDict()
+_thread_registries_lock = threading.Lock()
+
+
+def get_url_registry() -> Optional[URLRegistry]:
+    """Return the registry of the current research job, if any."""
+    return current_url_registry.get()
+
+
+def job_url_registry(thread_id: Optional[str]) -> URLRegistry:
+    """Return the registry installed by the job runner, or the one for ``thread_id``.
+
+    Args:
+        thread_id: ``thread_id`` of the graph run, from its config
+
+    Returns:
+        The registry shared by every researcher of the job
+    """
+    registry = current_url_registry.get()
+    if registry is not None:
+        return registry
+    key = thread_id or ""
+    with _thread_registries_lock:
+        registry = _thread_registries.get(key)
+        if registry is None:
+            registry = _thread_registries[key] = URLRegistry()
+            while len(_thread_registries) > MAX_THREAD_REGISTRIES:
+                _thread_registries.popitem(last=False)
+        _thread_registries.move_to_end(key)
+    return registry
+
+
+def live_url_registries() -> List[URLRegistry]:
+    """Return the registries of research jobs that have not been released yet."""
+    return list(_live_registries)
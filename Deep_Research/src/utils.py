@@ -4,17 +4,47 @@ This module provides search and content processing utilities for the research ag
 including web search capabilities and content summarization tools.
 """
 
+import asyncio
+import contextvars
+import json
+import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing_extensions import Annotated, List, Literal, Optional
-
-from langchain_core.messages import HumanMessage
-from langchain_core.tools import tool, InjectedToolArg
-
+from typing_extensions import Annotated, List, Literal, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, message_to_dict, messages_from_dict
+from langchain_core.tools import tool, InjectedToolArg, StructuredTool
+
+from deep_research.cache import LRUCache, SQLiteCache, TieredCache, content_hash
+from deep_research.cassettes import AsyncCassetteTavilyClient, CassetteTavilyClient, get_cassette
+from deep_research.fake_backends import LLM_BACKEND, SEARCH_BACKEND
+from deep_research.concurrency import AdaptiveConcurrencyLimiter, RateLimiter, SingleFlight
+from deep_research.retry_policy import ErrorClass, RetryPolicy, classify_error, get_retry_policy
+from deep_research.content_processing import (
+    canonicalize_url,
+    clean_page_text,
+    collapse_duplicates,
+    select_for_summarization,
+    split_into_chunks,
+)
 from deep_research.state_research import Summary
+from deep_research.metrics import (
+    llm_errors_total,
+    llm_request_seconds,
+    observe_request,
+    registry,
+    search_errors_total,
+    search_request_seconds,
+)
+from deep_research.tracing import current_node, record_llm_span
+from deep_research.url_registry import current_researcher, get_url_registry, live_url_registries
 from deep_research.prompts import (
     summarize_webpage_prompt,
+    reduce_webpage_summaries_prompt,
     report_generation_with_draft_insight_prompt,
 )
 
@@ -22,8 +52,13 @@ from deep_research.prompts import (
 
 
 def get_today_str() -> str:
-    """Return current date in a Windows-safe, human-readable format."""
-    dt = datetime.now()
+    """Return current date in a Windows-safe, human-readable format.
+
+    During a cassette session the recording date is used instead, so replayed
+    prompts match the recorded ones.
+    """
+    cassette = get_cassette()
+    dt = cassette.today if cassette is not None and cassette.today else datetime.now()
     weekday = dt.strftime("%a")
     month = dt.strftime("%b")
     day = dt.day
@@ -45,57 +80,522 @@ def get_current_dir() -> Path:
         return Path.cwd()
 
 
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Uses ``asyncio.run`` when no event loop is running in the current thread,
+    otherwise runs the coroutine on a fresh loop in a worker thread so the
+    caller's loop is never re-entered. Context variables (such as the
+    per-job URL registry) are carried over to the worker thread.
+
+    Args:
+        coro: Coroutine to execute
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(context.run, asyncio.run, coro).result()
+
+
 # ===== CONFIGURATION (lazy-loaded models & clients) =====
 
 
+# Client-side quota per model endpoint; 0 disables the corresponding bucket
+LLM_RATE_LIMIT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", "0"))
+LLM_RATE_LIMIT_TPM = float(os.getenv("LLM_RATE_LIMIT_TPM", "0"))
+# Completion tokens reserved per call when the model has no max_tokens set
+LLM_DEFAULT_COMPLETION_TOKENS = int(os.getenv("LLM_DEFAULT_COMPLETION_TOKENS", "1024"))
+
+# Adaptive (AIMD) in-flight limits for chat models and Tavily search, driven by
+# 429/5xx errors; set ADAPTIVE_CONCURRENCY=false to send calls unthrottled
+ADAPTIVE_CONCURRENCY = os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() in ("1", "true", "yes")
+LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "32"))
+LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "64"))
+SEARCH_CONCURRENCY_INITIAL = int(os.getenv("SEARCH_CONCURRENCY_INITIAL", "5"))
+SEARCH_CONCURRENCY_MIN = int(os.getenv("SEARCH_CONCURRENCY_MIN", "1"))
+SEARCH_CONCURRENCY_MAX = int(os.getenv("SEARCH_CONCURRENCY_MAX", "32"))
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Return whether an error signals backend overload (429 or 5xx)."""
+    return classify_error(error) in (ErrorClass.RATE_LIMIT, ErrorClass.SERVER_ERROR)
+
+
+# Process-wide registries of rate and concurrency limiters, one per model endpoint
+_rate_limiters: dict = {}
+_rate_limiters_lock = threading.Lock()
+_concurrency_limiters: dict = {}
+
+
+def get_rate_limiter(model: str, base_url: str) -> RateLimiter:
+    """Return the rate limiter shared by every client of this model endpoint."""
+    key = (model, base_url)
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(rpm=LLM_RATE_LIMIT_RPM, tpm=LLM_RATE_LIMIT_TPM)
+            _rate_limiters[key] = limiter
+    return limiter
+
+
+def get_concurrency_limiter(model: str, base_url: str) -> Optional[AdaptiveConcurrencyLimiter]:
+    """Return the adaptive in-flight limiter shared by every client of this model endpoint."""
+    if not ADAPTIVE_CONCURRENCY:
+        return None
+    key = (model, base_url)
+    with _rate_limiters_lock:
+        limiter = _concurrency_limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(
+                LLM_CONCURRENCY_INITIAL,
+                min_limit=LLM_CONCURRENCY_MIN,
+                max_limit=LLM_CONCURRENCY_MAX,
+                is_overload=is_overload_error,
+            )
+            _concurrency_limiters[key] = limiter
+    return limiter
+
+
+def estimate_tokens(model_input) -> int:
+    """Roughly estimate the prompt tokens of a model input (about 4 characters per token).
+
+    Args:
+        model_input: A prompt string or a list of messages
+
+    Returns:
+        Estimated number of prompt tokens
+    """
+    if isinstance(model_input, (list, tuple)):
+        text_length = sum(
+            len(str(getattr(message, "content", message))) for message in model_input
+        )
+    else:
+        text_length = len(str(getattr(model_input, "content", model_input)))
+    return text_length // 4 + 1
+
+
+# Opt-in exact-match response cache for deterministic prompts. A call site is
+# cached only when LLM_CACHE is on and the site is listed in LLM_CACHE_SITES.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "").lower() in ("1", "true", "yes")
+LLM_CACHE_SITES = {
+    site.strip()
+    for site in os.getenv(
+        "LLM_CACHE_SITES", "research_brief,draft_report,summarize,verification"
+    ).split(",")
+    if site.strip()
+}
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    str(Path.home() / ".cache" / "deep_research" / "llm_cache.sqlite"),
+)
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+
+_llm_cache: Optional[TieredCache] = None
+
+
+def get_llm_cache() -> TieredCache:
+    """Lazy-load the process-wide LLM response cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        disk = None
+        if LLM_CACHE_PATH:
+            disk = SQLiteCache(
+                LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES
+            )
+        _llm_cache = TieredCache(LRUCache(LLM_CACHE_SIZE), disk)
+    return _llm_cache
+
+
+def llm_cache_enabled(site: Optional[str]) -> bool:
+    """Return whether responses for the given call site should be cached."""
+    return LLM_CACHE_ENABLED and site is not None and site in LLM_CACHE_SITES
+
+
+def _schema_identity(schema) -> str:
+    """Describe a structured-output schema or tool by its JSON schema."""
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+
+    try:
+        return json.dumps(convert_to_openai_tool(schema), sort_keys=True, default=str)
+    except Exception:
+        return repr(schema)
+
+
+def _message_key_dict(message: BaseMessage) -> dict:
+    """Serialize a message without its id, which the graph assigns at random per run."""
+    data = message_to_dict(message)
+    data["data"].pop("id", None)
+    return data
+
+
+def _serialize_model_input(model_input) -> str:
+    """Render a prompt string or message list as stable JSON for cache keys."""
+    if isinstance(model_input, (list, tuple)):
+        model_input = [
+            _message_key_dict(message) if isinstance(message, BaseMessage) else message
+            for message in model_input
+        ]
+    elif isinstance(model_input, BaseMessage):
+        model_input = _message_key_dict(model_input)
+    return json.dumps(model_input, sort_keys=True, default=str)
+
+
+def _dump_response(response) -> Optional[dict]:
+    """Convert a model response to a JSON-serializable cache entry, if supported."""
+    if isinstance(response, BaseMessage):
+        return {"type": "message", "data": message_to_dict(response)}
+    if isinstance(response, dict) and isinstance(response.get("raw"), BaseMessage):
+        # Structured output requested with include_raw; failed parses are not stored
+        parsed = response.get("parsed")
+        if parsed is None:
+            return None
+        return {
+            "type": "structured",
+            "raw": message_to_dict(response["raw"]),
+            "parsed": parsed.model_dump(mode="json") if hasattr(parsed, "model_dump") else parsed,
+        }
+    if hasattr(response, "model_dump"):
+        return {"type": "model", "data": response.model_dump(mode="json")}
+    if isinstance(response, (dict, str)):
+        return {"type": "json", "data": response}
+    return None
+
+
+def _load_response(entry: dict, output_schema=None):
+    """Rebuild a model response from an entry produced by ``_dump_response``."""
+    if entry["type"] == "message":
+        return messages_from_dict([entry["data"]])[0]
+    if entry["type"] == "model":
+        if output_schema is None or not hasattr(output_schema, "model_validate"):
+            return None
+        return output_schema.model_validate(entry["data"])
+    if entry["type"] == "structured":
+        parsed = entry["parsed"]
+        if output_schema is not None and hasattr(output_schema, "model_validate"):
+            parsed = output_schema.model_validate(parsed)
+        return {
+            "raw": messages_from_dict([entry["raw"]])[0],
+            "parsed": parsed,
+            "parsing_error": None,
+        }
+    return entry["data"]
+
+
+def _usage(response) -> Optional[dict]:
+    """Return the provider-reported token usage of a model response, if any."""
+    raw = response.get("raw") if isinstance(response, dict) else response
+    return getattr(raw, "usage_metadata", None)
+
+
 class RetryingChatModel:
-    """A wrapper around LangChain chat models to automatically retry on transient API/gateway errors."""
-    def __init__(self, model):
+    """A wrapper around LangChain chat models to automatically retry on transient API/gateway errors.
+
+    Every call goes through one shared RetryPolicy (typed error
+    classification, exponential backoff with jitter, Retry-After and an
+    overall deadline), so call sites do not add retry loops of their own.
+    Each attempt (retries included) first acquires from the endpoint's
+    rate limiter, so bursts queue client-side instead of drawing 429s, and
+    then runs inside the endpoint's adaptive concurrency limit.
+    Structured-output and tool-bound variants are built once per schema or
+    tool set and reused, so repeated calls share the same underlying client.
+
+    ``with_cache(site)`` returns a variant whose responses are served from
+    the exact-match LLM cache when that call site is enabled. The cache key
+    covers the model identity, bound schema or tools, call kwargs and the
+    full message list.
+
+    When a record/replay cassette is active, each model call is recorded to
+    or served from it (and the response cache is skipped so every request
+    reaches the cassette).
+
+    Structured outputs are requested together with the raw message, so token
+    usage is known for every call; each call is reported as an LLM span to
+    the active trace recorder.
+    """
+    def __init__(
+        self,
+        model,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        completion_tokens: int = LLM_DEFAULT_COMPLETION_TOKENS,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        identity: str = "",
+        output_schema=None,
+        cache_site: Optional[str] = None,
+        unwrap_raw: bool = False,
+    ):
+        """Wrap ``model``; limiters default to none and the retry policy to the shared one."""
         self.model = model
+        self.retry_policy = retry_policy or get_retry_policy()
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.completion_tokens = completion_tokens
+        self.identity = identity
+        self.output_schema = output_schema
+        self.cache_site = cache_site
+        self.unwrap_raw = unwrap_raw
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def _request_key(self, args, kwargs) -> str:
+        model_input = args[0] if args else kwargs.get("input", "")
+        call_kwargs = {k: v for k, v in kwargs.items() if k not in ("input", "config")}
+        return content_hash(
+            self.identity,
+            json.dumps(call_kwargs, sort_keys=True, default=str),
+            _serialize_model_input(model_input),
+        )
+
+    def _cache_key(self, args, kwargs) -> Optional[str]:
+        if get_cassette() is not None or not llm_cache_enabled(self.cache_site):
+            return None
+        return self._request_key(args, kwargs)
+
+    def _cache_get(self, cache_key: Optional[str]):
+        if cache_key is None:
+            return None
+        entry = get_llm_cache().get(cache_key, ttl=LLM_CACHE_TTL)
+        if entry is None:
+            return None
+        return _load_response(entry, self.output_schema)
+
+    async def _acache_get(self, cache_key: Optional[str]):
+        if cache_key is None:
+            return None
+        entry = await get_llm_cache().aget(cache_key, ttl=LLM_CACHE_TTL)
+        if entry is None:
+            return None
+        return _load_response(entry, self.output_schema)
+
+    def _cache_set(self, cache_key: Optional[str], response) -> None:
+        if cache_key is None:
+            return
+        entry = _dump_response(response)
+        if entry is not None:
+            get_llm_cache().set(cache_key, entry)
+
+    async def _acache_set(self, cache_key: Optional[str], response) -> None:
+        if cache_key is None:
+            return
+        entry = _dump_response(response)
+        if entry is not None:
+            await get_llm_cache().aset(cache_key, entry)
+
+    def _estimated_tokens(self, args, kwargs) -> int:
+        model_input = args[0] if args else kwargs.get("input", "")
+        return estimate_tokens(model_input) + self.completion_tokens
+
+    def _load_recorded(self, entry: dict):
+        return _load_response(entry, self.output_schema)
+
+    def _call_model(self, args, kwargs):
+        cassette = get_cassette()
+        if cassette is None:
+            return self.model.invoke(*args, **kwargs)
+        return cassette.call(
+            "llm",
+            self._request_key(args, kwargs),
+            self.identity,
+            lambda: self.model.invoke(*args, **kwargs),
+            dump=_dump_response,
+            load=self._load_recorded,
+        )
+
+    async def _acall_model(self, args, kwargs):
+        cassette = get_cassette()
+        if cassette is None:
+            return await self.model.ainvoke(*args, **kwargs)
+        return await cassette.acall(
+            "llm",
+            self._request_key(args, kwargs),
+            self.identity,
+            lambda: self.model.ainvoke(*args, **kwargs),
+            dump=_dump_response,
+            load=self._load_recorded,
+        )
+
+    def _unwrap(self, response):
+        """Return the parsed output of an include_raw structured response."""
+        if not (self.unwrap_raw and isinstance(response, dict) and "parsed" in response):
+            return response
+        if response.get("parsing_error") is not None:
+            raise response["parsing_error"]
+        return response["parsed"]
+
+    def _trace(self, args, kwargs, response, start, started, attempts, cached, error=None):
+        usage = _usage(response) if response is not None else None
+        if usage:
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+        else:
+            model_input = args[0] if args else kwargs.get("input", "")
+            input_tokens = estimate_tokens(model_input)
+            output_tokens = 0
+        duration = time.monotonic() - started
+        site = self.cache_site or current_node() or "llm"
+        if cached:
+            llm_request_seconds.observe(duration, site=site, status="cached")
+        else:
+            observe_request(llm_request_seconds, llm_errors_total, site, duration, error)
+        record_llm_span(
+            self.cache_site or "llm",
+            start,
+            duration,
+            status="error" if error is not None else "ok",
+            model=self.identity,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            tokens_estimated=not usage,
+            attempts=attempts,
+            retries=max(attempts - 1, 0),
+            cached=cached,
+            **({"error": type(error).__name__} if error is not None else {}),
+        )
 
     def invoke(self, *args, **kwargs):
-        import time
-        for attempt in range(1, 5):
-            try:
-                return self.model.invoke(*args, **kwargs)
-            except Exception as e:
-                is_transient = "Model not found" in str(e) or "rate limit" in str(e).lower() or "timeout" in str(e).lower() or "50" in str(e)
-                if is_transient and attempt < 4:
-                    print(f"Transient model error in invoke (attempt {attempt}/4): {e}. Retrying in 2s...")
-                    time.sleep(2)
-                else:
-                    raise e
+        """Call the model with retries, limits, caching and tracing."""
+        start, started = time.time(), time.monotonic()
+        cache_key = self._cache_key(args, kwargs)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._trace(args, kwargs, cached, start, started, 0, cached=True)
+            return self._unwrap(cached)
+        tokens = self._estimated_tokens(args, kwargs)
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire_sync(tokens)
+            if self.concurrency_limiter is not None:
+                return self.concurrency_limiter.run_sync(
+                    lambda: self._call_model(args, kwargs)
+                )
+            return self._call_model(args, kwargs)
+
+        try:
+            response = self.retry_policy.run(attempt)
+        except Exception as e:
+            self._trace(args, kwargs, None, start, started, attempts, cached=False, error=e)
+            raise
+        self._cache_set(cache_key, response)
+        self._trace(args, kwargs, response, start, started, attempts, cached=False)
+        return self._unwrap(response)
 
     async def ainvoke(self, *args, **kwargs):
-        import asyncio
-        for attempt in range(1, 5):
-            try:
-                return await self.model.ainvoke(*args, **kwargs)
-            except Exception as e:
-                is_transient = "Model not found" in str(e) or "rate limit" in str(e).lower() or "timeout" in str(e).lower() or "50" in str(e)
-                if is_transient and attempt < 4:
-                    print(f"Transient model error in ainvoke (attempt {attempt}/4): {e}. Retrying in 2s...")
-                    await asyncio.sleep(2)
-                else:
-                    raise e
+        """Async variant of ``invoke``; waits never block the event loop."""
+        start, started = time.time(), time.monotonic()
+        cache_key = self._cache_key(args, kwargs)
+        cached = await self._acache_get(cache_key)
+        if cached is not None:
+            self._trace(args, kwargs, cached, start, started, 0, cached=True)
+            return self._unwrap(cached)
+        tokens = self._estimated_tokens(args, kwargs)
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            attempts += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(tokens)
+            if self.concurrency_limiter is not None:
+                return await self.concurrency_limiter.run(
+                    lambda: self._acall_model(args, kwargs)
+                )
+            return await self._acall_model(args, kwargs)
 
-    def with_structured_output(self, schema, **kwargs):
-        structured_model = self.model.with_structured_output(schema, **kwargs)
-        return RetryingChatModel(structured_model)
+        try:
+            response = await self.retry_policy.arun(attempt)
+        except Exception as e:
+            self._trace(args, kwargs, None, start, started, attempts, cached=False, error=e)
+            raise
+        await self._acache_set(cache_key, response)
+        self._trace(args, kwargs, response, start, started, attempts, cached=False)
+        return self._unwrap(response)
+
+    def _get_derived(self, key, build, **overrides):
+        with self._derived_lock:
+            derived = self._derived.get(key)
+            if derived is None:
+                settings = {
+                    "rate_limiter": self.rate_limiter,
+                    "completion_tokens": self.completion_tokens,
+                    "concurrency_limiter": self.concurrency_limiter,
+                    "identity": self.identity,
+                    "output_schema": self.output_schema,
+                    "cache_site": self.cache_site,
+                    "unwrap_raw": self.unwrap_raw,
+                }
+                settings.update(overrides)
+                derived = RetryingChatModel(build(), self.retry_policy, **settings)
+                self._derived[key] = derived
+            return derived
+
+    def with_structured_output(self, schema, include_raw: bool = False, **kwargs):
+        """Return the shared wrapper of the model bound to a structured-output schema."""
+        key = ("structured", id(schema), include_raw, repr(sorted(kwargs.items())))
+        identity = content_hash(
+            self.identity, "structured", _schema_identity(schema), repr(sorted(kwargs.items()))
+        )
+        # Always fetch the raw message (for token usage); unwrap unless the caller asked for it
+        return self._get_derived(
+            key,
+            lambda: self.model.with_structured_output(schema, include_raw=True, **kwargs),
+            identity=identity,
+            output_schema=schema,
+            unwrap_raw=not include_raw,
+        )
 
     def bind_tools(self, tools, **kwargs):
-        bound_model = self.model.bind_tools(tools, **kwargs)
-        return RetryingChatModel(bound_model)
+        """Return the shared wrapper of the model bound to these tools."""
+        key = ("tools", tuple(id(t) for t in tools), repr(sorted(kwargs.items())))
+        identity = content_hash(
+            self.identity,
+            "tools",
+            *(_schema_identity(t) for t in tools),
+            repr(sorted(kwargs.items())),
+        )
+        return self._get_derived(
+            key, lambda: self.model.bind_tools(tools, **kwargs), identity=identity
+        )
+
+    def with_cache(self, site: str):
+        """Return this model with response caching for the named call site."""
+        return self._get_derived(("cache", site), lambda: self.model, cache_site=site)
 
     def __getattr__(self, name):
+        """Delegate any other attribute to the wrapped model."""
         return getattr(self.model, name)
 
 
+# Process-wide registry of chat-model clients, one per (model, max_tokens, endpoint)
+_chat_models: dict = {}
+_chat_models_lock = threading.Lock()
+
+
 def get_chat_model(model: str = "gpt-4o", max_tokens: int = None):
-    """Lazy-load chat model with custom environment/ICA overrides."""
-    import os
+    """Return the shared chat model for this configuration, creating it on first use.
+
+    Clients are built lazily (after environment variables are loaded) with
+    custom environment/ICA overrides, and all of them share one pooled
+    keep-alive HTTP transport. With ``LLM_BACKEND=fake`` a FakeChatModel is
+    used instead, behind the same retry, rate and concurrency limits.
+    """
     from langchain.chat_models import init_chat_model
 
+    from deep_research.http_pool import get_async_http_client, get_http_client
+
     # Enforce gpt-4o strictly as requested by the user
     model_name = "gpt-4o"
 
@@ -107,13 +607,35 @@ def get_chat_model(model: str = "gpt-4o", max_tokens: int = None):
         "model_provider": "openai",
         "api_key": api_key,
         "base_url": base_url,
+        "http_client": get_http_client(),
+        "http_async_client": get_async_http_client(),
+        # Retries are owned by RetryingChatModel's policy, not the OpenAI SDK
+        "max_retries": 0,
     }
     if max_tokens is not None:
         # Cap max_tokens to 16384 as Azure/litellm endpoint limits it for gpt-4o
         kwargs["max_tokens"] = min(max_tokens, 16384)
 
-    raw_model = init_chat_model(**kwargs)
-    return RetryingChatModel(raw_model)
+    key = (model_name, kwargs.get("max_tokens"), base_url, content_hash(api_key))
+    with _chat_models_lock:
+        chat_model = _chat_models.get(key)
+        if chat_model is None:
+            if LLM_BACKEND == "fake":
+                from deep_research.fake_backends import FakeChatModel
+
+                base_model = FakeChatModel()
+            else:
+                base_model = init_chat_model(**kwargs)
+            chat_model = RetryingChatModel(
+                base_model,
+                rate_limiter=get_rate_limiter(model_name, base_url),
+                completion_tokens=kwargs.get("max_tokens", LLM_DEFAULT_COMPLETION_TOKENS),
+                concurrency_limiter=get_concurrency_limiter(model_name, base_url),
+                # Endpoint-independent, so cassettes replay against any gateway
+                identity=repr((model_name, kwargs.get("max_tokens"))),
+            )
+            _chat_models[key] = chat_model
+    return chat_model
 
 
 def get_summarization_model():
@@ -127,23 +649,388 @@ def get_writer_model():
 
 
 def get_tavily_client():
-    """Lazy-load Tavily client AFTER TAVILY_API_KEY is available."""
+    """Lazy-load Tavily client AFTER TAVILY_API_KEY is available.
+
+    Searches go through the record/replay cassette when one is active; on
+    replay no live client (or API key) is needed. ``SEARCH_BACKEND=fake``
+    swaps in a synthetic search provider.
+    """
     from tavily import TavilyClient
 
-    return TavilyClient()
+    if SEARCH_BACKEND == "fake":
+        from deep_research.fake_backends import FakeTavilyClient as TavilyClient
+
+    cassette = get_cassette()
+    if cassette is None:
+        return TavilyClient()
+    client = TavilyClient() if cassette.mode == "record" else None
+    return CassetteTavilyClient(client, cassette)
+
+
+def get_async_tavily_client():
+    """Lazy-load async Tavily client AFTER TAVILY_API_KEY is available.
+
+    Searches go through the record/replay cassette when one is active; on
+    replay no live client (or API key) is needed. ``SEARCH_BACKEND=fake``
+    swaps in a synthetic search provider.
+    """
+    from tavily import AsyncTavilyClient
+
+    if SEARCH_BACKEND == "fake":
+        from deep_research.fake_backends import AsyncFakeTavilyClient as AsyncTavilyClient
+
+    cassette = get_cassette()
+    if cassette is None:
+        return AsyncTavilyClient()
+    client = AsyncTavilyClient() if cassette.mode == "record" else None
+    return AsyncCassetteTavilyClient(client, cassette)
 
 
 MAX_CONTEXT_LENGTH = 250000
 
+# Maximum number of Tavily queries in flight at once for a single search batch
+SEARCH_MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "5"))
+# Per-query timeout in seconds; a timed-out query yields an empty result set
+SEARCH_QUERY_TIMEOUT = float(os.getenv("TAVILY_QUERY_TIMEOUT", "30"))
+# Maximum number of webpage summaries in flight at once for a single search
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "5"))
+# Per-page summary budget in seconds before falling back to the Tavily snippet
+SUMMARY_DEADLINE = float(os.getenv("SUMMARY_DEADLINE", "150"))
+# Deadline in seconds for each summary call within that budget (a page, or one
+# chunk of a long page and the final merge)
+SUMMARY_CALL_DEADLINE = float(os.getenv("SUMMARY_CALL_DEADLINE", "60"))
+
+# Chunked (map-reduce) summarization for pages longer than one chunk
+SUMMARY_CHUNKING = os.getenv("SUMMARY_CHUNKING", "true").lower() in ("1", "true", "yes")
+SUMMARY_CHUNK_SIZE = int(os.getenv("SUMMARY_CHUNK_SIZE", "40000"))
+SUMMARY_CHUNK_CONCURRENCY = int(os.getenv("SUMMARY_CHUNK_CONCURRENCY", "4"))
+SUMMARY_MAX_CHUNKS = int(os.getenv("SUMMARY_MAX_CHUNKS", "16"))
+# Characters of raw_content sent to summarization
+SUMMARY_INPUT_LIMIT = (
+    SUMMARY_CHUNK_SIZE * SUMMARY_MAX_CHUNKS if SUMMARY_CHUNKING else MAX_CONTEXT_LENGTH
+)
+
+# Summary cache: bump SUMMARY_PROMPT_VERSION when summarization output should change
+# without the prompt text changing (e.g. a different model or schema)
+SUMMARY_PROMPT_VERSION = "1-" + content_hash(
+    summarize_webpage_prompt,
+    reduce_webpage_summaries_prompt,
+    str(SUMMARY_CHUNKING),
+    str(SUMMARY_CHUNK_SIZE),
+)[:12]
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))
+# Optional on-disk tier; disabled unless a path is configured
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH")
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", str(7 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "10000"))
+# Skip summary cache reads (fresh summaries are still stored), e.g. for benchmarks
+SUMMARY_CACHE_BYPASS = os.getenv("SUMMARY_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+_summary_cache: Optional[TieredCache] = None
+
+
+def get_summary_cache() -> TieredCache:
+    """Lazy-load the process-wide webpage summary cache."""
+    global _summary_cache
+    if _summary_cache is None:
+        disk = None
+        if SUMMARY_CACHE_PATH:
+            disk = SQLiteCache(
+                SUMMARY_CACHE_PATH,
+                ttl=SUMMARY_CACHE_TTL,
+                max_entries=SUMMARY_CACHE_MAX_ENTRIES,
+            )
+        _summary_cache = TieredCache(LRUCache(SUMMARY_CACHE_SIZE), disk)
+    return _summary_cache
+
+
+def summary_cache_key(webpage_content: str) -> str:
+    """Build the content-addressed cache key for a page summary."""
+    return content_hash(SUMMARY_PROMPT_VERSION, webpage_content)
+
+# Search response cache. Freshness-sensitive searches expire quickly, general
+# searches are kept for a week. Set SEARCH_CACHE_BYPASS=1 for freshness-critical runs.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_CACHE_PATH = os.getenv(
+    "SEARCH_CACHE_PATH",
+    str(Path.home() / ".cache" / "deep_research" / "search_cache.sqlite"),
+)
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+SEARCH_CACHE_BYPASS = os.getenv("SEARCH_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+SEARCH_CACHE_TTLS = {
+    "day": 3600,
+    "week": 6 * 3600,
+    "month": 24 * 3600,
+    "year": 7 * 24 * 3600,
+    None: 7 * 24 * 3600,
+}
+SEARCH_CACHE_NEWS_TTL = 3600
+
+_search_cache: Optional[TieredCache] = None
+
+
+def get_search_cache() -> TieredCache:
+    """Lazy-load the process-wide Tavily search response cache."""
+    global _search_cache
+    if _search_cache is None:
+        disk = None
+        if SEARCH_CACHE_PATH:
+            try:
+                disk = SQLiteCache(
+                    SEARCH_CACHE_PATH,
+                    ttl=max(SEARCH_CACHE_TTLS.values()),
+                    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+                )
+            except Exception as e:
+                print(f"Search cache disk tier unavailable ({e}), using memory only")
+        _search_cache = TieredCache(LRUCache(SEARCH_CACHE_SIZE), disk)
+    return _search_cache
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different queries share a cache entry."""
+    normalized = re.sub(r"\s+", " ", query.strip().lower())
+    return normalized.rstrip("?.! ")
+
+
+def search_cache_key(
+    query: str,
+    max_results: int,
+    topic: str,
+    include_raw_content: bool,
+    time_range: Optional[str],
+) -> str:
+    """Build the cache key for a single Tavily query and its parameters."""
+    return content_hash(
+        normalize_query(query),
+        str(max_results),
+        topic,
+        str(include_raw_content),
+        str(time_range),
+    )
+
+
+def search_cache_ttl(topic: str, time_range: Optional[str]) -> float:
+    """Return how long a search response stays fresh for the given filters."""
+    ttl = SEARCH_CACHE_TTLS.get(time_range, SEARCH_CACHE_TTLS[None])
+    if topic == "news":
+        ttl = min(ttl, SEARCH_CACHE_NEWS_TTL)
+    return ttl
+
+
+# Process-wide coalescing of identical in-flight work across parallel researchers
+search_flight = SingleFlight()
+summary_flight = SingleFlight()
+
+# Process-wide adaptive in-flight limit for Tavily, shared by all researchers
+search_concurrency = (
+    AdaptiveConcurrencyLimiter(
+        SEARCH_CONCURRENCY_INITIAL,
+        min_limit=SEARCH_CONCURRENCY_MIN,
+        max_limit=SEARCH_CONCURRENCY_MAX,
+        is_overload=is_overload_error,
+    )
+    if ADAPTIVE_CONCURRENCY
+    else None
+)
+
+
+def _collect_backend_metrics() -> dict:
+    """Report cache, limiter, retry and work-sharing stats for the /metrics endpoint.
+
+    Only caches that have already been created are reported, so a scrape never
+    opens a SQLite file.
+    """
+    caches = {"llm": _llm_cache, "search": _search_cache, "summary": _summary_cache}
+    hits, misses, ratios = [], [], []
+    for name, cache in caches.items():
+        if cache is None:
+            continue
+        stats = cache.stats()
+        for tier in ("memory", "disk"):
+            hits.append(("deep_research_cache_hits_total", {"cache": name, "tier": tier}, stats[f"{tier}_hits"]))
+        misses.append(("deep_research_cache_misses_total", {"cache": name}, stats["misses"]))
+        ratios.append(("deep_research_cache_hit_ratio", {"cache": name}, stats["hit_ratio"]))
+
+    limiters = [("search", "tavily", search_concurrency)] + [
+        ("llm", model, limiter) for (model, _), limiter in list(_concurrency_limiters.items())
+    ]
+    limit, in_flight, waiting = [], [], []
+    for backend, target, limiter in limiters:
+        if limiter is None:
+            continue
+        stats = limiter.stats()
+        labels = {"backend": backend, "target": target}
+        limit.append(("deep_research_concurrency_limit", labels, stats["limit"]))
+        in_flight.append(("deep_research_backend_requests_in_flight", labels, stats["in_flight"]))
+        waiting.append(("deep_research_backend_requests_waiting", labels, stats["queue_depth"]))
+
+    rate_requests, rate_wait, rate_waiting = [], [], []
+    for (model, _), limiter in list(_rate_limiters.items()):
+        stats = limiter.stats()
+        labels = {"target": model}
+        rate_requests.append(("deep_research_rate_limited_requests_total", labels, stats["requests"]))
+        rate_wait.append(("deep_research_rate_limit_wait_seconds_total", labels, stats["total_wait_seconds"]))
+        rate_waiting.append(("deep_research_rate_limit_waiting", labels, stats["queue_depth"]))
+
+    retry_stats = get_retry_policy().stats()
+    retry_totals = {
+        "deep_research_llm_calls_total": ("Logical LLM calls made through the shared retry policy.", "calls"),
+        "deep_research_llm_attempts_total": ("LLM request attempts, including retries.", "attempts"),
+        "deep_research_llm_retry_deadline_exceeded_total": ("LLM calls that stopped retrying at the retry deadline.", "deadline_exceeded"),
+    }
+    retries = [
+        ("deep_research_llm_retries_total", {"error": error}, count)
+        for error, count in retry_stats["retries"].items()
+    ]
+
+    executions, coalesced = [], []
+    for name, flight in (("search", search_flight), ("summary", summary_flight)):
+        stats = flight.stats()
+        executions.append(("deep_research_singleflight_executions_total", {"flight": name}, stats["executions"]))
+        coalesced.append(("deep_research_singleflight_coalesced_total", {"flight": name}, stats["coalesced"]))
+
+    url_stats = [url_registry.stats() for url_registry in live_url_registries()]
+    url_reuses = [
+        ("deep_research_url_registry_reuses", {"kind": kind}, sum(stats[key] for stats in url_stats))
+        for kind, key in (("reference", "references_served"), ("summary", "summaries_reused"))
+    ]
+
+    families = {
+        name: ("counter", documentation, [(name, {}, retry_stats[key])])
+        for name, (documentation, key) in retry_totals.items()
+    }
+    return {
+        **families,
+        "deep_research_cache_hits_total": ("counter", "Cache hits by cache and tier.", hits),
+        "deep_research_cache_misses_total": ("counter", "Cache misses by cache.", misses),
+        "deep_research_cache_hit_ratio": ("gauge", "Cache hit ratio since process start.", ratios),
+        "deep_research_concurrency_limit": ("gauge", "Current adaptive in-flight limit.", limit),
+        "deep_research_backend_requests_in_flight": ("gauge", "Backend requests holding a concurrency slot.", in_flight),
+        "deep_research_backend_requests_waiting": ("gauge", "Backend requests waiting for a concurrency slot.", waiting),
+        "deep_research_rate_limited_requests_total": ("counter", "LLM requests admitted by the client-side rate limiter.", rate_requests),
+        "deep_research_rate_limit_wait_seconds_total": ("counter", "Time LLM requests spent waiting for rate limit quota.", rate_wait),
+        "deep_research_rate_limit_waiting": ("gauge", "LLM requests waiting for rate limit quota.", rate_waiting),
+        "deep_research_llm_retries_total": ("counter", "LLM request retries by error class.", retries),
+        "deep_research_singleflight_executions_total": ("counter", "Requests executed by a single-flight group.", executions),
+        "deep_research_singleflight_coalesced_total": ("counter", "Requests that awaited an identical in-flight request.", coalesced),
+        "deep_research_url_registry_urls": (
+            "gauge",
+            "URLs claimed by researchers of running jobs.",
+            [("deep_research_url_registry_urls", {}, sum(stats["urls"] for stats in url_stats))],
+        ),
+        "deep_research_url_registry_reuses": ("gauge", "Sources answered from another researcher's coverage in running jobs.", url_reuses),
+    }
+
+
+registry.register_collector(_collect_backend_metrics)
+
 # ===== SEARCH FUNCTIONS =====
 
 
+async def atavily_search_multiple(
+    search_queries: List[str],
+    max_results: int = 3,
+    topic: Literal["general", "news", "finance"] = "general",
+    include_raw_content: bool = True,
+    time_range: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    bypass_cache: bool = False,
+) -> List[dict]:
+    """Perform concurrent searches using the async Tavily API.
+
+    All queries are dispatched at once, bounded by ``max_concurrency`` and
+    by the process-wide adaptive search limit.
+    Results are returned in the same order as ``search_queries``. Fresh
+    cached responses are served without a network call unless the cache
+    is bypassed, and a query already in flight elsewhere in the process is
+    awaited rather than issued again.
+
+    Args:
+        search_queries: List of search queries to execute
+        max_results: Maximum number of results per query
+        topic: Topic filter for search results
+        include_raw_content: Whether to include raw webpage content
+        time_range: Time range to filter results by ('day', 'week', 'month', 'year')
+        max_concurrency: Maximum queries in flight (defaults to SEARCH_MAX_CONCURRENCY)
+        timeout: Per-query timeout in seconds (defaults to SEARCH_QUERY_TIMEOUT)
+        bypass_cache: Skip cache reads (fresh responses are still stored)
+
+    Returns:
+        List of search result dictionaries, one per query
+    """
+    client = get_async_tavily_client()
+    semaphore = asyncio.Semaphore(max_concurrency or SEARCH_MAX_CONCURRENCY)
+    query_timeout = timeout if timeout is not None else SEARCH_QUERY_TIMEOUT
+    cache = get_search_cache()
+    ttl = search_cache_ttl(topic, time_range)
+    # Cassette sessions skip cached responses so every query is recorded/replayed
+    read_cache = not (bypass_cache or SEARCH_CACHE_BYPASS or get_cassette() is not None)
+
+    async def search_one(query: str) -> dict:
+        cache_key = search_cache_key(
+            query, max_results, topic, include_raw_content, time_range
+        )
+        if read_cache:
+            cached = await cache.aget(cache_key, ttl=ttl)
+            if cached is not None:
+                return cached
+
+        async def fetch() -> dict:
+            async with semaphore:
+                def request():
+                    return asyncio.wait_for(
+                        client.search(
+                            query,
+                            max_results=max_results,
+                            include_raw_content=include_raw_content,
+                            topic=topic,
+                            time_range=time_range,
+                        ),
+                        timeout=query_timeout,
+                    )
+
+                started = time.monotonic()
+                error = None
+                try:
+                    if search_concurrency is not None:
+                        response = await search_concurrency.run(request)
+                    else:
+                        response = await request()
+                except TimeoutError as e:
+                    error = e
+                    print(f"Tavily search timed out after {query_timeout}s for query: {query}")
+                    return {"query": query, "results": []}
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    observe_request(
+                        search_request_seconds,
+                        search_errors_total,
+                        "tavily",
+                        time.monotonic() - started,
+                        error,
+                    )
+
+            # Empty responses are not cached so a transient miss is retried next time
+            if response.get("results"):
+                await cache.aset(cache_key, response)
+            return response
+
+        return await search_flight.do(cache_key, fetch)
+
+    return list(await asyncio.gather(*(search_one(q) for q in search_queries)))
+
+
 def tavily_search_multiple(
     search_queries: List[str],
     max_results: int = 3,
     topic: Literal["general", "news", "finance"] = "general",
     include_raw_content: bool = True,
-    time_range: Optional[str] = None,
+    time_range: Optional[str] = None,
+    bypass_cache: bool = False,
 ) -> List[dict]:
     """Perform search using Tavily API for multiple queries.
 
@@ -152,26 +1039,40 @@ def tavily_search_multiple(
         max_results: Maximum number of results per query
         topic: Topic filter for search results
         include_raw_content: Whether to include raw webpage content
-        time_range: Time range to filter results by ('day', 'week', 'month', 'year')
+        time_range: Time range to filter results by ('day', 'week', 'month', 'year')
+        bypass_cache: Skip cached responses and always query Tavily
 
     Returns:
         List of search result dictionaries
     """
-    client = get_tavily_client()
-
-    # Execute searches sequentially. Note: you can use AsyncTavilyClient to parallelize this step.
-    search_docs = []
-    for query in search_queries:
-        result = client.search(
-            query,
+    # Blocking entry point; the queries themselves fan out concurrently
+    return run_sync(
+        atavily_search_multiple(
+            search_queries,
             max_results=max_results,
-            include_raw_content=include_raw_content,
             topic=topic,
-            time_range=time_range,
+            include_raw_content=include_raw_content,
+            time_range=time_range,
+            bypass_cache=bypass_cache,
         )
-        search_docs.append(result)
+    )
+
+
+def _format_summary(summary: Summary) -> str:
+    """Render a structured Summary into the tagged text consumed by researchers."""
+    return (
+        f"<summary>\n{summary.summary}\n</summary>\n\n"
+        f"<key_excerpts>\n{summary.key_excerpts}\n</key_excerpts>"
+    )
 
-    return search_docs
+
+def _truncate_for_fallback(webpage_content: str) -> str:
+    """Return the leading slice of a page used when summarization fails."""
+    return (
+        webpage_content[:1000] + "..."
+        if len(webpage_content) > 1000
+        else webpage_content
+    )
 
 
 def summarize_webpage_content(webpage_content: str) -> str:
@@ -183,85 +1084,246 @@ def summarize_webpage_content(webpage_content: str) -> str:
     Returns:
         Formatted summary with key excerpts
     """
-    # Retry loop to handle transient nextgen/ICA gateway errors
-    structured_model = get_summarization_model().with_structured_output(Summary)
-    summary = None
-    for attempt in range(1, 4):
-        try:
-            summary = structured_model.invoke(
-                [
-                    HumanMessage(
-                        content=summarize_webpage_prompt.format(
-                            webpage_content=webpage_content, date=get_today_str()
-                        )
-                    )
-                ]
+    return run_sync(asummarize_webpage_content(webpage_content))
+
+
+async def _ainvoke_summary(prompt: str, deadline: float) -> Summary:
+    """Request a structured Summary within ``deadline`` seconds.
+
+    Transient errors are retried by the model's policy inside the deadline.
+    """
+    structured_model = (
+        get_summarization_model().with_structured_output(Summary).with_cache("summarize")
+    )
+    return await asyncio.wait_for(
+        structured_model.ainvoke([HumanMessage(content=prompt)]), timeout=deadline
+    )
+
+
+async def _amap_reduce_summary(webpage_content: str, deadline: float) -> Summary:
+    """Summarize a long page by summarizing its chunks concurrently and merging them.
+
+    Each chunk call and the merge get their own ``deadline``, so the page
+    budget grows with the number of chunks. Chunks that fail or time out are
+    left out of the merge; if the merge itself fails, the chunk summaries are
+    concatenated instead.
+
+    Args:
+        webpage_content: Raw webpage content longer than SUMMARY_CHUNK_SIZE
+        deadline: Deadline in seconds for each summary call
+
+    Returns:
+        Summary covering the parts of the page that could be summarized
+
+    Raises:
+        RuntimeError: If no chunk could be summarized
+    """
+    chunks = split_into_chunks(webpage_content, SUMMARY_CHUNK_SIZE)
+    semaphore = asyncio.Semaphore(SUMMARY_CHUNK_CONCURRENCY)
+
+    async def summarize_chunk(chunk: str) -> Summary:
+        async with semaphore:
+            return await _ainvoke_summary(
+                summarize_webpage_prompt.format(
+                    webpage_content=chunk, date=get_today_str()
+                ),
+                deadline,
             )
-            break
-        except Exception as e:
-            print(f"Webpage summarization attempt {attempt} failed: {e}")
-            if attempt == 3:
-                print(f"Failed to summarize webpage after 3 attempts: {str(e)}")
-                return (
-                    webpage_content[:1000] + "..."
-                    if len(webpage_content) > 1000
-                    else webpage_content
-                )
-            time.sleep(2)
 
-    # Format summary with clear structure
-    formatted_summary = (
-        f"<summary>\n{summary.summary}\n</summary>\n\n"
-        f"<key_excerpts>\n{summary.key_excerpts}\n</key_excerpts>"
+    results = await asyncio.gather(
+        *(summarize_chunk(chunk) for chunk in chunks), return_exceptions=True
+    )
+    partials = [result for result in results if isinstance(result, Summary)]
+    if len(partials) < len(results):
+        failed = next(r for r in results if not isinstance(r, Summary))
+        print(
+            f"Failed to summarize {len(results) - len(partials)} of {len(results)} "
+            f"chunks: {failed!r}"
+        )
+    if not partials:
+        raise RuntimeError(f"all {len(results)} chunks failed to summarize")
+    if len(partials) == 1:
+        return partials[0]
+
+    section_summaries = "\n\n".join(
+        f'<section index="{i}">\n{_format_summary(partial)}\n</section>'
+        for i, partial in enumerate(partials, 1)
     )
+    try:
+        return await _ainvoke_summary(
+            reduce_webpage_summaries_prompt.format(
+                section_summaries=section_summaries, date=get_today_str()
+            ),
+            deadline,
+        )
+    except Exception as e:
+        print(f"Failed to merge chunk summaries, concatenating them: {e!r}")
+        return Summary(
+            summary="\n\n".join(partial.summary for partial in partials),
+            key_excerpts="\n\n".join(partial.key_excerpts for partial in partials),
+        )
 
-    return formatted_summary
 
+async def asummarize_webpage_content(
+    webpage_content: str, deadline: Optional[float] = None
+) -> str:
+    """Summarize webpage content without blocking the event loop.
 
-def deduplicate_search_results(search_results: List[dict]) -> dict:
-    """Deduplicate search results by URL to avoid processing duplicate content.
+    Pages longer than SUMMARY_CHUNK_SIZE are summarized map-reduce style
+    when SUMMARY_CHUNKING is enabled, so latency scales with chunk
+    parallelism rather than page length.
 
     Args:
-        search_results: List of search result dictionaries
+        webpage_content: Raw webpage content to summarize
+        deadline: Deadline in seconds for each summary call (defaults to SUMMARY_CALL_DEADLINE)
 
     Returns:
-        Dictionary mapping URLs to unique results
+        Formatted summary with key excerpts
     """
-    unique_results = {}
+    summary = await _asummarize_page(webpage_content, deadline)
+    return summary if summary is not None else _truncate_for_fallback(webpage_content)
+
+
+async def _asummarize_page(
+    webpage_content: str, deadline: Optional[float] = None
+) -> Optional[str]:
+    """Return the formatted (possibly cached) summary of a page, or None if it failed."""
+    deadline = deadline if deadline is not None else SUMMARY_CALL_DEADLINE
+    cache = get_summary_cache()
+    cache_key = summary_cache_key(webpage_content)
+    # Cassette sessions skip cached summaries so every summary call is recorded/replayed
+    read_cache = not (SUMMARY_CACHE_BYPASS or get_cassette() is not None)
+    cached = await cache.aget(cache_key) if read_cache else None
+    if cached is not None:
+        return cached
 
-    for response in search_results:
-        for result in response["results"]:
-            url = result["url"]
-            if url not in unique_results:
-                unique_results[url] = result
+    try:
+        if SUMMARY_CHUNKING and len(webpage_content) > SUMMARY_CHUNK_SIZE:
+            summary = await _amap_reduce_summary(webpage_content, deadline)
+        else:
+            summary = await _ainvoke_summary(
+                summarize_webpage_prompt.format(
+                    webpage_content=webpage_content, date=get_today_str()
+                ),
+                deadline,
+            )
+    except Exception as e:
+        print(f"Failed to summarize webpage: {e!r}")
+        return None
 
-    return unique_results
+    # Format summary with clear structure; failures above are never cached
+    formatted_summary = _format_summary(summary)
+    await cache.aset(cache_key, formatted_summary)
+    return formatted_summary
 
 
-def process_search_results(unique_results: dict) -> dict:
-    """Process search results by summarizing content where available.
+def deduplicate_search_results(search_results: List[dict]) -> dict:
+    """Deduplicate search results to avoid processing duplicate content.
+
+    URLs are compared in canonical form (tracking parameters, scheme, trailing
+    slashes and AMP/mobile variants removed), and pages whose bodies are
+    near-duplicates of an earlier result are dropped. Collapsed results are
+    counted in the ``deep_research_duplicates_collapsed_total`` metric.
+
+    Args:
+        search_results: List of search result dictionaries
+
+    Returns:
+        Dictionary mapping URLs to unique results
+    """
+    return collapse_duplicates(search_results)
+
+
+async def aprocess_search_results(
+    unique_results: dict,
+    max_concurrency: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> dict:
+    """Summarize all pages of a search concurrently.
+
+    Pages with raw content are summarized in parallel, bounded by
+    ``max_concurrency``; pages already in the summary cache skip the LLM.
+    A page whose summary does not finish within ``deadline`` seconds, or
+    fails, falls back to the Tavily ``content`` snippet; within that budget
+    each summary call (one per chunk of a long page, plus the merge) has its
+    own SUMMARY_CALL_DEADLINE. Within a
+    research job, URLs another researcher already summarized are answered
+    from the job's URL registry instead of being summarized again; only
+    real summaries are recorded there.
+    The returned mapping preserves the URL order of ``unique_results``.
 
     Args:
         unique_results: Dictionary of unique search results
+        max_concurrency: Maximum summaries in flight (defaults to SUMMARY_MAX_CONCURRENCY)
+        deadline: Per-page summary deadline in seconds (defaults to SUMMARY_DEADLINE)
 
     Returns:
         Dictionary of processed results with summaries
     """
-    summarized_results = {}
+    semaphore = asyncio.Semaphore(max_concurrency or SUMMARY_MAX_CONCURRENCY)
+    page_deadline = deadline if deadline is not None else SUMMARY_DEADLINE
+    registry = get_url_registry()
+    researcher = current_researcher.get()
+
+    async def process_one(url: str, result: dict) -> str:
+        canonical = canonicalize_url(url)
+        if registry is not None:
+            covered = registry.lookup(canonical, result["title"], researcher)
+            if covered is not None:
+                return covered
 
-    for url, result in unique_results.items():
         # Use existing content if no raw content for summarization
         if not result.get("raw_content"):
-            content = result["content"]
-        else:
-            # Summarize raw content for better processing
-            content = summarize_webpage_content(
-                result["raw_content"][:MAX_CONTEXT_LENGTH]
+            return result["content"]
+
+        # Strip boilerplate before the length cap so it does not eat the budget;
+        # cleaning long pages is CPU-bound, so it runs off the event loop
+        cleaned = await asyncio.to_thread(clean_page_text, result["raw_content"])
+        webpage_content = cleaned[:SUMMARY_INPUT_LIMIT]
+        try:
+            summary = await asyncio.wait_for(
+                summarize_one(webpage_content), timeout=page_deadline
+            )
+        except TimeoutError:
+            print(f"Summary for {url} exceeded {page_deadline}s, using search snippet")
+            return result["content"]
+        if summary is None:
+            return result["content"]
+        # Only a real summary claims the URL; snippets and fallbacks leave it
+        # for a researcher that can summarize it
+        if registry is not None:
+            registry.record(canonical, summary, researcher)
+        return summary
+
+    async def summarize_one(webpage_content: str) -> Optional[str]:
+        async with semaphore:
+            # Identical pages being summarized by another researcher are awaited, not redone
+            return await summary_flight.do(
+                summary_cache_key(webpage_content),
+                lambda: _asummarize_page(webpage_content),
             )
 
-        summarized_results[url] = {"title": result["title"], "content": content}
+    items = list(unique_results.items())
+    contents = await asyncio.gather(
+        *(process_one(url, result) for url, result in items)
+    )
+
+    return {
+        url: {"title": result["title"], "content": content}
+        for (url, result), content in zip(items, contents)
+    }
+
+
+def process_search_results(unique_results: dict) -> dict:
+    """Process search results by summarizing content where available.
+
+    Args:
+        unique_results: Dictionary of unique search results
 
-    return summarized_results
+    Returns:
+        Dictionary of processed results with summaries
+    """
+    return run_sync(aprocess_search_results(unique_results))
 
 
 def format_search_output(summarized_results: dict) -> str:
@@ -290,14 +1352,13 @@ def format_search_output(summarized_results: dict) -> str:
 # ===== RESEARCH TOOLS =====
 
 
-@tool(parse_docstring=True)
-def tavily_search(
+def _tavily_search(
     query: str,
     max_results: Annotated[int, InjectedToolArg] = 3,
     topic: Annotated[
         Literal["general", "news", "finance"], InjectedToolArg
     ] = "general",
-    time_range: Optional[Literal["day", "week", "month", "year"]] = None,
+    time_range: Optional[Literal["day", "week", "month", "year"]] = None,
 ) -> str:
     """Fetch results from Tavily search API with content summarization.
 
@@ -305,7 +1366,7 @@ def tavily_search(
         query: A single search query to execute
         max_results: Maximum number of results to return
         topic: Topic to filter results by ('general', 'news', 'finance')
-        time_range: Optional time range to filter results by ('day', 'week', 'month', 'year')
+        time_range: Optional time range to filter results by ('day', 'week', 'month', 'year')
 
     Returns:
         Formatted string of search results with summaries
@@ -316,12 +1377,15 @@ def tavily_search(
         max_results=max_results,
         topic=topic,
         include_raw_content=True,
-        time_range=time_range,
+        time_range=time_range,
     )
 
     # Deduplicate results by URL to avoid processing duplicate content
     unique_results = deduplicate_search_results(search_results)
 
+    # Only summarize the pages most relevant to the query
+    unique_results = select_for_summarization(query, unique_results)
+
     # Process results with summarization
     summarized_results = process_search_results(unique_results)
 
@@ -329,6 +1393,39 @@ def tavily_search(
     return format_search_output(summarized_results)
 
 
+async def _atavily_search(
+    query: str,
+    max_results: int = 3,
+    topic: Literal["general", "news", "finance"] = "general",
+    time_range: Optional[Literal["day", "week", "month", "year"]] = None,
+) -> str:
+    """Async implementation of the tavily_search tool."""
+    search_results = await atavily_search_multiple(
+        [query],
+        max_results=max_results,
+        topic=topic,
+        include_raw_content=True,
+        time_range=time_range,
+    )
+
+    # Fingerprinting and ranking whole pages is CPU-bound; keep it off the event loop
+    unique_results = await asyncio.to_thread(deduplicate_search_results, search_results)
+    unique_results = await asyncio.to_thread(select_for_summarization, query, unique_results)
+
+    summarized_results = await aprocess_search_results(unique_results)
+
+    return format_search_output(summarized_results)
+
+
+# Sync and async implementations share one schema, parsed from the sync docstring
+tavily_search = StructuredTool.from_function(
+    func=_tavily_search,
+    coroutine=_atavily_search,
+    name="tavily_search",
+    parse_docstring=True,
+)
+
+
 @tool(parse_docstring=True)
 def think_tool(reflection: str) -> str:
     """Tool for strategic reflection on research progress and decision-making.
@@ -357,8 +1454,7 @@ def think_tool(reflection: str) -> str:
     return f"Reflection recorded: {reflection}"
 
 
-@tool(parse_docstring=True)
-def refine_draft_report(
+def _refine_draft_report(
     research_brief: Annotated[str, InjectedToolArg],
     findings: Annotated[str, InjectedToolArg],
     draft_report: Annotated[str, InjectedToolArg],
@@ -387,24 +1483,53 @@ def refine_draft_report(
     )
 
     writer_model = get_writer_model()
-    
-    # Retry loop to handle transient nextgen/ICA gateway errors
-    draft_report_msg = None
-    for attempt in range(1, 4):
-        try:
-            draft_report_msg = writer_model.invoke([HumanMessage(content=draft_report_prompt)])
-            break
-        except Exception as e:
-            print(f"Refining draft report attempt {attempt} failed: {e}")
-            if attempt == 3:
-                raise e
-            time.sleep(2)
+
+    # Transient nextgen/ICA gateway errors are retried by the model's retry policy
+    draft_report_msg = writer_model.invoke([HumanMessage(content=draft_report_prompt)])
 
     return draft_report_msg.content
 
 
-@tool(parse_docstring=True)
-def fetch_pdf_content(pdf_url: str) -> str:
+async def _arefine_draft_report(
+    research_brief: str,
+    findings: str,
+    draft_report: str,
+):
+    """Async implementation of the refine_draft_report tool."""
+    if not findings or not findings.strip():
+        return draft_report
+
+    draft_report_prompt = report_generation_with_draft_insight_prompt.format(
+        research_brief=research_brief,
+        findings=findings,
+        draft_report=draft_report,
+        date=get_today_str(),
+    )
+
+    writer_model = get_writer_model()
+
+    # Transient nextgen/ICA gateway errors are retried by the model's retry policy
+    draft_report_msg = await writer_model.ainvoke([HumanMessage(content=draft_report_prompt)])
+
+    return draft_report_msg.content
+
+
+refine_draft_report = StructuredTool.from_function(
+    func=_refine_draft_report,
+    coroutine=_arefine_draft_report,
+    name="refine_draft_report",
+    parse_docstring=True,
+)
+
+
+# Browser-like agent; some filing sites reject the default Python user agent
+PDF_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+# Timeout after 25 seconds to prevent hanging
+PDF_DOWNLOAD_TIMEOUT = 25
+PDF_MAX_PAGES = 10
+
+
+def _fetch_pdf_content(pdf_url: str) -> str:
     """Download a PDF file from a URL and extract its text content.
 
     This tool is critical for extracting raw, precise numbers, dates, tables, and statistics
@@ -416,30 +1541,99 @@ def fetch_pdf_content(pdf_url: str) -> str:
     Returns:
         A structured string containing the extracted text from the PDF pages, or an error message.
     """
-    import io
+    if SEARCH_BACKEND == "fake":
+        from deep_research.fake_backends import fake_pdf_text
+
+        return fake_pdf_text(pdf_url)
+
+    cassette = get_cassette()
+    if cassette is None:
+        return _fetch_pdf_text(pdf_url)
+    return cassette.call(
+        "pdf", content_hash(pdf_url), "pdf", lambda: _fetch_pdf_text(pdf_url)
+    )
+
+
+async def _afetch_pdf_content(pdf_url: str) -> str:
+    """Async implementation of the fetch_pdf_content tool."""
+    if SEARCH_BACKEND == "fake":
+        from deep_research.fake_backends import fake_pdf_text
+
+        return fake_pdf_text(pdf_url)
+
+    cassette = get_cassette()
+    if cassette is None:
+        return await _afetch_pdf_text(pdf_url)
+    return await cassette.acall(
+        "pdf", content_hash(pdf_url), "pdf", lambda: _afetch_pdf_text(pdf_url)
+    )
+
+
+fetch_pdf_content = StructuredTool.from_function(
+    func=_fetch_pdf_content,
+    coroutine=_afetch_pdf_content,
+    name="fetch_pdf_content",
+    parse_docstring=True,
+)
+
+
+def _fetch_pdf_text(pdf_url: str) -> str:
+    """Download a PDF and extract the text of its first pages (see ``fetch_pdf_content``)."""
     import urllib.request
     import ssl
-    from pypdf import PdfReader
 
+    started = time.monotonic()
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-        req = urllib.request.Request(pdf_url, headers=headers)
-        # Timeout after 25 seconds to prevent hanging
+        req = urllib.request.Request(pdf_url, headers={"User-Agent": PDF_USER_AGENT})
         # Use unverified SSL context to bypass proxy/certificate verification errors
         context = ssl._create_unverified_context()
-        with urllib.request.urlopen(req, timeout=25, context=context) as response:
+        with urllib.request.urlopen(req, timeout=PDF_DOWNLOAD_TIMEOUT, context=context) as response:
             pdf_data = response.read()
     except Exception as e:
+        observe_request(
+            search_request_seconds, search_errors_total, "pdf", time.monotonic() - started, e
+        )
+        return f"Error downloading PDF from {pdf_url}: {e}"
+    observe_request(search_request_seconds, search_errors_total, "pdf", time.monotonic() - started)
+
+    return _extract_pdf_text(pdf_data)
+
+
+async def _afetch_pdf_text(pdf_url: str) -> str:
+    """Async variant of ``_fetch_pdf_text``; parsing runs off the event loop."""
+    import httpx
+
+    started = time.monotonic()
+    try:
+        # Certificate verification is skipped for the same reason as the sync path
+        async with httpx.AsyncClient(
+            verify=False, follow_redirects=True, timeout=PDF_DOWNLOAD_TIMEOUT
+        ) as client:
+            response = await client.get(pdf_url, headers={"User-Agent": PDF_USER_AGENT})
+            response.raise_for_status()
+            pdf_data = response.content
+    except Exception as e:
+        observe_request(
+            search_request_seconds, search_errors_total, "pdf", time.monotonic() - started, e
+        )
         return f"Error downloading PDF from {pdf_url}: {e}"
+    observe_request(search_request_seconds, search_errors_total, "pdf", time.monotonic() - started)
+
+    # pypdf extraction is CPU-bound
+    return await asyncio.to_thread(_extract_pdf_text, pdf_data)
+
+
+def _extract_pdf_text(pdf_data: bytes) -> str:
+    """Extract the text of the first ``PDF_MAX_PAGES`` pages of a PDF document."""
+    import io
+    from pypdf import PdfReader
 
     try:
         reader = PdfReader(io.BytesIO(pdf_data))
         num_pages = len(reader.pages)
         
         extracted_text = []
-        max_pages_to_extract = 10
+        max_pages_to_extract = PDF_MAX_PAGES
         pages_to_read = min(num_pages, max_pages_to_extract)
         
         for i in range(pages_to_read):
@@ -0,0 +1,14 @@
+import os
+
+# Run every test offline against the synthetic backends, without disk caches.
+# Set before any deep_research module reads its configuration at import time.
+os.environ.update(
+    LLM_BACKEND="fake",
+    SEARCH_BACKEND="fake",
+    FAKE_LLM_LATENCY="fixed:0",
+    FAKE_SEARCH_LATENCY="fixed:0",
+    LLM_CACHE_PATH="",
+    SEARCH_CACHE_PATH="",
+    SUMMARY_CACHE_PATH="",
+)
+os.environ.pop("CASSETTE_MODE", None)
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from deep_research.cache import LRUCache, SQLiteCache, TieredCache, content_hash
+
+# ===== LRUCache =====
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_ttl_expires_entries():
+    cache = LRUCache()
+    cache.set("fresh", 1)
+    cache.set("stale", 2, created_at=time.time() - 100)
+    assert cache.get("fresh", ttl=50) == 1
+    assert cache.get("stale", ttl=50) is None
+    # Expired entries are dropped, not just hidden
+    assert cache.get("stale") is None
+
+
+# ===== SQLiteCache =====
+
+
+def test_sqlite_round_trip_and_reopen(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = SQLiteCache(str(path), ttl=60)
+    cache.set("key", {"value": [1, 2]})
+    cache.close()
+    assert SQLiteCache(str(path), ttl=60).get("key") == {"value": [1, 2]}
+
+
+def test_sqlite_ttl(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    # A shorter per-lookup TTL applies too
+    assert cache.get("key", ttl=-1) is None
+
+    cache.set("key", "value")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get("key") is None
+
+
+def test_sqlite_evicts_oldest_past_max_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=60, max_entries=3)
+    for i in range(5):
+        cache.set(f"k{i}", i)
+    assert [cache.get(f"k{i}") for i in range(5)] == [None, None, 2, 3, 4]
+
+
+# ===== TieredCache =====
+
+
+def test_tiered_promotes_disk_hits_without_extending_ttl(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    disk.set("key", "value")
+    cache = TieredCache(LRUCache(), disk)
+
+    assert cache.get("key") == "value"
+    _, created_at = cache.memory._data["key"]
+    assert created_at == disk.get_entry("key")[1]
+    assert cache.get("key") == "value"
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_tiered_async_api(tmp_path):
+    cache = TieredCache(LRUCache(), SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=60))
+
+    async def round_trip():
+        await cache.aset("key", "value")
+        cache.memory = LRUCache()
+        return await cache.aget("key"), await cache.aget("missing")
+
+    assert asyncio.run(round_trip()) == ("value", None)
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("a", "b") == content_hash("a", "b")
@@ -0,0 +1,75 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from deep_research.cassettes import Cassette, CassetteMissError
+from deep_research.utils import _serialize_model_input
+
+
+def record(path, *calls):
+    cassette = Cassette(str(path), "record")
+    for key, group, response in calls:
+        cassette.call("llm", key, group, lambda response=response: response)
+    return Cassette(str(path), "replay")
+
+
+def test_rewind_serves_the_recordings_again(tmp_path):
+    cassette = record(tmp_path / "c.jsonl", ("k1", "model", "one"), ("k2", "model", "two"))
+    assert cassette.call("llm", "k1", "model", None) == "one"
+    assert cassette.call("llm", "k2", "model", None) == "two"
+    with pytest.raises(CassetteMissError):
+        cassette.call("llm", "k1", "model", None)
+
+    cassette.rewind()
+    assert cassette.call("llm", "k1", "model", None) == "one"
+    assert cassette.call("llm", "k2", "model", None) == "two"
+
+
+def test_exact_matches_are_served_in_recording_order(tmp_path):
+    cassette = record(
+        tmp_path / "c.jsonl",
+        ("same", "model", "first"),
+        ("other", "model", "other"),
+        ("same", "model", "second"),
+    )
+    assert cassette.call("llm", "same", "model", None) == "first"
+    assert cassette.call("llm", "same", "model", None) == "second"
+    assert cassette.call("llm", "other", "model", None) == "other"
+    assert cassette.stats()["exact_hits"] == 3
+
+
+def test_unmatched_requests_fall_back_within_their_group(tmp_path):
+    cassette = record(
+        tmp_path / "c.jsonl",
+        ("k1", "model-a", "a1"),
+        ("k2", "model-b", "b1"),
+        ("k3", "model-a", "a2"),
+    )
+    # k3 is matched exactly, so the changed request takes the oldest unused a-recording
+    assert cassette.call("llm", "k3", "model-a", None) == "a2"
+    assert cassette.call("llm", "changed", "model-a", None) == "a1"
+    with pytest.raises(CassetteMissError):
+        cassette.call("llm", "changed", "model-a", None)
+    assert cassette.call("llm", "k2", "model-b", None) == "b1"
+    assert cassette.stats() == {
+        "mode": "replay",
+        "recorded": 0,
+        "exact_hits": 2,
+        "fallback_hits": 1,
+        "misses": 1,
+    }
+
+
+def test_recording_date_is_replayed(tmp_path):
+    path = tmp_path / "c.jsonl"
+    path.write_text(
+        '{"kind": "session", "date": "2024-03-01"}\n'
+        '{"kind": "llm", "key": "k", "group": "g", "latency": 0, "response": "r"}\n'
+    )
+    assert str(Cassette(str(path), "replay").today) == "2024-03-01"
+
+
+def test_request_keys_ignore_message_ids():
+    first = [HumanMessage(content="hi", id="a"), AIMessage(content="hello", id="b")]
+    second = [HumanMessage(content="hi", id="c"), AIMessage(content="hello", id="d")]
+    assert _serialize_model_input(first) == _serialize_model_input(second)
+    assert _serialize_model_input(first) != _serialize_model_input([HumanMessage(content="bye")])
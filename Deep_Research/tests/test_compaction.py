@@ -0,0 +1,76 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from deep_research.compaction import compact_history, digest_tool_output
+
+
+def search_output(n_sources, summary_words=400):
+    blocks = [
+        f"\n\n--- SOURCE {i}: Title {i} ---\nURL: https://example.com/{i}\n\n"
+        f"SUMMARY:\n<summary>\n{'finding ' * summary_words}\n</summary>\n\n"
+        + "-" * 80
+        + "\n"
+        for i in range(1, n_sources + 1)
+    ]
+    return "Search results: \n\n" + "".join(blocks)
+
+
+def tool_round(i):
+    call = {"name": "tavily_search", "args": {"query": f"q{i}"}, "id": f"call_{i}"}
+    return [
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=search_output(3), name="tavily_search", tool_call_id=f"call_{i}"),
+    ]
+
+
+def history(rounds):
+    messages = [HumanMessage(content="topic")]
+    for i in range(rounds):
+        messages.extend(tool_round(i))
+    return messages
+
+
+def test_history_under_budget_is_unchanged():
+    messages = history(2)
+    assert compact_history(messages, max_tokens=10**6) == messages
+
+
+def test_zero_budget_disables_compaction():
+    messages = history(5)
+    assert compact_history(messages, max_tokens=0) == messages
+
+
+def test_oldest_outputs_are_compacted_first_and_latest_round_kept():
+    messages = history(5)
+    compacted = compact_history(messages, max_tokens=3000)
+
+    assert len(compacted) == len(messages)
+    tool_indexes = [i for i, m in enumerate(messages) if isinstance(m, ToolMessage)]
+    assert compacted[tool_indexes[0]].content.startswith("[Compacted tavily_search output")
+    # The newest results are always shown in full
+    assert compacted[tool_indexes[-1]] is messages[tool_indexes[-1]]
+    # Non-tool messages are never rewritten
+    for original, new in zip(messages, compacted):
+        if not isinstance(original, ToolMessage):
+            assert new is original
+
+
+def test_compaction_does_not_modify_input():
+    messages = history(5)
+    contents = [m.content for m in messages]
+    compact_history(messages, max_tokens=3000)
+    assert [m.content for m in messages] == contents
+
+
+def test_compaction_is_stable_across_turns():
+    messages = history(5)
+    first = compact_history(messages, max_tokens=3000)
+    second = compact_history(messages, max_tokens=3000)
+    assert [m.content for m in first] == [m.content for m in second]
+
+
+def test_digest_lists_each_source():
+    message = ToolMessage(content=search_output(3), name="tavily_search", tool_call_id="c")
+    digest = digest_tool_output(message)
+    for i in range(1, 4):
+        assert f"Title {i} (https://example.com/{i})" in digest
+    assert len(digest) < len(message.content)
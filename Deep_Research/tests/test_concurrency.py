@@ -0,0 +1,263 @@
+import asyncio
+
+import pytest
+
+from deep_research.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    EventLoopBlockedError,
+    RateLimiter,
+    SingleFlight,
+    TokenBucket,
+)
+
+
+# ===== AdaptiveConcurrencyLimiter =====
+
+
+class Overloaded(Exception):
+    pass
+
+
+def limiter(initial=4, **kwargs):
+    return AdaptiveConcurrencyLimiter(
+        initial, is_overload=lambda error: isinstance(error, Overloaded), **kwargs
+    )
+
+
+async def ok():
+    return "ok"
+
+
+async def overloaded():
+    raise Overloaded()
+
+
+def test_never_exceeds_the_limit():
+    lim = limiter(initial=3)
+    over_limit = []
+
+    async def call():
+        stats = lim.stats()
+        if stats["in_flight"] > stats["limit"]:
+            over_limit.append(stats)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(lim.run(call) for _ in range(20)))
+
+    asyncio.run(main())
+    assert over_limit == []
+    assert lim.stats()["in_flight"] == 0
+
+
+def test_overload_halves_the_limit_once_per_window():
+    lim = limiter(initial=16, min_limit=2)
+
+    async def main():
+        # Prime the latency estimate so decreases are spaced
+        lim._latency = 60.0
+        for _ in range(3):
+            with pytest.raises(Overloaded):
+                await lim.run(overloaded)
+
+    asyncio.run(main())
+    assert lim.stats()["limit"] == 8
+    assert lim.stats()["overloads"] == 3
+    assert lim.stats()["decreases"] == 1
+
+
+def test_limit_never_drops_below_minimum():
+    lim = limiter(initial=4, min_limit=2)
+
+    async def main():
+        for _ in range(5):
+            with pytest.raises(Overloaded):
+                await lim.run(overloaded)
+
+    asyncio.run(main())
+    assert lim.stats()["limit"] == 2
+
+
+def test_grows_only_while_saturated():
+    lim = limiter(initial=2, max_limit=8)
+
+    async def main():
+        # One call at a time never fills the two slots
+        for _ in range(20):
+            await lim.run(ok)
+        idle_limit = lim.stats()["limit"]
+
+        async def busy():
+            await asyncio.sleep(0.005)
+
+        for _ in range(20):
+            await asyncio.gather(*(lim.run(busy) for _ in range(lim.stats()["limit"])))
+        return idle_limit
+
+    assert asyncio.run(main()) == 2
+    assert lim.stats()["limit"] > 2
+    assert lim.stats()["limit"] <= 8
+
+
+def test_non_overload_errors_do_not_shrink_the_limit():
+    lim = limiter(initial=4)
+
+    async def fails():
+        raise ValueError("bad request")
+
+    async def main():
+        with pytest.raises(ValueError):
+            await lim.run(fails)
+
+    asyncio.run(main())
+    assert lim.stats()["limit"] == 4
+
+
+def test_cancelled_waiter_gives_back_its_slot():
+    lim = limiter(initial=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+
+        holder = asyncio.create_task(lim.run(hold))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(lim.run(ok))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await lim.run(ok)
+
+    assert asyncio.run(main()) == "ok"
+    assert lim.stats()["in_flight"] == 0
+
+
+def test_sync_acquire_fails_fast_on_a_running_loop():
+    lim = limiter(initial=1)
+
+    async def main():
+        await lim.acquire()
+        with pytest.raises(EventLoopBlockedError):
+            lim.run_sync(lambda: "ok")
+
+    asyncio.run(main())
+
+
+# ===== SingleFlight =====
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = []
+
+    async def work():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(started) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_distinct_keys_and_later_calls_run_afresh():
+    flight = SingleFlight()
+
+    async def main():
+        first = await asyncio.gather(flight.do("a", ok), flight.do("b", ok))
+        second = await flight.do("a", ok)
+        return first, second
+
+    assert asyncio.run(main()) == (["ok", "ok"], "ok")
+    assert flight.stats()["executions"] == 3
+
+
+def test_errors_reach_every_waiter_and_release_the_key():
+    flight = SingleFlight()
+
+    async def fails():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        results = await asyncio.gather(
+            *(flight.do("key", fails) for _ in range(3)), return_exceptions=True
+        )
+        return results, await flight.do("key", ok)
+
+    results, retry = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retry == "ok"
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_work():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        impatient = asyncio.create_task(flight.do("key", slow))
+        patient = asyncio.create_task(flight.do("key", slow))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(main()) == "done"
+
+
+# ===== RateLimiter =====
+
+
+def test_token_bucket_serves_a_burst_then_spaces_requests():
+    bucket = TokenBucket(rate_per_minute=60)
+    assert [bucket.reserve(1) for _ in range(60)] == [0.0] * 60
+    waits = [bucket.reserve(1) for _ in range(3)]
+    # Requests past the burst queue up one refill interval apart
+    assert waits == pytest.approx([1.0, 2.0, 3.0], abs=0.05)
+
+
+def test_token_bucket_caps_oversized_reservations():
+    bucket = TokenBucket(rate_per_minute=600)
+    assert bucket.reserve(10_000) == 0.0
+    assert bucket.reserve(10) == pytest.approx(1.0, abs=0.05)
+
+
+def test_rate_limiter_waits_for_the_tighter_bucket():
+    limiter = RateLimiter(rpm=6000, tpm=600)
+
+    async def main():
+        await limiter.acquire(tokens=600)
+        return await limiter.acquire(tokens=6)
+
+    waited = asyncio.run(main())
+    assert waited == pytest.approx(0.6, abs=0.1)
+    stats = limiter.stats()
+    assert (stats["requests"], stats["estimated_tokens"]) == (2, 606)
+    assert stats["max_wait_seconds"] == pytest.approx(0.6, abs=0.1)
+    assert stats["queue_depth"] == 0
+
+
+def test_disabled_rate_limiter_never_waits():
+    limiter = RateLimiter()
+    assert all(limiter.acquire_sync(tokens=10**6) == 0.0 for _ in range(100))
+
+
+def test_sync_rate_limit_fails_fast_on_a_running_loop():
+    limiter = RateLimiter(rpm=1)
+
+    async def main():
+        await limiter.acquire()
+        with pytest.raises(EventLoopBlockedError):
+            limiter.acquire_sync()
+
+    asyncio.run(main())
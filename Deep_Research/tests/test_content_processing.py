@@ -0,0 +1,230 @@
+import pytest
+
+from deep_research.content_processing import (
+    bm25_scores,
+    canonicalize_url,
+    clean_page_text,
+    collapse_duplicates,
+    page_chars_saved,
+    select_for_summarization,
+    split_into_chunks,
+)
+
+# ===== canonicalize_url =====
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "https://example.com/article",
+        "http://example.com/article",
+        "https://www.example.com/article/",
+        "https://m.example.com/article",
+        "https://EXAMPLE.com/article#section-2",
+        "https://example.com:443/article",
+        "https://example.com/article?utm_source=x&utm_medium=y",
+        "https://example.com/article?fbclid=abc&gclid=def",
+        "https://example.com/amp/article",
+        "https://example.com/article/amp",
+        "https://example.com//article",
+    ],
+)
+def test_canonicalize_url_collapses_variants(variant):
+    assert canonicalize_url(variant) == "https://example.com/article"
+
+
+def test_canonicalize_url_sorts_and_keeps_meaningful_params():
+    assert (
+        canonicalize_url("https://example.com/search?q=solar&page=2&utm_campaign=z")
+        == "https://example.com/search?page=2&q=solar"
+    )
+
+
+def test_canonicalize_url_keeps_distinct_pages_apart():
+    assert canonicalize_url("https://example.com/a") != canonicalize_url("https://example.com/b")
+    assert canonicalize_url("https://example.com:8080/a") == "https://example.com:8080/a"
+    assert canonicalize_url("https://example.com/index.html") == "https://example.com"
+
+
+def test_canonicalize_url_keeps_mirror_like_domains():
+    assert canonicalize_url("https://amp.dev/documentation") == "https://amp.dev/documentation"
+    assert canonicalize_url("https://m.dev/documentation") == "https://m.dev/documentation"
+    assert canonicalize_url("https://www.amp.dev/documentation") == "https://amp.dev/documentation"
+
+
+def test_canonicalize_url_keeps_ref_as_content_param():
+    assert canonicalize_url("https://git.example.com/compare?ref=main") == "https://git.example.com/compare?ref=main"
+    assert canonicalize_url("https://example.com/a?ref=main") != canonicalize_url("https://example.com/a?ref=dev")
+
+
+def test_canonicalize_url_leaves_non_urls_alone():
+    assert canonicalize_url("  not a url  ") == "not a url"
+
+
+# ===== collapse_duplicates =====
+
+
+def article(n, words=300):
+    return " ".join(f"w{n}x{i}" for i in range(words))
+
+
+def response(*results):
+    return {"results": [{"url": url, "title": url, "content": "snippet", "raw_content": raw} for url, raw in results]}
+
+
+def test_url_variants_and_near_duplicate_bodies_collapse_to_the_first():
+    body = article(1)
+    syndicated = "Reposted from the wire. " + body + " Share this story."
+    results = [
+        response(("https://news.com/story?utm_source=x", body), ("https://other.com/a", article(2))),
+        response(("https://www.news.com/story", article(3)), ("https://mirror.net/copy", syndicated)),
+    ]
+    unique = collapse_duplicates(results)
+    assert list(unique) == ["https://news.com/story?utm_source=x", "https://other.com/a"]
+
+
+def test_distinct_bodies_and_snippet_only_results_are_kept():
+    results = [
+        response(("https://a.com", article(1)), ("https://b.com", article(2)), ("https://c.com", None)),
+        response(("https://d.com", None)),
+    ]
+    assert list(collapse_duplicates(results)) == ["https://a.com", "https://b.com", "https://c.com", "https://d.com"]
+
+
+def test_threshold_controls_near_duplicate_matching():
+    body = article(1, words=200)
+    half_copy = " ".join(body.split()[:100]) + " " + article(2, words=100)
+    results = [response(("https://a.com", body), ("https://b.com", half_copy))]
+    assert len(collapse_duplicates(results, threshold=0.8)) == 2
+    assert len(collapse_duplicates(results, threshold=0.2)) == 1
+
+
+# ===== clean_page_text =====
+
+
+def test_clean_page_text_drops_chrome_and_keeps_content():
+    raw = "\n".join(
+        [
+            "Skip to content",
+            "Menu",
+            "[Home](https://x.com) [About](https://x.com/about)",
+            "",
+            "",
+            "Solar output  grew\u200b\xa0sharply this year.",
+            "Prices rose 12% in 2023.",
+            "| Year | Output |",
+            "We accept all feedback about the privacy policy of the agency.",
+            "Accept all cookies",
+            "Share",
+            "© All rights reserved",
+        ]
+    )
+    assert clean_page_text(raw) == "\n".join(
+        [
+            "Solar output grew sharply this year.",
+            "Prices rose 12% in 2023.",
+            "| Year | Output |",
+            "We accept all feedback about the privacy policy of the agency.",
+        ]
+    )
+
+
+def test_clean_page_text_keeps_first_of_repeated_lines_but_all_data_lines():
+    raw = "Related articles\nBody text.\nRelated articles\n| a | b |\n| a | b |"
+    assert clean_page_text(raw) == "Related articles\nBody text.\n| a | b |\n| a | b |"
+
+
+def saved_sum_and_count():
+    lines = dict(line.rsplit(" ", 1) for line in page_chars_saved.render() if not line.startswith("#"))
+    return float(lines.get("deep_research_page_chars_saved_sum", 0)), int(
+        lines.get("deep_research_page_chars_saved_count", 0)
+    )
+
+
+def test_clean_page_text_records_the_saving_per_page():
+    total, count = saved_sum_and_count()
+    clean_page_text("Menu\nReal content here.")
+    assert saved_sum_and_count() == (total + len("Menu\n"), count + 1)
+
+
+# ===== select_for_summarization =====
+
+
+def page(text, title=""):
+    return {"title": title, "content": "snippet", "raw_content": text}
+
+
+def test_bm25_prefers_documents_matching_the_query():
+    scores = bm25_scores(
+        "solar panel efficiency",
+        [
+            "solar panel efficiency rose as solar cells improved",
+            "a recipe for bread",
+            "panel discussion on efficiency",
+        ],
+    )
+    assert scores[0] > scores[2] > scores[1] == 0.0
+
+
+def test_only_the_top_k_keep_raw_content_in_order():
+    results = {
+        "https://a.com": page("battery storage " * 5 + "filler " * 50),
+        "https://b.com": page("battery storage " * 30),
+        "https://c.com": page("battery storage " * 15),
+    }
+    selected = select_for_summarization("battery storage", results, top_k=2, min_relevance=0)
+    assert list(selected) == list(results)
+    assert [("raw_content" in r) for r in selected.values()] == [False, True, True]
+    assert selected["https://a.com"]["content"] == "snippet"
+
+
+def test_results_far_below_the_best_pass_through():
+    results = {
+        "https://a.com": page("quantum computing error correction " * 20),
+        "https://b.com": page("gardening tips " * 40 + "quantum"),
+    }
+    selected = select_for_summarization("quantum error correction", results, top_k=5, min_relevance=0.5)
+    assert "raw_content" in selected["https://a.com"]
+    assert "raw_content" not in selected["https://b.com"]
+
+
+def test_no_query_match_keeps_the_top_k():
+    results = {f"https://{i}.com": page("unrelated text") for i in range(4)}
+    selected = select_for_summarization("zebra", results, top_k=2, min_relevance=0.5)
+    assert sum("raw_content" in r for r in selected.values()) == 2
+
+
+def test_snippet_only_results_are_untouched():
+    results = {"https://a.com": {"title": "A", "content": "snippet"}}
+    assert select_for_summarization("anything", results) is results
+
+
+# ===== split_into_chunks =====
+
+
+def test_short_text_is_one_chunk():
+    assert split_into_chunks("short text", 100) == ["short text"]
+
+
+def test_chunks_respect_size_and_keep_all_words():
+    paragraphs = [f"Paragraph {i} " + "word " * 40 for i in range(30)]
+    text = "\n\n".join(paragraphs)
+    chunks = split_into_chunks(text, 1000)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_chunks_split_on_paragraphs_before_sentences():
+    text = "\n\n".join(["A" * 400, "B" * 400, "C" * 400])
+    chunks = split_into_chunks(text, 900)
+    assert chunks == ["A" * 400 + "\n" + "B" * 400, "C" * 400]
+
+
+def test_text_without_boundaries_is_hard_cut():
+    chunks = split_into_chunks("x" * 2500, 1000)
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+
+
+def test_blank_chunks_are_dropped():
+    assert all(chunk.strip() for chunk in split_into_chunks("\n\n\n" + "word " * 500, 200))
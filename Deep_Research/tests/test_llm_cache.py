@@ -0,0 +1,52 @@
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from deep_research.utils import _dump_response, _load_response
+
+
+class Answer(BaseModel):
+    text: str
+    score: float
+
+
+def round_trip(response, output_schema=None):
+    return _load_response(_dump_response(response), output_schema)
+
+
+def test_message_with_tool_calls_and_usage_round_trips():
+    message = AIMessage(
+        content="calling a tool",
+        tool_calls=[{"name": "search", "args": {"query": "solar"}, "id": "call-1"}],
+        usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    )
+    loaded = round_trip(message)
+    assert isinstance(loaded, AIMessage)
+    assert loaded.content == message.content
+    assert loaded.tool_calls == message.tool_calls
+    assert loaded.usage_metadata == message.usage_metadata
+
+
+def test_structured_output_with_raw_round_trips():
+    response = {
+        "raw": AIMessage(content="", usage_metadata={"input_tokens": 3, "output_tokens": 2, "total_tokens": 5}),
+        "parsed": Answer(text="yes", score=0.5),
+        "parsing_error": None,
+    }
+    loaded = round_trip(response, Answer)
+    assert loaded["parsed"] == Answer(text="yes", score=0.5)
+    assert loaded["raw"].usage_metadata == response["raw"].usage_metadata
+    assert loaded["parsing_error"] is None
+
+
+def test_failed_structured_parse_is_not_stored():
+    assert _dump_response({"raw": AIMessage(content="???"), "parsed": None, "parsing_error": ValueError()}) is None
+
+
+def test_pydantic_and_plain_responses_round_trip():
+    assert round_trip(Answer(text="a", score=1.0), Answer) == Answer(text="a", score=1.0)
+    # Without the schema a pydantic entry cannot be rebuilt
+    assert round_trip(Answer(text="a", score=1.0)) is None
+    assert round_trip({"k": [1, 2]}) == {"k": [1, 2]}
+    assert round_trip("text") == "text"
+    assert _dump_response(object()) is None
+
@@ -0,0 +1,191 @@
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+
+from deep_research import research_agent
+
+# ===== tool_node =====
+
+
+class FakeTool:
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+
+    async def ainvoke(self, args):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"{self.name}: {args['query']}"
+
+
+def tool_call(name, query, index):
+    return {"name": name, "args": {"query": query}, "id": f"call-{index}"}
+
+
+def run_tools(monkeypatch, tools, calls):
+    monkeypatch.setattr(research_agent, "tools_by_name", {tool.name: tool for tool in tools})
+    state = {"researcher_messages": [AIMessage(content="", tool_calls=calls)]}
+    return asyncio.run(research_agent.tool_node(state))
+
+
+def test_tool_calls_run_concurrently_in_call_order(monkeypatch):
+    calls = [tool_call("slow", "a", 0), tool_call("fast", "b", 1), tool_call("slow", "c", 2)]
+    started = time.monotonic()
+    update = run_tools(monkeypatch, [FakeTool("slow", 0.2), FakeTool("fast")], calls)
+    assert time.monotonic() - started < 0.35
+    messages = update["researcher_messages"]
+    assert [m.tool_call_id for m in messages] == ["call-0", "call-1", "call-2"]
+    assert [m.content for m in messages] == ["slow: a", "fast: b", "slow: c"]
+    assert update["tool_call_iterations"] == 1
+
+
+def test_failing_tool_yields_an_error_message_without_failing_the_batch(monkeypatch):
+    calls = [tool_call("broken", "a", 0), tool_call("missing", "b", 1), tool_call("fine", "c", 2)]
+    update = run_tools(monkeypatch, [FakeTool("broken", error=RuntimeError("boom")), FakeTool("fine")], calls)
+    broken, missing, fine = update["researcher_messages"]
+    assert broken.status == "error" and "boom" in broken.content
+    assert missing.status == "error" and "Unknown tool" in missing.content
+    assert fine.status == "success" and fine.content == "fine: c"
+
+
+# ===== budgets =====
+
+
+def tool_calling_state(**fields):
+    message = AIMessage(content="", tool_calls=[tool_call("search", "a", 0)])
+    return {"researcher_messages": [message], **fields}
+
+
+def test_exhausted_budget_names_the_first_budget_spent(monkeypatch):
+    monkeypatch.setattr(research_agent, "RESEARCHER_MAX_TOOL_ROUNDS", 3)
+    monkeypatch.setattr(research_agent, "RESEARCHER_MAX_PROMPT_TOKENS", 1000)
+    monkeypatch.setattr(research_agent, "RESEARCHER_DEADLINE", 60)
+    now = time.time()
+    assert research_agent.exhausted_budget({"tool_call_iterations": 2, "started_at": now}) is None
+    assert research_agent.exhausted_budget({"tool_call_iterations": 3}) == "tool rounds"
+    assert research_agent.exhausted_budget({"prompt_tokens": 1000}) == "prompt tokens"
+    assert research_agent.exhausted_budget({"started_at": now - 61}) == "deadline"
+
+
+def test_zero_disables_a_budget(monkeypatch):
+    monkeypatch.setattr(research_agent, "RESEARCHER_MAX_TOOL_ROUNDS", 0)
+    monkeypatch.setattr(research_agent, "RESEARCHER_MAX_PROMPT_TOKENS", 0)
+    monkeypatch.setattr(research_agent, "RESEARCHER_DEADLINE", 0)
+    state = {"tool_call_iterations": 10**6, "prompt_tokens": 10**9, "started_at": 1.0}
+    assert research_agent.exhausted_budget(state) is None
+
+
+def test_spent_budget_routes_to_compression(monkeypatch):
+    monkeypatch.setattr(research_agent, "RESEARCHER_MAX_TOOL_ROUNDS", 2)
+    assert research_agent.should_continue(tool_calling_state(tool_call_iterations=1)) == "tool_node"
+    assert research_agent.should_continue(tool_calling_state(tool_call_iterations=2)) == "compress_research"
+    assert research_agent.after_tools({"tool_call_iterations": 1}) == "llm_call"
+    assert research_agent.after_tools({"tool_call_iterations": 2}) == "compress_research"
+    # A final answer always goes to compression
+    final = {"researcher_messages": [AIMessage(content="done")], "tool_call_iterations": 0}
+    assert research_agent.should_continue(final) == "compress_research"
+
+
+class FakeCompressModel:
+    def __init__(self, fail=False):
+        self.prompts = []
+        self.fail = fail
+
+    def with_cache(self, site):
+        return self
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages)
+        if self.fail:
+            raise RuntimeError("model down")
+        return AIMessage(content=f"digest {len(self.prompts)}")
+
+
+def test_compression_drops_tool_calls_that_never_ran(monkeypatch):
+    model = FakeCompressModel()
+    monkeypatch.setattr(research_agent, "get_compress_model", lambda: model)
+    stopped = AIMessage(content="partial thoughts", tool_calls=[tool_call("search", "a", 0)])
+    state = {"researcher_messages": [stopped], "research_topic": "topic"}
+    asyncio.run(research_agent.compress_research(state))
+    sent = model.prompts[0]
+    assert not any(getattr(message, "tool_calls", None) for message in sent)
+    assert any(message.content == "partial thoughts" for message in sent)
+
+
+# ===== RunningDigest =====
+
+
+def test_digest_folds_every_round_in_order(monkeypatch):
+    model = FakeCompressModel()
+    monkeypatch.setattr(research_agent, "get_compress_model", lambda: model)
+
+    async def main():
+        running = research_agent.RunningDigest("topic")
+        running.add("round one")
+        await asyncio.sleep(0.01)
+        running.add("round two")
+        return await running.finish()
+
+    assert asyncio.run(main()) == "digest 2"
+    first, second = (prompt[0].content for prompt in model.prompts)
+    assert "round one" in first and "(none yet)" in first
+    assert "round two" in second and "digest 1" in second and "round one" not in second
+
+
+def test_rounds_queued_before_a_fold_starts_are_folded_together(monkeypatch):
+    model = FakeCompressModel()
+    monkeypatch.setattr(research_agent, "get_compress_model", lambda: model)
+
+    async def main():
+        running = research_agent.RunningDigest("topic")
+        running.add("round one")
+        running.add("round two")
+        return await running.finish()
+
+    assert asyncio.run(main()) == "digest 1"
+    assert "round one" in model.prompts[0][0].content and "round two" in model.prompts[0][0].content
+
+
+def test_failed_folds_keep_results_pending(monkeypatch):
+    model = FakeCompressModel(fail=True)
+    monkeypatch.setattr(research_agent, "get_compress_model", lambda: model)
+
+    async def main():
+        running = research_agent.RunningDigest("topic")
+        running.add("round one")
+        await asyncio.sleep(0)
+        digest = await running.finish()
+        pending = list(running.pending)
+        # The model recovers: the next fold covers the missed round too
+        model.fail = False
+        running.add("round two")
+        return digest, pending, await running.finish()
+
+    digest, pending, recovered = asyncio.run(main())
+    assert digest is None
+    assert pending == ["round one"]
+    assert recovered is not None
+    assert "round one" in model.prompts[-1][0].content
+
+
+def test_compression_uses_a_complete_digest(monkeypatch):
+    model = FakeCompressModel()
+    monkeypatch.setattr(research_agent, "get_compress_model", lambda: model)
+
+    async def main():
+        research_agent.get_running_digest("key-1", "topic").add("round one")
+        state = {
+            "researcher_messages": [AIMessage(content="final answer")],
+            "research_topic": "topic",
+            "digest_key": "key-1",
+        }
+        return await research_agent.compress_research(state)
+
+    asyncio.run(main())
+    sent = [message.content for message in model.prompts[-1]]
+    assert any("Research findings recorded so far:\n\ndigest 1" in content for content in sent)
+    assert "final answer" in sent
+    assert "key-1" not in research_agent._running_digests
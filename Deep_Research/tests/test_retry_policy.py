@@ -0,0 +1,143 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from deep_research.retry_policy import (
+    DeadlineExceeded,
+    ErrorClass,
+    RetryPolicy,
+    classify_error,
+    retry_after_seconds,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, message="request failed", headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = httpx.Response(status_code, headers=headers or {})
+
+
+# ===== classify_error =====
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (StatusError(429), ErrorClass.RATE_LIMIT),
+        (StatusError(408), ErrorClass.TIMEOUT),
+        (StatusError(500), ErrorClass.SERVER_ERROR),
+        (StatusError(503), ErrorClass.SERVER_ERROR),
+        (StatusError(400), ErrorClass.NON_RETRYABLE),
+        (StatusError(401), ErrorClass.NON_RETRYABLE),
+        (StatusError(404, "Model not found"), ErrorClass.SERVER_ERROR),
+        (StatusError(404, "no such route"), ErrorClass.NON_RETRYABLE),
+        (asyncio.TimeoutError(), ErrorClass.TIMEOUT),
+        (httpx.ReadTimeout("read timed out"), ErrorClass.TIMEOUT),
+        (httpx.ConnectError("connection refused"), ErrorClass.CONNECTION),
+        (RuntimeError("Error code: 429 - slow down"), ErrorClass.RATE_LIMIT),
+        (RuntimeError("upstream returned status 502"), ErrorClass.SERVER_ERROR),
+        (RuntimeError("Too Many Requests"), ErrorClass.RATE_LIMIT),
+        (ValueError("could not parse 500 words"), ErrorClass.NON_RETRYABLE),
+        (ValueError("invalid tool arguments"), ErrorClass.NON_RETRYABLE),
+    ],
+)
+def test_classify_error(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_deadline_exceeded_is_not_a_retryable_timeout():
+    assert classify_error(DeadlineExceeded("out of time")) == ErrorClass.NON_RETRYABLE
+
+
+# ===== retry_after_seconds =====
+
+
+def test_retry_after_seconds_header():
+    assert retry_after_seconds(StatusError(429, headers={"retry-after": "7"})) == 7.0
+
+
+def test_retry_after_ms_takes_precedence():
+    error = StatusError(429, headers={"retry-after-ms": "1500", "retry-after": "7"})
+    assert retry_after_seconds(error) == 1.5
+
+
+def test_retry_after_http_date():
+    error = StatusError(429, headers={"retry-after": formatdate(time.time() + 30, usegmt=True)})
+    assert 25 <= retry_after_seconds(error) <= 30
+
+
+def test_retry_after_missing_or_invalid():
+    assert retry_after_seconds(StatusError(429)) is None
+    assert retry_after_seconds(StatusError(429, headers={"retry-after": "soon"})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+
+# ===== RetryPolicy =====
+
+
+def flaky(failures, error_factory):
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise error_factory()
+        return "ok"
+
+    return fn, calls
+
+
+def test_retries_transient_errors_until_success():
+    policy = RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.001, deadline=5)
+    fn, calls = flaky(2, lambda: StatusError(503))
+    assert policy.run(fn) == "ok"
+    assert len(calls) == 3
+    assert policy.stats()["retries"]["server_error"] == 2
+
+
+def test_non_retryable_error_is_raised_immediately():
+    policy = RetryPolicy(max_attempts=4, base_delay=0.001, deadline=5)
+    fn, calls = flaky(1, lambda: StatusError(400))
+    with pytest.raises(StatusError):
+        policy.run(fn)
+    assert len(calls) == 1
+
+
+def test_gives_up_instead_of_waiting_past_the_deadline():
+    policy = RetryPolicy(max_attempts=10, base_delay=0.001, deadline=1.0)
+    # The server asks for a wait longer than the whole deadline
+    fn, calls = flaky(5, lambda: StatusError(429, headers={"retry-after": "5"}))
+    started = time.monotonic()
+    with pytest.raises(StatusError):
+        policy.run(fn)
+    assert time.monotonic() - started < 0.5
+    assert len(calls) == 1
+    assert policy.stats()["deadline_exceeded"] == 1
+
+
+def test_async_attempt_is_cut_off_at_the_deadline():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, deadline=0.2)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(policy.arun(hang))
+    assert time.monotonic() - started < 1.0
+    assert policy.stats()["deadline_exceeded"] == 1
+
+
+def test_async_retries_transient_errors():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001, deadline=5)
+    fn, calls = flaky(1, lambda: httpx.ConnectError("reset"))
+
+    async def call():
+        return fn()
+
+    assert asyncio.run(policy.arun(call)) == "ok"
+    assert len(calls) == 2
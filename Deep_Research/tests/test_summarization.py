@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from deep_research import utils
+
+URL = "https://example.com/page"
+
+
+def results(raw_content="page text " * 200):
+    return {URL: {"title": "Page", "content": "tavily snippet", "raw_content": raw_content}}
+
+
+def test_slow_page_falls_back_to_the_snippet(monkeypatch):
+    async def slow(webpage_content, deadline=None):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(utils, "_asummarize_page", slow)
+    started = time.monotonic()
+    processed = asyncio.run(utils.aprocess_search_results(results("slow page " * 200), deadline=0.1))
+    assert processed[URL]["content"] == "tavily snippet"
+    assert time.monotonic() - started < 2
+
+
+def test_failed_page_falls_back_to_the_snippet(monkeypatch):
+    async def fail(webpage_content, deadline=None):
+        return None
+
+    monkeypatch.setattr(utils, "_asummarize_page", fail)
+    processed = asyncio.run(utils.aprocess_search_results(results("failing page " * 200)))
+    assert processed[URL]["content"] == "tavily snippet"
+
+
+def test_pages_are_summarized_concurrently_in_order(monkeypatch):
+    async def summarize(webpage_content, deadline=None):
+        await asyncio.sleep(0.2)
+        return f"summary of {webpage_content.split()[0]}"
+
+    monkeypatch.setattr(utils, "_asummarize_page", summarize)
+    pages = {
+        f"https://example.com/{i}": {
+            "title": str(i),
+            "content": "snippet",
+            "raw_content": f"page{i} " + "text " * 100,
+        }
+        for i in range(5)
+    }
+    started = time.monotonic()
+    processed = asyncio.run(utils.aprocess_search_results(pages, max_concurrency=5))
+    assert time.monotonic() - started < 0.8
+    assert list(processed) == list(pages)
+    assert [r["content"] for r in processed.values()] == [f"summary of page{i}" for i in range(5)]
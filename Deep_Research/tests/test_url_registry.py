@@ -0,0 +1,110 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from deep_research import utils
+from deep_research.url_registry import (
+    URLRegistry,
+    current_researcher,
+    current_url_registry,
+    job_url_registry,
+)
+
+URL = "https://example.com/page"
+
+
+def test_url_is_free_until_a_summary_is_recorded():
+    registry = URLRegistry(mode="reference")
+    assert registry.lookup(URL, "Page", "researcher 1") is None
+    # Looking a URL up does not claim it
+    assert registry.lookup(URL, "Page", "researcher 2") is None
+
+    registry.record(URL, "summary", "researcher 1")
+    assert registry.lookup(URL, "Page", "researcher 1") is None
+    reference = registry.lookup(URL, "Page", "researcher 2")
+    assert "researcher 1" in reference and "Page" in reference
+    assert registry.stats() == {"urls": 1, "references_served": 1, "summaries_reused": 0}
+
+
+def test_first_recorded_summary_wins():
+    registry = URLRegistry(mode="summary")
+    registry.record(URL, "first", "researcher 1")
+    registry.record(URL, "second", "researcher 2")
+    assert registry.lookup(URL, "Page", "researcher 3") == "first"
+    assert registry.lookup(URL, "Page", "researcher 2") == "first"
+
+
+def test_researcher_labels_are_unique_within_a_job():
+    registry = URLRegistry()
+    labels = [registry.next_researcher_label() for _ in range(5)]
+    assert len(set(labels)) == 5
+
+
+def test_job_registry_survives_graph_node_runs():
+    """Nodes of one thread share a registry even though context variables do not carry over."""
+    seen = []
+
+    async def node(state, config):
+        seen.append(job_url_registry(config["configurable"]["thread_id"]))
+        return {"messages": [AIMessage(content="round")]}
+
+    def loop(state):
+        return "node" if len(state["messages"]) < 3 else END
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("node", node)
+    builder.add_edge(START, "node")
+    builder.add_conditional_edges("node", loop)
+    graph = builder.compile()
+
+    asyncio.run(graph.ainvoke({"messages": []}, {"configurable": {"thread_id": "job-a"}}))
+    asyncio.run(graph.ainvoke({"messages": []}, {"configurable": {"thread_id": "job-b"}}))
+    assert len(seen) == 6
+    assert len({id(registry) for registry in seen[:3]}) == 1
+    assert seen[3] is not seen[0]
+
+
+def test_installed_registry_takes_precedence():
+    registry = URLRegistry()
+    token = current_url_registry.set(registry)
+    try:
+        assert job_url_registry("any-thread") is registry
+    finally:
+        current_url_registry.reset(token)
+
+
+def result(raw_content=None):
+    page = {"title": "Page", "content": "tavily snippet"}
+    if raw_content:
+        page["raw_content"] = raw_content
+    return {URL: page}
+
+
+def process_as(registry, researcher, results):
+    async def run():
+        current_url_registry.set(registry)
+        current_researcher.set(researcher)
+        return await utils.aprocess_search_results(results)
+
+    return asyncio.run(run())[URL]["content"]
+
+
+def test_snippet_results_do_not_claim_the_url():
+    registry = URLRegistry(mode="reference")
+    # Relevance ranking left researcher 1 with the snippet only
+    assert process_as(registry, "researcher 1", result()) == "tavily snippet"
+
+    content = process_as(registry, "researcher 2", result("page text " * 200))
+    assert content.startswith("<summary>")
+    assert "Already covered" in process_as(registry, "researcher 3", result("page text " * 200))
+
+
+def test_failed_summaries_do_not_claim_the_url(monkeypatch):
+    async def fail(webpage_content, deadline=None):
+        return None
+
+    registry = URLRegistry(mode="reference")
+    monkeypatch.setattr(utils, "_asummarize_page", fail)
+    assert "Already covered" not in process_as(registry, "researcher 1", result("unique text " * 200))
+    assert registry.stats()["urls"] == 0